@@ -116,6 +116,7 @@ from pages.champions_sinergys_counters import (
 from pages.head2head_players import layout as head2head_players_layout
 from pages.head2head_teams import layout as head2head_teams_layout
 from pages.head2head_champions import layout as head2head_champions_layout
+from warmup import is_ready, start_warm_up, warm_up_report
 
 
 # Callback to switch between pages
@@ -248,7 +249,17 @@ def display_page(pathname):
 # Create the Flask app for Gunicorn
 app = dash_app.server
 
+
+# Readiness check: OK only after the cache warm-up (see warmup.py)
+@app.route("/ready")
+def ready():
+    if not is_ready():
+        return {"status": "warming up"}, 503
+    return {"status": "ok", "warm_up": warm_up_report()}
+
+
 if __name__ == "__main__":
     # dash_app.run_server(debug=True)
     # dash_app.run_server(debug=True, host="0.0.0.0", port=8050)
+    start_warm_up()
     dash_app.run(debug=True)
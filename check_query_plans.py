@@ -0,0 +1,60 @@
+import argparse
+import sys
+import os
+
+# Caminho absoluto até a raiz do seu projeto
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))  # diretório do script
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR))  # ou '..' se estiver em /scripts
+
+# Adiciona a raiz do projeto ao path de import
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from database.query_plans import (
+    missing_methods,
+    plan_regressions,
+    plan_report,
+    print_plan_report,
+    save_baseline,
+)
+
+# Scans aceitos que acompanham o repositório
+DEFAULT_BASELINE = os.path.join(PROJECT_ROOT, "query_plans_baseline.json")
+
+parser = argparse.ArgumentParser(
+    description="EXPLAIN the dashboard queries, propose indexes and fail on new scans"
+)
+parser.add_argument("--start-date", default=None)
+parser.add_argument("--end-date", default=None)
+parser.add_argument(
+    "--baseline",
+    default=DEFAULT_BASELINE,
+    help="JSON of accepted scans per query (default: query_plans_baseline.json;"
+    " an empty value accepts no scan)",
+)
+parser.add_argument(
+    "--save-baseline",
+    default=None,
+    help="write the current scans as the baseline and exit",
+)
+parser.add_argument("--no-advise", action="store_true", help="skip the index proposals")
+parser.add_argument("--verbose", action="store_true", help="print every plan")
+args = parser.parse_args()
+
+report = plan_report(args.start_date, args.end_date, advise=not args.no_advise)
+print_plan_report(report, args.verbose)
+
+for method in missing_methods(args.start_date, args.end_date):
+    print(f"⚠️ {method} is not in the workload")
+
+if args.save_baseline:
+    save_baseline(report, args.save_baseline)
+    print(f"Baseline saved to {args.save_baseline}")
+    sys.exit(0)
+
+regressions = plan_regressions(report, args.baseline)
+for label, table in regressions:
+    print(f"❌ {label} scans {table}")
+if regressions:
+    sys.exit(1)
+print("✅ No query scans a table outside the baseline.")
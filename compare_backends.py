@@ -0,0 +1,85 @@
+import argparse
+import sys
+import os
+import time
+
+# Caminho absoluto até a raiz do seu projeto
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))  # diretório do script
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR))  # ou '..' se estiver em /scripts
+
+# Adiciona a raiz do projeto ao path de import
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import pandas as pd
+
+from database.backends import BACKENDS, get_backend
+from database.workload import workload
+
+parser = argparse.ArgumentParser(
+    description="Run the dashboard queries on several backends, time and diff them"
+)
+parser.add_argument(
+    "backends",
+    nargs="*",
+    default=list(BACKENDS),
+    help=f"backends to compare, the first is the reference (default: {list(BACKENDS)})",
+)
+parser.add_argument("--start-date", default=None)
+parser.add_argument("--end-date", default=None)
+parser.add_argument("--repeat", type=int, default=3, help="runs of each query")
+args = parser.parse_args()
+
+
+def normalize(result):
+    """Result as a sorted frame of strings, so row order and dtypes don't count."""
+    df = pd.DataFrame(result).reset_index(drop=True)
+    for col in df.columns:
+        if pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].astype(float).round(2)
+    df = df.astype(str)
+    return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+
+def same(a, b):
+    if isinstance(a, dict) and isinstance(b, dict):
+        return sorted(a) == sorted(b) and all(same(a[k], b[k]) for k in a)
+    if isinstance(a, str) or isinstance(b, str):
+        return a == b
+    a, b = normalize(a), normalize(b)
+    return list(a.columns) == list(b.columns) and a.equals(b)
+
+
+backends = {name: get_backend(name) for name in args.backends}
+reference = args.backends[0]
+queries = workload(backends[reference], args.start_date, args.end_date)
+
+timings = {}
+results = {}
+for name, backend in backends.items():
+    for label, method, call_args in queries:
+        best = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = getattr(backend, method)(*call_args)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings[label, name] = best * 1000
+        results[label, name] = result
+
+table = pd.DataFrame(
+    {
+        f"{name} ms": [timings[label, name] for label, _, _ in queries]
+        for name in backends
+    },
+    index=[label for label, _, _ in queries],
+).round(2)
+for name in args.backends[1:]:
+    table[f"{name} = {reference}"] = [
+        same(results[label, reference], results[label, name]) for label, _, _ in queries
+    ]
+
+pd.set_option("display.width", 200)
+print(table.to_string())
+print("\nTotal (ms):")
+print(table[[f"{name} ms" for name in backends]].sum().round(2).to_string())
@@ -1,3 +1,4 @@
+import argparse
 import sys
 import os
 
@@ -9,13 +10,52 @@ PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR))  # ou '..' se estiver em
 if PROJECT_ROOT not in sys.path:
     sys.path.append(PROJECT_ROOT)
 
-from database.base import get_conn
+parser = argparse.ArgumentParser(description="Build lol_data.db from the CSVs")
+parser.add_argument("--data-dir", default="data")
+parser.add_argument(
+    "--incremental",
+    action="store_true",
+    help="only load new or changed games into an existing database",
+)
+parser.add_argument(
+    "--rebuild",
+    action="store_true",
+    help="reload every game of an existing database, keeping its game keys",
+)
+parser.add_argument(
+    "--chunksize",
+    type=int,
+    default=None,
+    help="stream the CSVs in pieces of about this many rows",
+)
+parser.add_argument(
+    "--workers",
+    type=int,
+    default=None,
+    help="parse and clean the CSVs in this many processes",
+)
+parser.add_argument(
+    "--parquet",
+    nargs="?",
+    const="",
+    default=None,
+    metavar="DIR",
+    help="also write the Parquet snapshot (default: lol_data.parquet)",
+)
+args = parser.parse_args()
 
-conn = get_conn()
 # CRIAR A DATABASE
 from database.base import Database
 
 # Initialize the database
 db = Database()
 # Initialize the database with your data
-db.initialize_database()
+db.initialize_database(
+    args.data_dir,
+    incremental=args.incremental,
+    chunksize=args.chunksize,
+    workers=args.workers,
+    rebuild=args.rebuild,
+)
+if args.parquet is not None:
+    db.export_parquet(args.parquet or None)
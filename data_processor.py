@@ -1,148 +1,240 @@
-from database.players import (
-    get_player_stats,
-    get_player_match_history,
-    get_most_picked_champions,
-)
-from database.teams import (
-    get_team_stats,
-    get_team_match_history,
-    get_team_most_picked_champions,
-)
-from database.champions import get_champion_stats, get_champion_match_history
-from database.shared import (
-    get_all_dates,
-    get_all_columns,
-    get_all_leagues,
-    get_all_patches,
-    get_all_players,
-    get_all_teams,
-)
-from database.patch import get_patch_champion_stats
-from database.champions_sinergys_counters import (
-    get_best_allies,
-    get_best_against,
-    get_worst_against,
-)
-from database.head2head_players import (
-    get_player_stats_in_period,
-    get_head2head_stats,
-    get_head2head_match_history,
-)
-from database.head2head_teams import (
-    get_team_stats_in_period,
-    get_head2head_stats_teams,
-    get_head2head_match_history_teams,
-)
-from database.head2head_champions import (
-    get_champion_stats_in_period,
-    get_head2head_stats_champions,
-    get_head2head_match_history_champions,
-)
+import inspect
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from database.backends import QueryBackend, get_backend
+from database.cache import get_result_cache
+from database.catalog import get_catalog
+from database.dates import date_range
+
+QUERY_THREADS_ENV = "LOL_QUERY_THREADS"
+DEFAULT_QUERY_THREADS = 4
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def _query_executor():
+    """Thread pool of ``gather``, one per process (the threads of a pool
+    created before a fork do not exist in the child)."""
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            threads = int(os.environ.get(QUERY_THREADS_ENV, DEFAULT_QUERY_THREADS))
+            _executor = ThreadPoolExecutor(
+                max_workers=max(threads, 1), thread_name_prefix="query"
+            )
+            _executor_pid = os.getpid()
+        return _executor
 
 
 class DataProcessor:
+    """Queries used by the pages, answered by the configured query backend.
+
+    ``backend`` is a ``QueryBackend`` or the name of one (see
+    ``database.backends.BACKENDS``); by default it comes from
+    $LOL_QUERY_BACKEND and falls back to SQLite.
+
+    Results go through ``cache`` (a ``database.cache.ResultCache``, by
+    default the one shared by the process; ``False`` turns it off), keyed by
+    the method and its normalized arguments.
+    """
+
+    def __init__(self, backend=None, cache=None):
+        if isinstance(backend, QueryBackend):
+            self.backend = backend
+        else:
+            self.backend = get_backend(backend)
+        self.cache = get_result_cache() if cache is None else cache
+
+    def gather(self, *calls):
+        """Run independent calls at the same time and return their results
+        in order.
+
+        Each call is a tuple ``(method, *args)`` naming a method of this
+        class, e.g. ``("get_player_stats", player, start_date, end_date)``.
+        The calls go to a thread pool of $LOL_QUERY_THREADS threads, each
+        reading through its own SQLite connection, so the wait is the
+        slowest query instead of the sum. Results still go through the cache,
+        and the first exception raised is raised here.
+        """
+        if len(calls) < 2:
+            return [getattr(self, method)(*args) for method, *args in calls]
+        executor = _query_executor()
+        futures = [
+            executor.submit(getattr(self, method), *args) for method, *args in calls
+        ]
+        return [future.result() for future in futures]
+
+    @property
+    def catalog(self):
+        """Filter options of the pages (``database.catalog``), read again
+        only when the data version changes."""
+        return get_catalog()
+
+    def cache_key(self, method, *args):
+        """Key of a call: lists become sorted tuples (every list argument is
+        a set of names), an empty list is None and the dates become the
+        bounds they resolve to."""
+        params = list(inspect.signature(getattr(self, method)).parameters)
+        values = dict(zip(params, args))
+        if "start_date" in values:
+            values["dates"] = date_range(
+                values.pop("start_date"), values.pop("end_date", None)
+            )
+        for name, value in values.items():
+            if isinstance(value, (list, tuple)) and name != "dates":
+                values[name] = tuple(sorted(value, key=str)) or None
+        return (self.backend.name, method, *sorted(values.items()))
+
+    def _call(self, method, *args):
+        def compute():
+            # O backend alcança a versão dos dados antes de calcular, para um
+            # resultado nunca ser guardado com uma versão mais nova que ele
+            self.backend.refresh()
+            return getattr(self.backend, method)(*args)
+
+        if not self.cache:
+            return compute()
+        return self.cache.get_or_compute(self.cache_key(method, *args), compute)
+
     def get_player_stats(self, player_name=None, start_date=None, end_date=None):
-        return get_player_stats(player_name, start_date, end_date)
+        return self._call("get_player_stats", player_name, start_date, end_date)
 
     def get_player_match_history(self, player_name, start_date=None, end_date=None):
-        return get_player_match_history(player_name, start_date, end_date)
+        return self._call("get_player_match_history", player_name, start_date, end_date)
+
+    def get_most_picked_champions(self, player_name, start_date=None, end_date=None):
+        return self._call(
+            "get_most_picked_champions", player_name, start_date, end_date
+        )
 
     def get_team_stats(self, team_name=None, start_date=None, end_date=None):
-        return get_team_stats(team_name, start_date, end_date)
+        return self._call("get_team_stats", team_name, start_date, end_date)
 
     def get_team_match_history(self, team_name, start_date=None, end_date=None):
-        return get_team_match_history(team_name, start_date, end_date)
+        return self._call("get_team_match_history", team_name, start_date, end_date)
 
     def get_team_most_picked_champions(
         self, team_name=None, start_date=None, end_date=None
     ):
-        return get_team_most_picked_champions(team_name, start_date, end_date)
-
-    def get_champion_stats(self, champion_name=None, start_date=None, end_date=None):
-        return get_champion_stats(champion_name, start_date, end_date)
-
-    def get_all_dates(self):
-        return get_all_dates()
-
-    def get_all_columns(self):
-        return get_all_columns()
-
-    def get_most_picked_champions(self, player_name, start_date=None, end_date=None):
-        return get_most_picked_champions(player_name, start_date, end_date)
+        return self._call(
+            "get_team_most_picked_champions", team_name, start_date, end_date
+        )
 
     def get_champion_stats(
         self, champion_name=None, start_date=None, end_date=None, leagues=None
     ):
-        return get_champion_stats(champion_name, start_date, end_date, leagues)
-
-    def get_all_leagues(self):
-        return get_all_leagues()
+        return self._call(
+            "get_champion_stats", champion_name, start_date, end_date, leagues
+        )
 
     def get_champion_match_history(
         self, champion_name, start_date=None, end_date=None, leagues=None
     ):
-        return get_champion_match_history(champion_name, start_date, end_date, leagues)
+        return self._call(
+            "get_champion_match_history", champion_name, start_date, end_date, leagues
+        )
 
-    def get_patch_champion_stats(self, patch, start_date, end_date, leagues=None):
-        return get_patch_champion_stats(patch, start_date, end_date, leagues)
+    def get_all_dates(self):
+        return self._call("get_all_dates")
+
+    def get_all_columns(self):
+        return self._call("get_all_columns")
+
+    def get_all_leagues(self):
+        return self._call("get_all_leagues")
 
     def get_all_patches(self):
-        return get_all_patches()
+        return self._call("get_all_patches")
+
+    def get_all_players(self, league=None):
+        return self._call("get_all_players", league)
+
+    def get_all_teams(self, league=None):
+        return self._call("get_all_teams", league)
+
+    def get_patch_champion_stats(self, patch, start_date, end_date, leagues=None):
+        return self._call(
+            "get_patch_champion_stats", patch, start_date, end_date, leagues
+        )
 
     def get_best_allies(self, champion, start_date, end_date, leagues=None):
-        return get_best_allies(champion, start_date, end_date, leagues)
+        return self._call("get_best_allies", champion, start_date, end_date, leagues)
 
     def get_best_against(self, champion, start_date, end_date, leagues=None):
-        return get_best_against(champion, start_date, end_date, leagues)
+        return self._call("get_best_against", champion, start_date, end_date, leagues)
 
     def get_worst_against(self, champion, start_date, end_date, leagues=None):
-        return get_worst_against(champion, start_date, end_date, leagues)
+        return self._call("get_worst_against", champion, start_date, end_date, leagues)
+
+    def get_synergies_and_counters(
+        self, champions, start_date, end_date, leagues=None, distributions=False
+    ):
+        return self._call(
+            "get_synergies_and_counters",
+            champions,
+            start_date,
+            end_date,
+            leagues,
+            distributions,
+        )
 
     def get_player_stats_in_period(self, player_name, start_date, end_date):
-        return get_player_stats_in_period(player_name, start_date, end_date)
+        return self._call(
+            "get_player_stats_in_period", player_name, start_date, end_date
+        )
 
     def get_head2head_stats(self, player1, player2, start_date, end_date):
-        return get_head2head_stats(player1, player2, start_date, end_date)
+        return self._call("get_head2head_stats", player1, player2, start_date, end_date)
 
     def get_head2head_match_history(self, player1, player2, start_date, end_date):
-        return get_head2head_match_history(player1, player2, start_date, end_date)
-
-    def get_head2head_match_history_teams(self, team1, team2, start_date, end_date):
-        return get_head2head_match_history_teams(team1, team2, start_date, end_date)
+        return self._call(
+            "get_head2head_match_history", player1, player2, start_date, end_date
+        )
 
     def get_team_stats_in_period(self, team_name, start_date, end_date):
-        return get_team_stats_in_period(team_name, start_date, end_date)
+        return self._call("get_team_stats_in_period", team_name, start_date, end_date)
 
     def get_head2head_stats_teams(self, team1, team2, start_date, end_date):
-        return get_head2head_stats_teams(team1, team2, start_date, end_date)
+        return self._call(
+            "get_head2head_stats_teams", team1, team2, start_date, end_date
+        )
 
     def get_head2head_match_history_teams(self, team1, team2, start_date, end_date):
-        return get_head2head_match_history_teams(team1, team2, start_date, end_date)
-
-    def get_champion_stats_in_period(self, champion_name, start_date, end_date):
-        return get_champion_stats_in_period(champion_name, start_date, end_date)
+        return self._call(
+            "get_head2head_match_history_teams", team1, team2, start_date, end_date
+        )
 
     def get_champion_stats_in_period(
         self, champion, start_date, end_date, leagues=None
     ):
-        return get_champion_stats_in_period(champion, start_date, end_date, leagues)
+        return self._call(
+            "get_champion_stats_in_period", champion, start_date, end_date, leagues
+        )
 
     def get_head2head_stats_champions(
         self, champ1, champ2, start_date, end_date, leagues=None
     ):
-        return get_head2head_stats_champions(
-            champ1, champ2, start_date, end_date, leagues
+        return self._call(
+            "get_head2head_stats_champions",
+            champ1,
+            champ2,
+            start_date,
+            end_date,
+            leagues,
         )
 
     def get_head2head_match_history_champions(
         self, champ1, champ2, start_date, end_date, leagues=None
     ):
-        return get_head2head_match_history_champions(
-            champ1, champ2, start_date, end_date, leagues
+        return self._call(
+            "get_head2head_match_history_champions",
+            champ1,
+            champ2,
+            start_date,
+            end_date,
+            leagues,
         )
-
-    def get_all_players(self, league=None):
-        return get_all_players(league)
-
-    def get_all_teams(self, league=None):
-        return get_all_teams(league)
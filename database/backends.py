@@ -0,0 +1,160 @@
+import os
+
+from . import (
+    champions,
+    champions_sinergys_counters,
+    head2head_champions,
+    head2head_players,
+    head2head_teams,
+    patch,
+    players,
+    shared,
+    teams,
+)
+
+# Backend usado quando nada é passado: LOL_QUERY_BACKEND=sqlite|duckdb|numpy
+BACKEND_ENV = "LOL_QUERY_BACKEND"
+DEFAULT_BACKEND = "sqlite"
+
+# Métodos que todo backend responde, com a mesma assinatura e o mesmo
+# formato de DataFrame/lista que as funções de database/*.py
+QUERY_METHODS = (
+    "get_player_stats",
+    "get_player_match_history",
+    "get_most_picked_champions",
+    "get_team_stats",
+    "get_team_match_history",
+    "get_team_most_picked_champions",
+    "get_champion_stats",
+    "get_champion_match_history",
+    "get_all_dates",
+    "get_all_columns",
+    "get_all_leagues",
+    "get_all_patches",
+    "get_all_players",
+    "get_all_teams",
+    "get_patch_champion_stats",
+    "get_best_allies",
+    "get_best_against",
+    "get_worst_against",
+    "get_synergies_and_counters",
+    "get_player_stats_in_period",
+    "get_head2head_stats",
+    "get_head2head_match_history",
+    "get_team_stats_in_period",
+    "get_head2head_stats_teams",
+    "get_head2head_match_history_teams",
+    "get_champion_stats_in_period",
+    "get_head2head_stats_champions",
+    "get_head2head_match_history_champions",
+)
+
+
+class QueryBackend:
+    """Answers the ``DataProcessor`` queries (see ``QUERY_METHODS``).
+
+    Subclasses implement every method of ``QUERY_METHODS`` and register
+    themselves in ``BACKENDS``.
+    """
+
+    name = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        missing = [m for m in QUERY_METHODS if not callable(getattr(cls, m, None))]
+        if missing:
+            raise TypeError(f"{cls.__name__} does not implement {missing}")
+
+    def refresh(self):
+        """Catch up with the data in the database before a query.
+
+        Backends that read the database on every query have nothing to do;
+        those holding a copy of the data reload it when it changed.
+        """
+
+
+class SQLiteBackend(QueryBackend):
+    """The functions of database/*.py over lol_data.db."""
+
+    name = "sqlite"
+
+    get_player_stats = staticmethod(players.get_player_stats)
+    get_player_match_history = staticmethod(players.get_player_match_history)
+    get_most_picked_champions = staticmethod(players.get_most_picked_champions)
+    get_team_stats = staticmethod(teams.get_team_stats)
+    get_team_match_history = staticmethod(teams.get_team_match_history)
+    get_team_most_picked_champions = staticmethod(teams.get_team_most_picked_champions)
+    get_champion_stats = staticmethod(champions.get_champion_stats)
+    get_champion_match_history = staticmethod(champions.get_champion_match_history)
+    get_all_dates = staticmethod(shared.get_all_dates)
+    get_all_columns = staticmethod(shared.get_all_columns)
+    get_all_leagues = staticmethod(shared.get_all_leagues)
+    get_all_patches = staticmethod(shared.get_all_patches)
+    get_all_players = staticmethod(shared.get_all_players)
+    get_all_teams = staticmethod(shared.get_all_teams)
+    get_patch_champion_stats = staticmethod(patch.get_patch_champion_stats)
+    get_best_allies = staticmethod(champions_sinergys_counters.get_best_allies)
+    get_best_against = staticmethod(champions_sinergys_counters.get_best_against)
+    get_worst_against = staticmethod(champions_sinergys_counters.get_worst_against)
+    get_synergies_and_counters = staticmethod(
+        champions_sinergys_counters.get_synergies_and_counters
+    )
+    get_player_stats_in_period = staticmethod(
+        head2head_players.get_player_stats_in_period
+    )
+    get_head2head_stats = staticmethod(head2head_players.get_head2head_stats)
+    get_head2head_match_history = staticmethod(
+        head2head_players.get_head2head_match_history
+    )
+    get_team_stats_in_period = staticmethod(head2head_teams.get_team_stats_in_period)
+    get_head2head_stats_teams = staticmethod(head2head_teams.get_head2head_stats_teams)
+    get_head2head_match_history_teams = staticmethod(
+        head2head_teams.get_head2head_match_history_teams
+    )
+    get_champion_stats_in_period = staticmethod(
+        head2head_champions.get_champion_stats_in_period
+    )
+    get_head2head_stats_champions = staticmethod(
+        head2head_champions.get_head2head_stats_champions
+    )
+    get_head2head_match_history_champions = staticmethod(
+        head2head_champions.get_head2head_match_history_champions
+    )
+
+
+def _duckdb_backend():
+    # Só importa duckdb quando esse backend é escolhido
+    from .duckdb_backend import DuckDBBackend
+
+    return DuckDBBackend()
+
+
+def _columnar_backend():
+    from .columnar import ColumnarBackend
+
+    return ColumnarBackend()
+
+
+# nome -> função que cria o backend
+BACKENDS = {
+    "sqlite": SQLiteBackend,
+    "duckdb": _duckdb_backend,
+    "numpy": _columnar_backend,
+}
+
+_instances = {}
+
+
+def get_backend(name=None):
+    """The backend called ``name`` (default: $LOL_QUERY_BACKEND or sqlite).
+
+    One instance per name is kept, so every page shares it.
+    """
+    name = name or os.environ.get(BACKEND_ENV) or DEFAULT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Unknown query backend {name!r}, expected one of {list(BACKENDS)}"
+        )
+    if name not in _instances:
+        _instances[name] = BACKENDS[name]()
+    return _instances[name]
@@ -1,10 +1,71 @@
 import sqlite3
+import threading
 import pandas as pd
 import os
 
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+
+from .catalog import CATALOG_TABLE, store_catalog
+from .dimensions import (
+    DIMENSIONS,
+    create_dimension_tables,
+    encode_frame,
+    encoded_schema,
+)
+from .ingest import (
+    clean_matches,
+    coerce_frame,
+    create_table,
+    extract_bans,
+    file_fingerprint,
+    insert_frame,
+    iter_game_chunks,
+    list_csv_files,
+    prepare_file,
+    scan_file,
+    source_columns,
+    split_rows,
+)
+from .rollups import ROLLUP_TABLES, refresh_rollups
+from .schema_plan import (
+    ROW_TABLES,
+    load_plan,
+    new_columns,
+    plan_from_table,
+    plan_path,
+    plan_tables,
+    save_plan,
+    storage_schema,
+    storage_schemas,
+)
+
+# Versão do layout das tabelas; um banco de outra versão é recarregado inteiro
+LAYOUT_VERSION = 3
+
+DB_NAME = "lol_data.db"
+
+# Ajustes das conexões de leitura, sobrescritos pelo ambiente:
+# LOL_SQLITE_MMAP_SIZE (bytes), LOL_SQLITE_CACHE_SIZE (páginas, ou KiB se
+# negativo), LOL_SQLITE_TEMP_STORE (default|file|memory) e
+# LOL_SQLITE_IMMUTABLE=1 para bancos que não mudam enquanto o app roda
+READ_PRAGMAS = {
+    "mmap_size": ("LOL_SQLITE_MMAP_SIZE", 256 * 1024**2),
+    "cache_size": ("LOL_SQLITE_CACHE_SIZE", -64 * 1024),
+    "temp_store": ("LOL_SQLITE_TEMP_STORE", "memory"),
+}
+IMMUTABLE_ENV = "LOL_SQLITE_IMMUTABLE"
+
 
 class Database:
-    def __init__(self, db_name="lol_data.db"):
+    """Read-write connection to the database, for building and loading it.
+
+    The dashboard queries read through ``get_conn()`` instead.
+    """
+
+    def __init__(self, db_name=DB_NAME):
         self.db_name = db_name
         self.conn = None
         self.cursor = None
@@ -18,148 +79,451 @@ class Database:
         if self.conn:
             self.conn.close()
 
-    def initialize_database(self, data_dir="data"):
-        conn = get_conn()
-        self.cursor.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name='matches'"
-        )
-        if self.cursor.fetchone():
-            print("Database already initialized")
-            return
+    def initialize_database(
+        self,
+        data_dir="data",
+        incremental=False,
+        chunksize=None,
+        workers=None,
+        rebuild=False,
+    ):
+        """Build the game tables from the CSVs in ``data_dir``.
+
+        Player rows go to ``player_games`` and team rows (position "team") to
+        ``team_games``, each keeping only the columns that have values in its
+        rows; bans go to ``bans``. The derived tables of ``rollups.py`` (daily
+        rollups, lane matchups, game summary, head-to-head pairs) are built
+        from them, and an incremental load refreshes only the days of the
+        games it touched. The filter catalog of ``catalog.py`` is rewritten
+        after every load.
+
+        Games are identified by the integer ``game_key`` of the ``games``
+        dimension table, which maps each original Oracle's Elixir gameid to a
+        dense key. Keys are never reassigned: incremental loads and
+        ``rebuild=True`` (a full rebuild of an existing database) reuse the
+        keys already in the table and append new ones.
+
+        With ``incremental=True`` an existing database is updated in place:
+        only files whose size or content hash changed since the last load
+        are read, and only the games that are new or changed inside them
+        are rewritten. A database with an older table layout (such as the
+        single ``matches`` table) is always rebuilt.
+
+        With ``chunksize`` the CSVs are streamed in pieces of about that many
+        rows, so peak memory follows the chunk size instead of the dataset.
+
+        With ``workers`` > 1 each CSV is parsed and cleaned in its own worker
+        process and the results are written here, in file order, by this
+        single connection. Combined with ``chunksize``, at most ``workers``
+        cleaned files wait in memory for the writer.
+
+        Column types and drops come from the schema plan saved next to the
+        database (``lol_data.schema.json``). It is only inferred again when
+        the CSVs bring a column it does not know; delete the file to force a
+        new inference.
+        """
+        self._create_manifest_tables()
+        if self._table_exists("player_games") or self._table_exists("matches"):
+            current = self._layout_version() == LAYOUT_VERSION
+            if incremental and current:
+                return self._ingest_incremental(data_dir, chunksize)
+            if current and not (incremental or rebuild):
+                # Só monta os resumos que faltarem ou mudaram de colunas
+                with self.conn:
+                    refresh_rollups(self.cursor, days=())
+                    if not self._table_exists(CATALOG_TABLE):
+                        store_catalog(self.cursor)
+                print("Database already initialized")
+                return
+            # Banco de um layout antigo é recarregado inteiro, mesmo sem
+            # --rebuild (a carga incremental precisa do layout atual)
+            print("Rebuilding the game tables")
+            for table in (
+                "matches",
+                *ROW_TABLES,
+                "bans",
+                *ROLLUP_TABLES,
+                CATALOG_TABLE,
+            ):
+                self.cursor.execute(f"DROP TABLE IF EXISTS {table}")
         # data_dir="Z:/Repositorios Pessoais/DASH_LOL/data"
         # data_dir="D:/Codigos/DASH_LOL/data"
-        all_files = [f for f in os.listdir(data_dir) if f.endswith(".csv")]
-        dfs = [pd.read_csv(os.path.join(data_dir, f)) for f in all_files]
-        combined_df = pd.concat(dfs, ignore_index=True)
-        ban_df = combined_df.groupby("gameid").last().reset_index()
-        ban_df = ban_df[
-            [
-                "gameid",
-                "date",
-                "league",
-                "teamname",
-                "ban1",
-                "ban2",
-                "ban3",
-                "ban4",
-                "ban5",
-            ]
-        ].melt(
-            id_vars=["date", "gameid", "league", "teamname"],
-            var_name="ban_position",
-            value_name="champion",
+        all_files = list_csv_files(data_dir)
+        fingerprints = {f: file_fingerprint(f) for f in all_files}
+        plan = load_plan(plan_path(self.db_name))
+        if new_columns(plan, {c for f in all_files for c in source_columns(f)}):
+            plan = None
+        if workers and workers > 1:
+            plan = self._build_parallel(all_files, plan, workers, chunksize)
+        elif chunksize:
+            plan = self._build_streaming(all_files, plan, chunksize)
+        else:
+            plan = self._build_in_memory(all_files, plan)
+        self._record_files(fingerprints)
+        self.conn.commit()
+        self.cursor.execute(f"PRAGMA user_version = {LAYOUT_VERSION}")
+        save_plan(plan, plan_path(self.db_name))
+        self.cursor.execute("VACUUM")
+        self.cursor.execute(
+            "CREATE INDEX idx_player_games_player ON player_games (player_id, ts)"
         )
-        # ban_df=ban_df.champion.unique()
-
-        combined_df = combined_df.query("datacompleteness=='complete'").drop(
-            columns=[
-                "datacompleteness",
-                "url",
-                "pick1",
-                "pick2",
-                "pick3",
-                "pick4",
-                "pick5",
-                "playerid",
-                "ban1",
-                "ban2",
-                "ban3",
-                "ban4",
-                "ban5",
-                "teamid",
-            ]
+        self.cursor.execute(
+            "CREATE INDEX idx_player_games_champion ON player_games (champion_id, ts)"
         )
-        combined_df = combined_df.drop(
-            columns=[
-                col
-                for col in combined_df.columns
-                if col.endswith("25")
-                or col.endswith("20")
-                or col.endswith("15")
-                or col.endswith("10")
-            ]
+        self.cursor.execute(
+            "CREATE INDEX idx_player_games_team ON player_games (team_id, ts)"
         )
-        for col in [
-            "league",
-            "split",
-            "side",
-            "position",
-            "playername",
-            "teamname",
-            "champion",
-        ]:
-            combined_df[col] = combined_df[col].astype("category")
-
-        gameids_dict = dict(
-            zip(combined_df["gameid"], range(len(combined_df["gameid"].unique())))
+        self.cursor.execute(
+            "CREATE INDEX idx_player_games_gameid ON player_games (gameid)"
         )
-        gameids = combined_df["gameid"].map(gameids_dict)
-        combined_df["gameid"] = pd.to_numeric(gameids, downcast="unsigned")
-
-        combined_df["date"] = pd.to_datetime(combined_df["date"]).astype("string")
-        for col in combined_df.select_dtypes(include=["float"]):
-            if (
-                combined_df[col].dropna().apply(float.is_integer).all()
-            ):  # VE SE TODOS OS VALORES CONSEGUEM SER COLOCADO PRA INTEGER
-                combined_df[col] = combined_df[col].astype(
-                    "Int64"
-                )  # Int64 aceita valores nulos também
-
-        for col in combined_df.select_dtypes(include=["float"]):
-            if not combined_df[col].dropna().apply(float.is_integer).all():
-                combined_df[col] = pd.to_numeric(combined_df[col], downcast="float")
-        for col in combined_df.select_dtypes(include="category").columns:
-            combined_df[col] = combined_df[col].cat.remove_unused_categories()
-
-        # Remover colunas com valor único
-        for col in combined_df.columns:
-            if combined_df[col].nunique(dropna=False) == 1:
-                print(col)
-                combined_df.drop(columns=col, inplace=True)
-        # pd.DataFrame(combined_df.dtypes).to_clipboard()
-        # SELECT JUST SOME COLUMNS
-        # combined_df.info(memory_usage="deep")
-        # combined_df.memory_usage(deep=True).sort_values(ascending=False)
-        # combined_df.dtypes
-        # combined_df.nunique().sort_values()
-        combined_df["kda"] = (
-            combined_df["kills"] + combined_df["assists"]
-        ) / combined_df["deaths"].replace(0, 1)
-
-        ban_df = ban_df.dropna()
-
-        ban_df.loc[:, "gameid"] = ban_df["gameid"].map(gameids_dict)
-        ban_df.dropna(inplace=True)
-        ban_df.loc[:, "gameid"] = pd.to_numeric(ban_df["gameid"], downcast="unsigned")
-
-        # combined_df = combined_df.query("date>='2023-01-01'")
-        combined_df.to_sql("matches", self.conn, if_exists="replace", index=False)
-        ban_df.to_sql("bans", self.conn, if_exists="replace", index=False)
-        self.cursor.execute("VACUUM")
-        self.cursor.execute("CREATE INDEX idx_playername ON matches(playername)")
-        self.cursor.execute("CREATE INDEX idx_champion ON matches(champion)")
-        self.cursor.execute("CREATE INDEX idx_teamname ON matches(teamname)")
         self.cursor.execute(
-            "CREATE INDEX idx_champion_date ON matches (champion, date)"
+            "CREATE INDEX idx_player_games_league ON player_games (league_id)"
         )
-        # self.cursor.execute(
-        #     "CREATE INDEX idx_gameid_teamname ON matches (gameid, teamname)"
-        # )
-        self.cursor.execute("CREATE INDEX idx_league ON matches (league)")
         self.cursor.execute(
-            "CREATE INDEX idx_champion_position ON matches (champion,position)"
+            "CREATE INDEX idx_team_games_team ON team_games (team_id, ts)"
         )
+        self.cursor.execute("CREATE INDEX idx_team_games_gameid ON team_games (gameid)")
+        self.cursor.execute(
+            "CREATE INDEX idx_team_games_league ON team_games (league_id)"
+        )
+        self.cursor.execute("CREATE INDEX idx_team_games_day ON team_games (day)")
+        self.cursor.execute("CREATE INDEX idx_bans_gameid ON bans (gameid)")
+        refresh_rollups(self.cursor)
+        store_catalog(self.cursor)
 
         self.conn.commit()
         print("Database initialized successfully")
 
+    def export_parquet(self, out_dir=None):
+        """Write the Parquet snapshot of the game tables (``lol_data.parquet``)."""
+        from .parquet import export_parquet, parquet_dir
+
+        out_dir = out_dir or parquet_dir(self.db_name)
+        export_parquet(self.conn, out_dir)
+        print(f"Parquet snapshot written to {out_dir}")
+
+    def _build_in_memory(self, all_files, plan):
+        prepared = [prepare_file(path, scan=plan is None) for path in all_files]
+        return self._write_prepared(prepared, plan)
+
+    def _build_streaming(self, all_files, plan, chunksize):
+        if plan is None:
+            # 1ª passada: só descobre o schema, um pedaço por vez
+            plan = plan_tables(scan_file(path, chunksize) for path in all_files)
+        # 2ª passada: limpa, converte e grava cada pedaço
+        schemas, keys = storage_schemas(plan), self._game_keys()
+        for path in all_files:
+            for df, hashes in iter_game_chunks(path, chunksize):
+                frames = split_rows(clean_matches(df))
+                self._write_games(frames, extract_bans(df), schemas, keys, hashes)
+                self.conn.commit()
+        return plan
+
+    def _build_parallel(self, all_files, plan, workers, chunksize):
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            if not chunksize:
+                prepared = pool.map(
+                    prepare_file, all_files, repeat(None), repeat(plan is None)
+                )
+                return self._write_prepared(list(prepared), plan)
+            # Com chunksize, só o schema vem de todos os arquivos de uma vez;
+            # os arquivos limpos chegam aos poucos, no máximo ``workers`` à frente
+            if plan is None:
+                plan = plan_tables(pool.map(scan_file, all_files, repeat(chunksize)))
+            schemas, keys, pending = storage_schemas(plan), self._game_keys(), deque()
+            for path in all_files:
+                pending.append(pool.submit(prepare_file, path, chunksize, False))
+                while len(pending) >= workers or (pending and path == all_files[-1]):
+                    frames, ban_df, hashes, _ = pending.popleft().result()
+                    self._write_games(frames, ban_df, schemas, keys, hashes)
+                    self.conn.commit()
+        return plan
+
+    def _write_prepared(self, prepared, plan):
+        if plan is None:
+            plan = plan_tables(scans for *_, scans in prepared)
+        schemas, keys = storage_schemas(plan), self._game_keys()
+        for frames, ban_df, hashes, _ in prepared:
+            self._write_games(frames, ban_df, schemas, keys, hashes)
+        return plan
+
+    def _write_games(self, frames, ban_df, schemas, keys, hashes):
+        """Append cleaned games to the row tables and ``bans``.
+
+        ``frames`` maps each row table (``player_games``, ``team_games``) to
+        its rows. ``keys`` (original gameid -> key) is updated in place with
+        the games that have no key yet. Leagues, teams, players, champions,
+        positions and sides are stored as keys of their lookup tables.
+        """
+        references = {"gameid": "games(game_key)"}
+        references.update(
+            (key, f"{table}({key})") for table, key in DIMENSIONS.values()
+        )
+        for table, schema in schemas.items():
+            if not self._table_exists(table):
+                create_table(self.cursor, table, encoded_schema(schema), references)
+        if not self._table_exists("bans"):
+            create_table(
+                self.cursor,
+                "bans",
+                encoded_schema(
+                    {
+                        "gameid": "INTEGER",
+                        "league": "TEXT",
+                        "teamname": "TEXT",
+                        "ban_position": "TEXT",
+                        "champion": "TEXT",
+                        "ts": "INTEGER",
+                        "day": "INTEGER",
+                    }
+                ),
+                references,
+            )
+        gameids = pd.concat([df["gameid"] for df in frames.values()]).unique()
+        new_games = [g for g in gameids if g not in keys]
+        next_key = max(keys.values(), default=-1) + 1
+        keys.update(zip(new_games, range(next_key, next_key + len(new_games))))
+        self.cursor.executemany(
+            """
+            INSERT INTO games (game_key, gameid, row_hash) VALUES (?, ?, ?)
+            ON CONFLICT(game_key) DO UPDATE SET row_hash = excluded.row_hash
+            """,
+            [(keys[g], g, hashes[g]) for g in gameids],
+        )
+
+        for table, df in frames.items():
+            df = coerce_frame(df.assign(gameid=df["gameid"].map(keys)), schemas[table])
+            insert_frame(self.cursor, table, encode_frame(self.cursor, df))
+
+        ban_df = ban_df.assign(gameid=ban_df["gameid"].map(keys)).dropna(
+            subset=["gameid"]
+        )
+        insert_frame(self.cursor, "bans", encode_frame(self.cursor, ban_df))
+
+    def _table_exists(self, table):
+        self.cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,)
+        )
+        return self.cursor.fetchone() is not None
+
+    def _layout_version(self):
+        return self.cursor.execute("PRAGMA user_version").fetchone()[0]
+
+    def _game_keys(self):
+        """Original gameid -> game_key of every game already in ``games``."""
+        return dict(self.cursor.execute("SELECT gameid, game_key FROM games"))
 
-# Singleton
-_db_instance = Database()
+    def _create_manifest_tables(self):
+        # Arquivos já carregados, a dimensão games (gameid -> game_key) e as
+        # tabelas de lookup de ligas, times, jogadores, campeões etc.
+        self.cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ingested_files (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                sha256 TEXT NOT NULL,
+                ingested_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        self.cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS games (
+                game_key INTEGER PRIMARY KEY,
+                gameid TEXT NOT NULL UNIQUE,
+                row_hash TEXT NOT NULL
+            )
+            """
+        )
+        if self._table_exists("game_keys"):
+            self.cursor.execute(
+                """
+                INSERT OR IGNORE INTO games (game_key, gameid, row_hash)
+                SELECT game_key, gameid, row_hash FROM game_keys
+                """
+            )
+            self.cursor.execute("DROP TABLE game_keys")
+        create_dimension_tables(self.cursor)
+
+    def _record_files(self, fingerprints):
+        self.cursor.executemany(
+            """
+            INSERT INTO ingested_files (path, size, sha256) VALUES (?, ?, ?)
+            ON CONFLICT(path) DO UPDATE SET
+                size = excluded.size,
+                sha256 = excluded.sha256,
+                ingested_at = CURRENT_TIMESTAMP
+            """,
+            [
+                (os.path.basename(path), size, sha)
+                for path, (size, sha) in fingerprints.items()
+            ],
+        )
+
+    def _ingest_incremental(self, data_dir, chunksize=None):
+        self._create_manifest_tables()
+        manifest = {
+            path: (size, sha)
+            for path, size, sha in self.cursor.execute(
+                "SELECT path, size, sha256 FROM ingested_files"
+            )
+        }
+        changed = {}
+        for path in list_csv_files(data_dir):
+            fingerprint = file_fingerprint(path)
+            if manifest.get(os.path.basename(path)) != fingerprint:
+                changed[path] = fingerprint
+        if not changed:
+            print("Database is up to date")
+            return
+
+        columns = {c for path in changed for c in source_columns(path)}
+        plan = load_plan(plan_path(self.db_name)) or {
+            table: plan_from_table(self.cursor, table, columns) for table in ROW_TABLES
+        }
+        added = new_columns(plan, columns)
+
+        keys, known_hashes = {}, {}
+        for gameid, key, row_hash in self.cursor.execute(
+            "SELECT gameid, game_key, row_hash FROM games"
+        ):
+            keys[gameid] = key
+            known_hashes[gameid] = row_hash
+
+        upserted = 0
+        # Dias que os resumos precisam recalcular
+        days = set()
+        # Uma única transação: ou entra tudo, ou nada
+        with self.conn:
+            if added:
+                # Coluna nova nos CSVs: só ela passa pela inferência
+                rows_before = {
+                    table: self.cursor.execute(
+                        f"SELECT COUNT(*) FROM {table}"
+                    ).fetchone()[0]
+                    for table in ROW_TABLES
+                }
+                added_plan = plan_tables(
+                    (scan_file(path, chunksize, columns=added) for path in changed),
+                    rows_before,
+                )
+                for table, table_plan in added_plan.items():
+                    for col, kind in storage_schema(table_plan).items():
+                        self.cursor.execute(
+                            f'ALTER TABLE {table} ADD COLUMN "{col}" {kind}'
+                        )
+                    plan[table].update(table_plan)
+            schemas = storage_schemas(plan)
+            for path in changed:
+                for raw, hashes in iter_game_chunks(path, chunksize):
+                    dirty = [g for g, h in hashes.items() if known_hashes.get(g) != h]
+                    if not dirty:
+                        continue
+                    raw = raw[raw["gameid"].isin(dirty)]
+                    stale = [(keys[g],) for g in dirty if g in keys]
+                    for (key,) in stale:
+                        days.update(
+                            day
+                            for (day,) in self.cursor.execute(
+                                "SELECT DISTINCT day FROM player_games WHERE gameid = ?",
+                                (key,),
+                            )
+                        )
+                    for table in (*ROW_TABLES, "bans"):
+                        self.cursor.executemany(
+                            f"DELETE FROM {table} WHERE gameid = ?", stale
+                        )
+
+                    df = clean_matches(raw)
+                    frames = split_rows(df)
+                    self._write_games(frames, extract_bans(raw), schemas, keys, hashes)
+                    days.update(df["day"].dropna().unique())
+                    for gameid in df["gameid"].unique():
+                        known_hashes[gameid] = hashes[gameid]
+                    upserted += df["gameid"].nunique()
+            refresh_rollups(self.cursor, days)
+            if upserted:
+                store_catalog(self.cursor)
+            self._record_files(changed)
+        save_plan(plan, plan_path(self.db_name))
+        print(f"Incremental load finished: {upserted} games upserted")
+
+
+class ReadPool:
+    """Read-only connections to the database, one per thread.
+
+    Each thread opens its own connection on first use (``mode=ro``, plus
+    ``immutable=1`` when asked), so concurrent callbacks don't wait on a
+    shared one. Pragmas not given come from ``READ_PRAGMAS`` and the
+    environment.
+    """
+
+    def __init__(self, db_name=DB_NAME, immutable=None, **pragmas):
+        self.db_name = db_name
+        if immutable is None:
+            immutable = os.environ.get(IMMUTABLE_ENV, "") == "1"
+        self.immutable = immutable
+        self.pragmas = {}
+        for name, (env, default) in READ_PRAGMAS.items():
+            value = pragmas.get(name)
+            self.pragmas[name] = (
+                os.environ.get(env, default) if value is None else value
+            )
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._conns = []
+
+    def _open(self):
+        uri = Path(os.path.abspath(self.db_name)).as_uri() + "?mode=ro"
+        if self.immutable:
+            uri += "&immutable=1"
+        conn = sqlite3.connect(uri, uri=True)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._open()
+            with self._lock:
+                self._conns.append(conn)
+        return conn
+
+    def close(self):
+        with self._lock:
+            for conn in self._conns:
+                conn.close()
+            self._conns = []
+        self._local = threading.local()
+
+    def reset(self):
+        """Forget every connection without touching them, after a fork."""
+        with self._lock:
+            self._conns = []
+        self._local = threading.local()
+
+
+_pool = ReadPool()
 
 
 def get_conn():
-    return _db_instance.conn
+    """Read-only connection of the calling thread."""
+    return _pool.connection()
+
+
+def get_writer():
+    """A new ``Database`` (read-write) on the file the readers use."""
+    return Database(_pool.db_name)
+
+
+def reconnect():
+    """Drop the read connections, for a process forked after they opened.
+
+    A SQLite connection must not be used on both sides of a fork; each
+    thread of the new process opens its own on first use.
+    """
+    _pool.reset()
 
 
 def analyze_memory_usage(df):
@@ -203,7 +567,15 @@ def analyze_memory_usage(df):
     return result
 
 
-def analyze_sqlite_database(db_path="Z:/Repositorios Pessoais/DASH_LOL/lol_data.db"):
+def analyze_sqlite_database(
+    db_path="Z:/Repositorios Pessoais/DASH_LOL/lol_data.db", plans=False
+):
+    """Print size, tables, REAL columns and indexes of the database.
+
+    With ``plans`` it also runs the dashboard workload on the app database
+    (``get_conn()``) and prints the query plans with index proposals; see
+    ``query_plans.py`` and ``check_query_plans.py``.
+    """
     print("🔍 SQLite Database Diagnostic\n")
 
     # 1. Tamanho do arquivo
@@ -249,6 +621,13 @@ def analyze_sqlite_database(db_path="Z:/Repositorios Pessoais/DASH_LOL/lol_data.
             print()
 
     conn.close()
+
+    # 5. Planos das queries do dashboard
+    if plans:
+        from .query_plans import plan_report, print_plan_report
+
+        print_plan_report(plan_report())
+
     print("✅ Análise finalizada.")
 
 
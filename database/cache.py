@@ -0,0 +1,214 @@
+# Cache de resultados das queries, na frente do DataProcessor. Limitado pelo
+# tamanho total dos resultados (LRU) e esvaziado quando a versão dos dados
+# muda depois de uma carga.
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from .base import DB_NAME, get_conn
+from .catalog import data_version
+from .shared_cache import decode_value, encode_value, shared_cache_from_env
+
+CACHE_BYTES_ENV = "LOL_CACHE_BYTES"
+DEFAULT_CACHE_BYTES = 64 * 1024**2
+
+# Intervalo mínimo (s) entre duas leituras da versão dos dados
+VERSION_CHECK_SECONDS = 2.0
+
+
+def result_size(value):
+    """Approximate bytes held by a query result."""
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            result_size(k) + result_size(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(result_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def copy_result(value):
+    """A copy the caller can change without touching the cached result."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    if isinstance(value, dict):
+        return {k: copy_result(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [copy_result(v) for v in value]
+    return value
+
+
+# Valor padrão de put: a versão que o cache viu por último
+_LAST_SEEN = object()
+
+
+def _current_version():
+    return data_version(get_conn())
+
+
+class ResultCache:
+    """LRU of query results, bounded by their total size in bytes.
+
+    ``version`` is called (at most every ``VERSION_CHECK_SECONDS``) to get
+    the data version; when it changes every entry is dropped. Results are
+    copied in and out, so callers may change what they get.
+
+    ``shared`` is an optional second tier (``shared_cache.DiskCache`` or
+    ``RedisCache``) seen by every worker: a local miss looks there before
+    computing, and new results are written to both, encoded as data only
+    (``shared_cache.encode_value``). Its keys carry the ``namespace`` and
+    the data version, so old data is never read back.
+    """
+
+    def __init__(
+        self, max_bytes=None, version=_current_version, shared=None, namespace="results"
+    ):
+        if max_bytes is None:
+            max_bytes = int(os.environ.get(CACHE_BYTES_ENV, DEFAULT_CACHE_BYTES))
+        self.max_bytes = max_bytes
+        self._version = version
+        self.shared = shared
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # chave -> (resultado, bytes)
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+        self.shared_hits = 0
+        self.data_version = None
+        self._checked = None
+
+    def _check_version(self):
+        now = time.monotonic()
+        if self._checked is not None and now - self._checked < VERSION_CHECK_SECONDS:
+            return
+        self._checked = now
+        version = self._version()
+        if version != self.data_version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self.bytes = 0
+            self.data_version = version
+
+    def _shared_key(self, version, key):
+        digest = hashlib.sha256(repr(key).encode()).hexdigest()
+        return f"lol:{self.namespace}:{version}:{digest}"
+
+    def _shared_get(self, key, version):
+        if self.shared is None:
+            return False, None
+        data = self.shared.get(self._shared_key(version, key))
+        if data is None:
+            return False, None
+        try:
+            return True, decode_value(data)
+        except ValueError:
+            # Valor corrompido ou escrito por outra coisa: conta como miss
+            return False, None
+
+    def _lookup(self, key):
+        """``(found, result, data version of the lookup)``."""
+        with self._lock:
+            self._check_version()
+            version = self.data_version
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, copy_result(self._entries[key][0]), version
+        found, value = self._shared_get(key, version)
+        if found:
+            self._store(key, value, version)
+            with self._lock:
+                self.shared_hits += 1
+            return True, copy_result(value), version
+        with self._lock:
+            self.misses += 1
+        return False, None, version
+
+    def get(self, key):
+        """``(True, result)`` for a cached key, ``(False, None)`` otherwise."""
+        found, value, _ = self._lookup(key)
+        return found, value
+
+    def _store(self, key, value, version):
+        size = result_size(value)
+        if size > self.max_bytes:
+            return
+        value = copy_result(value)
+        with self._lock:
+            # Calculado antes de uma troca de versão: não vale para a nova
+            if version != self.data_version:
+                return
+            if key in self._entries:
+                self.bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+
+    def put(self, key, value, version=_LAST_SEEN):
+        """Store ``value``, computed from the data of ``version`` (default:
+        the version the cache saw last)."""
+        if version is _LAST_SEEN:
+            with self._lock:
+                version = self.data_version
+        self._store(key, value, version)
+        if self.shared is not None:
+            try:
+                data = encode_value(value)
+            except TypeError:
+                return
+            self.shared.set(self._shared_key(version, key), data)
+
+    def get_or_compute(self, key, compute):
+        # A versão é a de antes do cálculo: um resultado calculado enquanto
+        # uma carga troca a versão fica guardado com a versão antiga
+        found, value, version = self._lookup(key)
+        if not found:
+            value = compute()
+            self.put(key, value, version)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "data_version": self.data_version,
+            }
+
+
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache():
+    """The result cache shared by every ``DataProcessor`` of this process,
+    backed by the shared tier of $LOL_SHARED_CACHE."""
+    global _result_cache
+    with _result_cache_lock:
+        if _result_cache is None:
+            _result_cache = ResultCache(shared=shared_cache_from_env(DB_NAME))
+        return _result_cache
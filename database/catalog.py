@@ -0,0 +1,177 @@
+# Catálogo das opções dos filtros (datas, ligas, patches, campeões, jogadores
+# e times por liga). É montado no build, guardado na tabela catalog e lido
+# uma vez por versão dos dados, no lugar das queries DISTINCT de cada página.
+import datetime
+import json
+import sqlite3
+import threading
+import time
+
+from .dates import SECONDS_PER_DAY
+
+CATALOG_TABLE = "catalog"
+
+# Linha do catálogo que muda a cada carga: os caches de resultado comparam
+# com ela para saber se os dados mudaram
+VERSION_KEY = "version"
+
+# Nomes por liga: (tabela de linhas, tabela de lookup, chave, coluna do nome)
+_BY_LEAGUE = {
+    "players": ("player_games", "players", "player_id", "playername"),
+    "teams": ("team_games", "teams", "team_id", "teamname"),
+}
+
+
+class Catalog:
+    """Filter options of the pages.
+
+    ``dates`` are ``datetime.date`` objects, ``patches`` floats and the rest
+    names, every list sorted. Players and teams are kept per league;
+    ``players_in(None)`` and ``teams_in(None)`` give every one.
+    """
+
+    def __init__(self, data):
+        self.dates = [datetime.date.fromisoformat(d) for d in data["dates"]]
+        self.leagues = data["leagues"]
+        self.patches = data["patches"]
+        self.champions = data["champions"]
+        self.players = data["players"]
+        self.teams = data["teams"]
+        self.version = data.get(VERSION_KEY)
+
+    def _in(self, names, league):
+        if league:
+            return names.get(league, [])
+        return sorted(
+            {name for league_names in names.values() for name in league_names}
+        )
+
+    def players_in(self, league=None):
+        return self._in(self.players, league)
+
+    def teams_in(self, league=None):
+        return self._in(self.teams, league)
+
+    def period(self, index_range):
+        """``(start_date, end_date)`` (ISO strings) of the date slider
+        positions ``index_range``, clamped to the dates of this catalog."""
+        last = len(self.dates) - 1
+        start, end = (str(self.dates[min(max(int(i), 0), last)]) for i in index_range)
+        return start, end
+
+
+def _names(rows):
+    """Names that are not empty, sorted, without repeats."""
+    return sorted({name for name in rows if name is not None and name.strip()})
+
+
+def compute_catalog(conn):
+    """The catalog data (JSON-ready) straight from the game tables."""
+    data = {
+        "dates": [
+            date
+            for (date,) in conn.execute(
+                f"""
+                SELECT date(day * {SECONDS_PER_DAY}, 'unixepoch')
+                FROM (SELECT DISTINCT day FROM team_games)
+                ORDER BY day
+                """
+            )
+        ],
+        "leagues": _names(
+            league
+            for (league,) in conn.execute(
+                """
+                SELECT league
+                FROM leagues
+                WHERE league_id IN (SELECT league_id FROM team_games)
+                """
+            )
+        ),
+        "patches": [
+            patch
+            for (patch,) in conn.execute(
+                "SELECT DISTINCT patch FROM team_games WHERE patch IS NOT NULL"
+                " ORDER BY patch"
+            )
+        ],
+        "champions": _names(
+            champion
+            for (champion,) in conn.execute(
+                """
+                SELECT champion
+                FROM champions
+                WHERE champion_id IN (SELECT champion_id FROM player_games)
+                """
+            )
+        ),
+    }
+    for name, (table, lookup, key, col) in _BY_LEAGUE.items():
+        by_league = {}
+        for league, value in conn.execute(
+            f"""
+            SELECT l.league, n.{col}
+            FROM (SELECT DISTINCT league_id, {key} FROM {table}) r
+            JOIN leagues l ON l.league_id = r.league_id
+            JOIN {lookup} n ON n.{key} = r.{key}
+            """
+        ):
+            by_league.setdefault(league, []).append(value)
+        data[name] = {league: _names(v) for league, v in sorted(by_league.items())}
+    return data
+
+
+def store_catalog(cursor):
+    """Compute the catalog and (re)write it to the ``catalog`` table.
+
+    It also stamps a new data version (see ``data_version``).
+    """
+    data = compute_catalog(cursor.connection)
+    data[VERSION_KEY] = str(time.time_ns())
+    cursor.execute(
+        f"CREATE TABLE IF NOT EXISTS {CATALOG_TABLE} (name TEXT PRIMARY KEY, value TEXT)"
+    )
+    cursor.executemany(
+        f"INSERT OR REPLACE INTO {CATALOG_TABLE} (name, value) VALUES (?, ?)",
+        [(name, json.dumps(value)) for name, value in data.items()],
+    )
+
+
+def read_catalog(conn):
+    """The stored catalog, or one computed on the spot for an older database."""
+    try:
+        rows = conn.execute(f"SELECT name, value FROM {CATALOG_TABLE}").fetchall()
+    except sqlite3.OperationalError:
+        rows = []
+    if not rows:
+        return Catalog(compute_catalog(conn))
+    return Catalog({name: json.loads(value) for name, value in rows})
+
+
+def data_version(conn):
+    """Version of the data stamped by the last load (None if never stamped)."""
+    try:
+        row = conn.execute(
+            f"SELECT value FROM {CATALOG_TABLE} WHERE name = ?", (VERSION_KEY,)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return json.loads(row[0]) if row else None
+
+
+_catalog = None
+_lock = threading.Lock()
+
+
+def get_catalog():
+    """The catalog of this process, read from the database on first use and
+    read again when a load stamps a new data version."""
+    from .base import get_conn
+
+    global _catalog
+    conn = get_conn()
+    version = data_version(conn)
+    with _lock:
+        if _catalog is None or _catalog.version != version:
+            _catalog = read_catalog(conn)
+        return _catalog
@@ -1,5 +1,7 @@
 import pandas as pd
 from .base import get_conn
+from .dimensions import key_of, keys_in
+from .dates import DATE_SQL, date_range
 
 
 def get_champion_stats(
@@ -8,22 +10,26 @@ def get_champion_stats(
     conn = get_conn()
     if champion_name is None:
         return pd.read_sql_query(
-            "SELECT DISTINCT(champion) FROM matches",
+            """
+            SELECT champion
+            FROM (SELECT DISTINCT champion_id FROM player_games)
+            LEFT JOIN champions USING (champion_id)
+            """,
             conn,
         )
 
-    query = """
+    query = f"""
         SELECT champion, kills, deaths, assists, kda, result
-        FROM matches
-        WHERE champion = ?
-          AND date BETWEEN ? AND ?
+        FROM player_games
+        LEFT JOIN champions USING (champion_id)
+        WHERE champion_id = {key_of("champion")}
+          AND ts >= ? AND ts < ?
     """
 
-    params = [champion_name, start_date, end_date]
+    params = [champion_name, *date_range(start_date, end_date)]
 
     if leagues:
-        placeholders = ",".join(["?"] * len(leagues))
-        query += f" AND league IN ({placeholders})"
+        query += f" AND league_id IN {keys_in('league', len(leagues))}"
         params += leagues
 
     return pd.read_sql_query(query, conn, params=params)
@@ -32,41 +38,30 @@ def get_champion_stats(
 def get_champion_match_history(
     champion_name=None, start_date=None, end_date=None, leagues=None
 ):
+    """Last 10 games of ``champion_name`` against a different lane champion."""
     conn = get_conn()
 
-    query = """
-        SELECT league,gameid,teamname,position,result,champion
-        FROM matches
-        WHERE champion = ?
-          AND date BETWEEN ? AND ?
+    query = f"""
+        SELECT league, gameid, t.teamname AS teamname_champ, position, result,
+               c.champion AS champion_champ, {DATE_SQL} AS date,
+               ot.teamname AS teamname_opp, oc.champion AS champion_opp
+        FROM lane_matchups m
+        LEFT JOIN leagues USING (league_id)
+        LEFT JOIN positions USING (position_id)
+        LEFT JOIN teams t ON t.team_id = m.team_id
+        LEFT JOIN champions c ON c.champion_id = m.champion_id
+        LEFT JOIN teams ot ON ot.team_id = m.opponent_team_id
+        LEFT JOIN champions oc ON oc.champion_id = m.opponent_champion_id
+        WHERE m.champion_id = {key_of("champion")}
+          AND m.opponent_champion_id IS NOT m.champion_id
+          AND ts >= ? AND ts < ?
     """
 
-    params = [champion_name, start_date, end_date]
+    params = [champion_name, *date_range(start_date, end_date)]
 
     if leagues:
-        placeholders = ",".join(["?"] * len(leagues))
-        query += f" AND league IN ({placeholders})"
+        query += f" AND league_id IN {keys_in('league', len(leagues))}"
         params += leagues
 
-    df1_champ = pd.read_sql_query(query, conn, params=params)
-    # df1_champ = pd.read_sql_query(
-    #     query, conn, params=[champion_name, "2024-01-01", "2026-01-01"]
-    # )
-
-    placeholders = ",".join(["?"] * len(df1_champ))
-    query_opp = f"""
-        SELECT gameid, date,position, teamname, champion 
-        FROM matches 
-        WHERE gameid IN ({placeholders})
-    """
-    df_opp = pd.read_sql_query(query_opp, conn, params=df1_champ.gameid.tolist())
-
-    df_merged = pd.merge(
-        df1_champ,
-        df_opp,
-        on=["gameid", "position"],
-        how="left",
-        suffixes=("_champ", "_opp"),
-    ).query("champion_champ != champion_opp")
-
-    return df_merged.sort_values(by="date", ascending=False).head(10)
+    query += " ORDER BY ts DESC LIMIT 10"
+    return pd.read_sql_query(query, conn, params=params)
@@ -1,138 +1,148 @@
 from .base import get_conn
+from .dimensions import key_of, keys_in
+from .dates import date_range, day_range
 import pandas as pd
 
 
-def _format_placeholders(lst):
-    return ",".join(["?"] * len(lst))
-
-
-def get_best_allies(champions, start_date, end_date, leagues=None):
-    conn = get_conn()
-
-    champ_placeholders = _format_placeholders(champions)
+def _pairs_from_rollup(champion, start_date, end_date, leagues):
+    """One champion: sum the daily pair counts of ``champion_pairs_daily``."""
     league_filter = ""
     league_params = []
 
     if leagues:
-        league_placeholders = _format_placeholders(leagues)
-        league_filter = f" AND league IN ({league_placeholders})"
+        league_filter = f" AND league_id IN {keys_in('league', len(leagues))}"
         league_params = leagues
 
     query = f"""
-        WITH relevant_games AS (
-            SELECT gameid, teamname
-            FROM matches
-            WHERE champion IN ({champ_placeholders})
-              AND date BETWEEN ? AND ?
-              AND position != 'team'
-              {league_filter}
-            GROUP BY gameid, teamname
-            HAVING COUNT(DISTINCT champion) = {len(champions)}
-        )
-        SELECT m2.champion,
-               COUNT(*) AS games,
-               ROUND(100.0 * SUM(m1.result) / COUNT(*), 2) AS winrate
-        FROM matches m1
-        JOIN matches m2
-          ON m1.gameid = m2.gameid AND m1.teamname = m2.teamname
-        JOIN relevant_games rg
-          ON m1.gameid = rg.gameid AND m1.teamname = rg.teamname
-        WHERE m1.champion IN ({champ_placeholders})
-          AND m2.champion NOT IN ({champ_placeholders})
-          AND m2.position != 'team'
-        GROUP BY m2.champion
-        HAVING games >= 5
-        ORDER BY winrate DESC
-        LIMIT 10
+        SELECT c.champion,
+               p.same_team,
+               SUM(p.games) AS games,
+               ROUND(100.0 * SUM(p.wins) / SUM(p.games), 2) AS winrate
+        FROM champion_pairs_daily p
+        LEFT JOIN champions c ON c.champion_id = p.other_id
+        WHERE p.champion_id = {key_of("champion")}
+          AND p.day >= ? AND p.day < ?
+          {league_filter}
+        GROUP BY p.other_id, p.same_team
     """
 
-    params = champions + [start_date, end_date] + league_params + champions + champions
-    return pd.read_sql_query(query, conn, params=params)
+    params = [champion, *day_range(start_date, end_date)]
+    return pd.read_sql_query(query, get_conn(), params=params + league_params)
 
 
-def get_best_against(champions, start_date, end_date, leagues=None):
-    conn = get_conn()
-
-    champ_placeholders = _format_placeholders(champions)
+def _pairs_from_games(champions, start_date, end_date, leagues):
+    """Several champions: find the games where they played together first."""
+    champ_keys = keys_in("champion", len(champions))
     league_filter = ""
     league_params = []
 
     if leagues:
-        league_placeholders = _format_placeholders(leagues)
-        league_filter = f" AND league IN ({league_placeholders})"
+        league_filter = f" AND league_id IN {keys_in('league', len(leagues))}"
         league_params = leagues
 
     query = f"""
         WITH relevant_games AS (
-            SELECT gameid, teamname
-            FROM matches
-            WHERE champion IN ({champ_placeholders})
-              AND date BETWEEN ? AND ?
-              AND position != 'team'
+            SELECT gameid, team_id
+            FROM player_games
+            WHERE champion_id IN {champ_keys}
+              AND ts >= ? AND ts < ?
               {league_filter}
-            GROUP BY gameid, teamname
-            HAVING COUNT(DISTINCT champion) = {len(champions)}
+            GROUP BY gameid, team_id
+            HAVING COUNT(DISTINCT champion_id) = {len(champions)}
         )
-        SELECT m2.champion,
+        SELECT c.champion,
+               m1.team_id = m2.team_id AS same_team,
                COUNT(*) AS games,
                ROUND(100.0 * SUM(m1.result) / COUNT(*), 2) AS winrate
-        FROM matches m1
-        JOIN matches m2
-          ON m1.gameid = m2.gameid AND m1.teamname != m2.teamname
+        FROM player_games m1
+        JOIN player_games m2 ON m1.gameid = m2.gameid
         JOIN relevant_games rg
-          ON m1.gameid = rg.gameid AND m1.teamname = rg.teamname
-        WHERE m1.champion IN ({champ_placeholders})
-          AND m2.champion NOT IN ({champ_placeholders})
-          AND m2.position != 'team'
-        GROUP BY m2.champion
-        HAVING games >= 5
-        ORDER BY winrate DESC
-        LIMIT 10
+          ON m1.gameid = rg.gameid AND m1.team_id = rg.team_id
+        LEFT JOIN champions c ON c.champion_id = m2.champion_id
+        WHERE m1.champion_id IN {champ_keys}
+          AND m2.champion_id NOT IN {champ_keys}
+          AND m2.team_id IS NOT NULL
+        GROUP BY m2.champion_id, same_team
     """
 
-    params = champions + [start_date, end_date] + league_params + champions + champions
-    return pd.read_sql_query(query, conn, params=params)
+    params = (
+        champions
+        + [*date_range(start_date, end_date)]
+        + league_params
+        + champions
+        + champions
+    )
+    return pd.read_sql_query(query, get_conn(), params=params)
+
+
+def _champion_pairs(champions, start_date, end_date, leagues):
+    """Games and winrate of ``champions`` with each other champion of their
+    games, on the same team (``same_team`` 1) or against them (0)."""
+    if len(champions) == 1:
+        return _pairs_from_rollup(champions[0], start_date, end_date, leagues)
+    return _pairs_from_games(champions, start_date, end_date, leagues)
+
+
+def top_pairs(pairs, same_team, ascending):
+    """The 10 best (or worst) pairs of one side, with at least 5 games
+    (ties by champion name, so every backend keeps the same ten)."""
+    pairs = pairs[(pairs["same_team"] == int(same_team)) & (pairs["games"] >= 5)]
+    pairs = pairs.sort_values(
+        ["winrate", "champion"],
+        ascending=[ascending, True],
+        kind="stable",
+        na_position="first" if ascending else "last",
+    )
+    return pairs[["champion", "games", "winrate"]].head(10).reset_index(drop=True)
+
+
+def pair_distribution(pairs, same_team):
+    """Every pair of one side, most games first."""
+    pairs = pairs[pairs["same_team"] == int(same_team)]
+    pairs = pairs.sort_values(
+        ["games", "champion"], ascending=[False, True], kind="stable"
+    )
+    return pairs[["champion", "games", "winrate"]].reset_index(drop=True)
 
 
-def get_worst_against(champions, start_date, end_date, leagues=None):
-    conn = get_conn()
+def get_best_allies(champions, start_date, end_date, leagues=None):
+    pairs = _champion_pairs(champions, start_date, end_date, leagues)
+    return top_pairs(pairs, True, False)
 
-    champ_placeholders = _format_placeholders(champions)
-    league_filter = ""
-    league_params = []
 
-    if leagues:
-        league_placeholders = _format_placeholders(leagues)
-        league_filter = f" AND league IN ({league_placeholders})"
-        league_params = leagues
+def get_best_against(champions, start_date, end_date, leagues=None):
+    pairs = _champion_pairs(champions, start_date, end_date, leagues)
+    return top_pairs(pairs, False, False)
 
-    query = f"""
-        WITH relevant_games AS (
-            SELECT gameid, teamname
-            FROM matches
-            WHERE champion IN ({champ_placeholders})
-              AND date BETWEEN ? AND ?
-              AND position != 'team'
-              {league_filter}
-            GROUP BY gameid, teamname
-            HAVING COUNT(DISTINCT champion) = {len(champions)}
-        )
-        SELECT m2.champion,
-               COUNT(*) AS games,
-               ROUND(100.0 * SUM(m1.result) / COUNT(*), 2) AS winrate
-        FROM matches m1
-        JOIN matches m2
-          ON m1.gameid = m2.gameid AND m1.teamname != m2.teamname
-        JOIN relevant_games rg
-          ON m1.gameid = rg.gameid AND m1.teamname = rg.teamname
-        WHERE m1.champion IN ({champ_placeholders})
-          AND m2.champion NOT IN ({champ_placeholders})
-          AND m2.position != 'team'
-        GROUP BY m2.champion
-        HAVING games >= 5
-        ORDER BY winrate ASC
-        LIMIT 10
-    """
 
-    params = champions + [start_date, end_date] + league_params + champions + champions
-    return pd.read_sql_query(query, conn, params=params)
+def get_worst_against(champions, start_date, end_date, leagues=None):
+    pairs = _champion_pairs(champions, start_date, end_date, leagues)
+    return top_pairs(pairs, False, True)
+
+
+def synergies_and_counters(pairs, distributions=False):
+    """The frames of ``get_synergies_and_counters`` from one pairs frame."""
+    result = {
+        "allies": top_pairs(pairs, True, False),
+        "best_against": top_pairs(pairs, False, False),
+        "worst_against": top_pairs(pairs, False, True),
+    }
+    if distributions:
+        result["allies_all"] = pair_distribution(pairs, True)
+        result["against_all"] = pair_distribution(pairs, False)
+    return result
+
+
+def get_synergies_and_counters(
+    champions, start_date, end_date, leagues=None, distributions=False
+):
+    """Best allies, best and worst matchups of ``champions`` from one query.
+
+    Returns a dict with the frames of ``get_best_allies``,
+    ``get_best_against`` and ``get_worst_against`` under ``"allies"``,
+    ``"best_against"`` and ``"worst_against"``. With ``distributions``
+    it also has ``"allies_all"`` and ``"against_all"``: every champion
+    seen with (or against) them, most games first, with no minimum.
+    """
+    pairs = _champion_pairs(champions, start_date, end_date, leagues)
+    return synergies_and_counters(pairs, distributions)
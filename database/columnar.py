@@ -0,0 +1,753 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .backends import QueryBackend
+from .champions_sinergys_counters import synergies_and_counters, top_pairs
+from .base import get_conn
+from .catalog import data_version
+from .dates import date_range
+from .dimensions import DIMENSIONS
+from .shared import get_all_columns
+
+# Colunas carregadas na memória; as demais ficam só no SQLite
+KEY_COLUMNS = (
+    "gameid",
+    "league_id",
+    "team_id",
+    "player_id",
+    "champion_id",
+    "position_id",
+)
+VALUE_COLUMNS = ("patch", "result", "kills", "deaths", "assists", "totalgold", "kda")
+
+# Colunas com as linhas agrupadas por chave, para achar um jogador/time/
+# campeão/jogo sem varrer a tabela
+INDEXED_COLUMNS = ("gameid", "team_id", "player_id", "champion_id")
+
+_NO_ROWS = np.empty(0, dtype=np.int64)
+
+
+class _Table:
+    """One game table as NumPy arrays, rows sorted by ``ts``.
+
+    Dimension columns keep their integer keys (NULL is -1) and numeric
+    columns are float64 (NULL is NaN). For each indexed column the row
+    numbers are grouped by key, still in ``ts`` order inside each key.
+    """
+
+    def __init__(self, df):
+        self.columns = {}
+        for col in df.columns:
+            if col in KEY_COLUMNS or col in ("ts", "day"):
+                values = df[col].fillna(-1).to_numpy(np.int64)
+            else:
+                values = df[col].to_numpy(np.float64, na_value=np.nan)
+            self.columns[col] = values
+        self.ts = self.columns["ts"]
+        self.groups = {
+            col: self._group(self.columns[col])
+            for col in INDEXED_COLUMNS
+            if col in self.columns
+        }
+
+    def __getitem__(self, col):
+        return self.columns[col]
+
+    @staticmethod
+    def _group(values):
+        """(row numbers sorted by key, start of each key in them)."""
+        order = np.argsort(values, kind="stable")
+        keys = np.arange(values.max(initial=-1) + 2)
+        return order, np.searchsorted(values[order], keys)
+
+    def span(self, lo, hi):
+        """Rows with ``lo <= ts < hi``."""
+        return np.arange(*np.searchsorted(self.ts, (lo, hi)))
+
+    def rows(self, col, key, lo, hi):
+        """Rows whose ``col`` is ``key`` and ``lo <= ts < hi``, in ts order."""
+        order, bounds = self.groups[col]
+        if key is None or not 0 <= key < len(bounds) - 1:
+            return _NO_ROWS
+        rows = order[bounds[key] : bounds[key + 1]]
+        return rows[slice(*np.searchsorted(self.ts[rows], (lo, hi)))]
+
+    def members(self, col, keys):
+        """``(i, row)`` for every row whose ``col`` is ``keys[i]``."""
+        order, bounds = self.groups[col]
+        starts = bounds[keys]
+        counts = bounds[keys + 1] - starts
+        owner = np.repeat(np.arange(len(keys)), counts)
+        first = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        return owner, order[first + np.arange(len(owner))]
+
+
+def _mean(values):
+    """SQL AVG: NULLs are skipped and nothing left gives NULL."""
+    values = values[~np.isnan(values)]
+    return values.mean() if len(values) else np.nan
+
+
+def _sum(values):
+    """SQL SUM of 0/1 or count columns, as an int like SQLite returns."""
+    values = values[~np.isnan(values)]
+    return int(values.sum()) if len(values) else np.nan
+
+
+def _value(value):
+    """A scalar for a one-row result: NaN becomes None, as NULL in SQLite."""
+    return None if np.isnan(value) else value
+
+
+def _group_sums(inverse, count, values):
+    """SQL SUM of ``values`` per group: (sums, non-NULL values per group)."""
+    valid = ~np.isnan(values)
+    seen = np.bincount(inverse[valid], minlength=count)
+    sums = np.bincount(inverse[valid], values[valid], minlength=count)
+    return np.where(seen > 0, sums, np.nan), seen
+
+
+def _round(values):
+    """ROUND(x, 2) of SQLite, which rounds halves away from zero."""
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.sign(values) * np.floor(np.abs(values) * 100 + 0.5) / 100
+    return rounded if rounded.ndim else float(rounded)
+
+
+def _descending(values):
+    """Row order of ORDER BY ... DESC in SQLite, ties last group first."""
+    return np.argsort(values, kind="stable")[::-1]
+
+
+def _date_text(ts):
+    """Same text as datetime(ts, 'unixepoch') in SQLite."""
+    text = np.datetime_as_string(ts.astype("datetime64[s]"), unit="s")
+    return np.char.replace(text, "T", " ").astype(object)
+
+
+class ColumnarBackend(QueryBackend):
+    """The dashboard queries answered from NumPy arrays held in memory.
+
+    ``player_games`` and ``team_games`` are read once from SQLite (only the
+    columns the pages use) and every query becomes index lookups, masks
+    and ``bincount`` aggregations over those arrays. Results match the
+    SQLite backend, column for column.
+
+    Built at import of the pages, so with ``preload_app`` (see
+    gunicorn.conf.py) the arrays are loaded once in the gunicorn master
+    and shared copy-on-write by the workers. ``refresh`` reloads them when
+    a load changes the data version (``catalog.data_version``); a worker
+    that reloads keeps its own copy from then on.
+    """
+
+    name = "numpy"
+
+    def __init__(self, conn=None):
+        self._conn = conn
+        self._reload_lock = threading.Lock()
+        self._load_all(conn or get_conn())
+
+    def _load_all(self, conn):
+        # A versão é lida antes dos dados: se uma carga terminar no meio, a
+        # versão antiga fica registrada e o próximo refresh recarrega
+        version = data_version(conn)
+        # coluna de nome -> nomes indexados pela chave (o último é None,
+        # assim a chave -1 de um NULL vira None) e nome -> chave
+        names = {}
+        keys = {}
+        for col, (table, key) in DIMENSIONS.items():
+            df = pd.read_sql_query(f"SELECT {key}, {col} FROM {table}", conn)
+            values = np.full(df[key].to_numpy().max(initial=-1) + 2, None, dtype=object)
+            values[df[key].to_numpy()] = df[col].to_numpy()
+            names[col] = values
+            keys[col] = dict(zip(df[col], df[key]))
+        loaded = {
+            "names": names,
+            "keys": keys,
+            "player_games": self._load(conn, "player_games"),
+            "team_games": self._load(conn, "team_games"),
+            "columns": get_all_columns(),
+            "data_version": version,
+        }
+        # Troca tudo de uma vez; as chaves das tabelas de lookup não mudam
+        # numa carga incremental, então uma query já em andamento continua
+        # achando os nomes certos
+        self.__dict__.update(loaded)
+
+    def refresh(self):
+        """Reload the arrays if the data version changed since they were
+        loaded. Other threads that see the new version wait for the reload."""
+        conn = self._conn or get_conn()
+        if data_version(conn) == self.data_version:
+            return
+        with self._reload_lock:
+            if data_version(conn) != self.data_version:
+                self._load_all(conn)
+
+    @staticmethod
+    def _load(conn, table):
+        present = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        columns = [
+            col for col in ("ts", "day", *KEY_COLUMNS, *VALUE_COLUMNS) if col in present
+        ]
+        query = f"SELECT {', '.join(columns)} FROM {table} ORDER BY ts, gameid"
+        return _Table(pd.read_sql_query(query, conn))
+
+    def _key(self, col, name):
+        try:
+            return self.keys[col].get(name)
+        except TypeError:
+            return None
+
+    def _name(self, col, keys):
+        return self.names[col][keys]
+
+    def _in_leagues(self, table, rows, leagues):
+        if not leagues:
+            return rows
+        keys = [self._key("league", league) for league in leagues]
+        return rows[
+            np.isin(table["league_id"][rows], [k for k in keys if k is not None])
+        ]
+
+    def _period_stats(self, table, rows, columns):
+        """One row of COUNT/AVG over ``rows``, as the *_in_period queries."""
+        stats = {
+            "games": [len(rows)],
+            "winrate": [_value(_round(100.0 * _mean(table["result"][rows])))],
+        }
+        for out, col in columns:
+            stats[out] = [_value(_round(_mean(table[col][rows])))]
+        return pd.DataFrame(stats)
+
+    def _between(self, table, col, names, lo, hi, leagues=None):
+        """Rows of both ``names`` in the games where both played, in ts order."""
+        name_col = {
+            "player_id": "playername",
+            "team_id": "teamname",
+            "champion_id": "champion",
+        }[col]
+        keys = [self._key(name_col, name) for name in names]
+        if None in keys or keys[0] == keys[1]:
+            return _NO_ROWS
+        found = [
+            self._in_leagues(table, table.rows(col, key, lo, hi), leagues)
+            for key in keys
+        ]
+        games = np.intersect1d(table["gameid"][found[0]], table["gameid"][found[1]])
+        rows = np.concatenate(found)
+        return np.sort(rows[np.isin(table["gameid"][rows], games)])
+
+    def _h2h_stats(self, table, rows, col, name_col, columns):
+        """Per-key h2h summary (GROUP BY the key), keys in ascending order."""
+        keys, inverse = np.unique(table[col][rows], return_inverse=True)
+        games = np.bincount(inverse, minlength=len(keys))
+        stats = {
+            name_col: self._name(name_col, keys),
+            "games": games,
+            "wins": _group_sums(inverse, len(keys), table["result"][rows])[0].astype(
+                np.int64
+            ),
+        }
+        for out, value_col in columns:
+            sums, seen = _group_sums(inverse, len(keys), table[value_col][rows])
+            with np.errstate(invalid="ignore", divide="ignore"):
+                stats[out] = _round(sums / seen)
+        return pd.DataFrame(stats)
+
+    # Players
+
+    def get_player_stats(self, player_name=None, start_date=None, end_date=None):
+        pg = self.player_games
+        if not player_name:
+            return pd.DataFrame(
+                {"playername": self._name("playername", np.unique(pg["player_id"]))}
+            )
+        columns = ["kills", "deaths", "assists", "kda", "totalgold"]
+        key = self._key("playername", player_name)
+        rows = pg.rows("player_id", key, *date_range(start_date, end_date))
+        if not len(rows):
+            return pd.DataFrame(columns=["playername", *columns])
+        stats = {"playername": [self.names["playername"][key]]}
+        stats.update({col: [_mean(pg[col][rows])] for col in columns})
+        return pd.DataFrame(stats)
+
+    def get_player_match_history(self, player_name, start_date=None, end_date=None):
+        pg = self.player_games
+        key = self._key("playername", player_name)
+        rows = pg.rows("player_id", key, *date_range(start_date, end_date))[::-1]
+        df = pd.DataFrame(
+            {
+                "gameid": pg["gameid"][rows],
+                "date": _date_text(pg.ts[rows]),
+                "position": self._name("position", pg["position_id"][rows]),
+                "playername": self._name("playername", pg["player_id"][rows]),
+                "champion": self._name("champion", pg["champion_id"][rows]),
+                "kills": pg["kills"][rows],
+                "deaths": pg["deaths"][rows],
+                "assists": pg["assists"][rows],
+                "totalgold": pg["totalgold"][rows],
+                "result": pg["result"][rows],
+            }
+        )
+        if df.empty:
+            return df
+
+        # Quem jogou na mesma posição do outro lado, em cada jogo
+        owner, other = pg.members("gameid", pg["gameid"][rows])
+        other_player = pg["player_id"][other]
+        keep = (pg["position_id"][other] == pg["position_id"][rows][owner]) & (
+            (other_player >= 0) & (other_player != key)
+        )
+        owner, other = owner[keep], other[keep]
+        df = df.iloc[owner].reset_index(drop=True)
+        df["opponent"] = self._name("playername", pg["player_id"][other])
+        df["opponent_champion"] = self._name("champion", pg["champion_id"][other])
+        return df
+
+    def get_most_picked_champions(self, player_name, start_date=None, end_date=None):
+        pg = self.player_games
+        key = self._key("playername", player_name)
+        rows = pg.rows("player_id", key, *date_range(start_date, end_date))
+        champions, inverse = np.unique(pg["champion_id"][rows], return_inverse=True)
+        count = len(champions)
+        games = np.bincount(inverse, minlength=count)
+        sums = {
+            col: _group_sums(inverse, count, pg[col][rows])[0]
+            for col in ("result", "kills", "deaths", "assists")
+        }
+        with np.errstate(invalid="ignore", divide="ignore"):
+            kda = (sums["kills"] + sums["assists"]) / sums["deaths"]
+        df = pd.DataFrame(
+            {
+                "champion": self._name("champion", champions),
+                "num_games": games,
+                "winrate": _round(100 * sums["result"] / games),
+                "avg_kills": _round(sums["kills"] / games),
+                "avg_deaths": _round(sums["deaths"] / games),
+                "avg_assists": _round(sums["assists"] / games),
+                # divisão por zero é NULL no SQLite
+                "kda": _round(np.where(np.isfinite(kda), kda, np.nan)),
+            }
+        )
+        return df.iloc[_descending(games)].reset_index(drop=True)
+
+    def get_player_stats_in_period(self, player_name, start_date, end_date):
+        pg = self.player_games
+        key = self._key("playername", player_name)
+        rows = pg.rows("player_id", key, *date_range(start_date, end_date))
+        return self._period_stats(
+            pg,
+            rows,
+            [
+                ("avg_kills", "kills"),
+                ("avg_deaths", "deaths"),
+                ("avg_assists", "assists"),
+                ("avg_kda", "kda"),
+                ("avg_gold", "totalgold"),
+            ],
+        )
+
+    def get_head2head_stats(self, player1, player2, start_date, end_date):
+        pg = self.player_games
+        lo, hi = date_range(start_date, end_date)
+        rows = self._between(pg, "player_id", (player1, player2), lo, hi)
+        return self._h2h_stats(
+            pg,
+            rows,
+            "player_id",
+            "playername",
+            [
+                ("avg_kills", "kills"),
+                ("avg_deaths", "deaths"),
+                ("avg_assists", "assists"),
+                ("avg_kda", "kda"),
+                ("avg_gold", "totalgold"),
+            ],
+        )
+
+    def get_head2head_match_history(self, player1, player2, start_date, end_date):
+        pg = self.player_games
+        lo, hi = date_range(start_date, end_date)
+        rows = self._between(pg, "player_id", (player1, player2), lo, hi)[::-1]
+        return pd.DataFrame(
+            {
+                "gameid": pg["gameid"][rows],
+                "date": _date_text(pg.ts[rows]),
+                "playername": self._name("playername", pg["player_id"][rows]),
+                "champion": self._name("champion", pg["champion_id"][rows]),
+                "kills": pg["kills"][rows],
+                "deaths": pg["deaths"][rows],
+                "assists": pg["assists"][rows],
+                "kda": pg["kda"][rows],
+                "result": pg["result"][rows],
+            }
+        )
+
+    # Teams
+
+    def get_team_stats(self, team_name=None, start_date=None, end_date=None):
+        tg = self.team_games
+        columns = ["kills", "deaths", "assists", "totalgold", "result"]
+        if team_name:
+            key = self._key("teamname", team_name)
+            rows = tg.rows("team_id", key, *date_range(start_date, end_date))
+        else:
+            rows = np.arange(len(tg.ts))
+        teams, inverse = np.unique(tg["team_id"][rows], return_inverse=True)
+        stats = {"teamname": self._name("teamname", teams)}
+        for col in columns:
+            sums, seen = _group_sums(inverse, len(teams), tg[col][rows])
+            with np.errstate(invalid="ignore", divide="ignore"):
+                stats[col] = sums / seen
+        return pd.DataFrame(stats)
+
+    def get_team_match_history(self, team_name, start_date=None, end_date=None):
+        tg = self.team_games
+        key = self._key("teamname", team_name)
+        rows = tg.rows("team_id", key, *date_range(start_date, end_date))[::-1]
+        df = pd.DataFrame(
+            {
+                "gameid": tg["gameid"][rows],
+                "date": _date_text(tg.ts[rows]),
+                "teamname": self._name("teamname", tg["team_id"][rows]),
+                "kills": tg["kills"][rows],
+                "deaths": tg["deaths"][rows],
+                "assists": tg["assists"][rows],
+                "totalgold": tg["totalgold"][rows],
+                "result": tg["result"][rows],
+            }
+        )
+        if df.empty:
+            return df
+
+        # O outro time de cada jogo; jogo sem adversário fica com None
+        owner, other = tg.members("gameid", tg["gameid"][rows])
+        other_team = tg["team_id"][other]
+        keep = (other_team >= 0) & (other_team != key)
+        owner, other = owner[keep], other[keep]
+        alone = np.setdiff1d(np.arange(len(rows)), owner)
+        owner = np.concatenate([owner, alone])
+        opponent = np.concatenate(
+            [self._name("teamname", tg["team_id"][other]), np.full(len(alone), None)]
+        )
+        order = np.argsort(owner, kind="stable")
+        df = df.iloc[owner[order]].reset_index(drop=True)
+        df["opponent"] = opponent[order]
+        return df
+
+    def get_team_most_picked_champions(
+        self, team_name=None, start_date=None, end_date=None
+    ):
+        pg, tg = self.player_games, self.team_games
+        key = self._key("teamname", team_name)
+        lo, hi = date_range(start_date, end_date)
+        total = len(tg.rows("team_id", key, lo, hi))
+        rows = pg.rows("team_id", key, lo, hi)
+        champions, games = np.unique(pg["champion_id"][rows], return_counts=True)
+        share = 100 * games // total if total else np.full(len(games), None)
+        df = pd.DataFrame(
+            {
+                "champion": self._name("champion", champions),
+                "num_ocurrences": share,
+            }
+        )
+        df = df.sort_values(
+            ["num_ocurrences", "champion"], ascending=[False, True], kind="stable"
+        )
+        return df.head(20).reset_index(drop=True)
+
+    def get_team_stats_in_period(self, team_name, start_date, end_date):
+        tg = self.team_games
+        key = self._key("teamname", team_name)
+        rows = tg.rows("team_id", key, *date_range(start_date, end_date))
+        return self._period_stats(
+            tg,
+            rows,
+            [
+                ("avg_kills", "kills"),
+                ("avg_deaths", "deaths"),
+                ("avg_assists", "assists"),
+                ("avg_gold", "totalgold"),
+            ],
+        )
+
+    def get_head2head_stats_teams(self, team1, team2, start_date, end_date):
+        tg = self.team_games
+        lo, hi = date_range(start_date, end_date)
+        rows = self._between(tg, "team_id", (team1, team2), lo, hi)
+        return self._h2h_stats(
+            tg,
+            rows,
+            "team_id",
+            "teamname",
+            [
+                ("avg_kills", "kills"),
+                ("avg_assists", "assists"),
+                ("avg_gold", "totalgold"),
+            ],
+        )
+
+    def get_head2head_match_history_teams(self, team1, team2, start_date, end_date):
+        tg = self.team_games
+        lo, hi = date_range(start_date, end_date)
+        rows = self._between(tg, "team_id", (team1, team2), lo, hi)[::-1]
+        return pd.DataFrame(
+            {
+                "gameid": tg["gameid"][rows],
+                "date": _date_text(tg.ts[rows]),
+                "teamname": self._name("teamname", tg["team_id"][rows]),
+                "kills": tg["kills"][rows],
+                "assists": tg["assists"][rows],
+                "totalgold": tg["totalgold"][rows],
+                "result": tg["result"][rows],
+            }
+        )
+
+    # Champions
+
+    def get_champion_stats(
+        self, champion_name=None, start_date=None, end_date=None, leagues=None
+    ):
+        pg = self.player_games
+        if champion_name is None:
+            return pd.DataFrame(
+                {"champion": self._name("champion", np.unique(pg["champion_id"]))}
+            )
+        key = self._key("champion", champion_name)
+        rows = pg.rows("champion_id", key, *date_range(start_date, end_date))
+        rows = self._in_leagues(pg, rows, leagues)
+        return pd.DataFrame(
+            {
+                "champion": self._name("champion", pg["champion_id"][rows]),
+                "kills": pg["kills"][rows],
+                "deaths": pg["deaths"][rows],
+                "assists": pg["assists"][rows],
+                "kda": pg["kda"][rows],
+                "result": pg["result"][rows],
+            }
+        )
+
+    def get_champion_match_history(
+        self, champion_name, start_date=None, end_date=None, leagues=None
+    ):
+        pg = self.player_games
+        key = self._key("champion", champion_name)
+        rows = pg.rows("champion_id", key, *date_range(start_date, end_date))
+        rows = self._in_leagues(pg, rows, leagues)
+
+        # As outras escolhas da mesma posição em cada jogo
+        owner, other = pg.members("gameid", pg["gameid"][rows])
+        keep = (pg["position_id"][other] == pg["position_id"][rows][owner]) & (
+            pg["champion_id"][other] != key
+        )
+        owner, other = owner[keep], other[keep]
+        order = np.argsort(-pg.ts[other], kind="stable")[:10]
+        mine, other = rows[owner[order]], other[order]
+        return pd.DataFrame(
+            {
+                "league": self._name("league", pg["league_id"][mine]),
+                "gameid": pg["gameid"][mine],
+                "teamname_champ": self._name("teamname", pg["team_id"][mine]),
+                "position": self._name("position", pg["position_id"][mine]),
+                "result": pg["result"][mine],
+                "champion_champ": self._name("champion", pg["champion_id"][mine]),
+                "date": _date_text(pg.ts[other]),
+                "teamname_opp": self._name("teamname", pg["team_id"][other]),
+                "champion_opp": self._name("champion", pg["champion_id"][other]),
+            }
+        )
+
+    def get_champion_stats_in_period(
+        self, champion, start_date, end_date, leagues=None
+    ):
+        pg = self.player_games
+        key = self._key("champion", champion)
+        rows = pg.rows("champion_id", key, *date_range(start_date, end_date))
+        return self._period_stats(
+            pg,
+            self._in_leagues(pg, rows, leagues),
+            [
+                ("avg_kills", "kills"),
+                ("avg_deaths", "deaths"),
+                ("avg_assists", "assists"),
+                ("avg_kda", "kda"),
+                ("avg_gold", "totalgold"),
+            ],
+        )
+
+    def get_head2head_stats_champions(
+        self, champ1, champ2, start_date, end_date, leagues=None
+    ):
+        pg = self.player_games
+        lo, hi = date_range(start_date, end_date)
+        rows = self._between(pg, "champion_id", (champ1, champ2), lo, hi, leagues)
+        # Sem GROUP BY: uma linha para os dois campeões juntos, com o
+        # primeiro nome (MIN(champion))
+        stats = {
+            "champion": [
+                min(self._name("champion", np.unique(pg["champion_id"][rows])))
+                if len(rows)
+                else None
+            ],
+            "games": [len(rows)],
+            "wins": [_value(_sum(pg["result"][rows]))],
+        }
+        for out, col in [
+            ("avg_kills", "kills"),
+            ("avg_deaths", "deaths"),
+            ("avg_assists", "assists"),
+            ("avg_kda", "kda"),
+            ("avg_gold", "totalgold"),
+        ]:
+            stats[out] = [_value(_round(_mean(pg[col][rows])))]
+        return pd.DataFrame(stats)
+
+    def get_head2head_match_history_champions(
+        self, champ1, champ2, start_date, end_date, leagues=None
+    ):
+        pg = self.player_games
+        lo, hi = date_range(start_date, end_date)
+        rows = self._between(pg, "champion_id", (champ1, champ2), lo, hi, leagues)
+        rows = rows[::-1]
+        return pd.DataFrame(
+            {
+                "gameid": pg["gameid"][rows],
+                "date": _date_text(pg.ts[rows]),
+                "champion": self._name("champion", pg["champion_id"][rows]),
+                "playername": self._name("playername", pg["player_id"][rows]),
+                "kills": pg["kills"][rows],
+                "deaths": pg["deaths"][rows],
+                "assists": pg["assists"][rows],
+                "kda": pg["kda"][rows],
+                "result": pg["result"][rows],
+            }
+        )
+
+    def _pairs(self, champions, start_date, end_date, leagues):
+        """Champions played with and against all of ``champions``.
+
+        Same frame as ``_champion_pairs`` of the SQLite backend: one row per
+        (other champion, same_team). Counts one pair per (picked champion,
+        other champion) in each game, like the self-join of those queries.
+        """
+        pg = self.player_games
+        lo, hi = date_range(start_date, end_date)
+        keys = {self._key("champion", champion) for champion in champions}
+        keys = [key for key in keys if key is not None]
+        rows = np.concatenate(
+            [pg.rows("champion_id", key, lo, hi) for key in keys] + [_NO_ROWS]
+        )
+        rows = self._in_leagues(pg, rows, leagues)
+        rows = rows[pg["team_id"][rows] >= 0]
+
+        # (jogo, time) em que todos os campeões pedidos jogaram juntos
+        n_teams = len(self.names["teamname"])
+        n_champions = len(self.names["champion"])
+        lineups = pg["gameid"][rows] * n_teams + pg["team_id"][rows]
+        picks = np.unique(lineups * n_champions + pg["champion_id"][rows])
+        lineup, count = np.unique(picks // n_champions, return_counts=True)
+        picked = rows[np.isin(lineups, lineup[count == len(champions)])]
+
+        owner, other = pg.members("gameid", pg["gameid"][picked])
+        other_team, other_champion = pg["team_id"][other], pg["champion_id"][other]
+        keep = (other_team >= 0) & (other_champion >= 0)
+        keep &= ~np.isin(other_champion, keys)
+        owner, other = owner[keep], other[keep]
+        same_team = pg["team_id"][picked][owner] == pg["team_id"][other]
+
+        groups, inverse = np.unique(
+            pg["champion_id"][other] * 2 + same_team, return_inverse=True
+        )
+        games = np.bincount(inverse, minlength=len(groups))
+        wins = _group_sums(inverse, len(groups), pg["result"][picked][owner])[0]
+        return pd.DataFrame(
+            {
+                "champion": self._name("champion", groups // 2),
+                "same_team": groups % 2,
+                "games": games,
+                "winrate": _round(100.0 * wins / np.maximum(games, 1)),
+            }
+        )
+
+    def get_best_allies(self, champion, start_date, end_date, leagues=None):
+        pairs = self._pairs(champion, start_date, end_date, leagues)
+        return top_pairs(pairs, True, False)
+
+    def get_best_against(self, champion, start_date, end_date, leagues=None):
+        pairs = self._pairs(champion, start_date, end_date, leagues)
+        return top_pairs(pairs, False, False)
+
+    def get_worst_against(self, champion, start_date, end_date, leagues=None):
+        pairs = self._pairs(champion, start_date, end_date, leagues)
+        return top_pairs(pairs, False, True)
+
+    def get_synergies_and_counters(
+        self, champions, start_date, end_date, leagues=None, distributions=False
+    ):
+        pairs = self._pairs(champions, start_date, end_date, leagues)
+        return synergies_and_counters(pairs, distributions)
+
+    def get_patch_champion_stats(self, patches, start_date, end_date, leagues=None):
+        pg = self.player_games
+        rows = pg.span(*date_range(start_date, end_date))
+        rows = rows[np.isin(pg["patch"][rows], [float(patch) for patch in patches])]
+        rows = self._in_leagues(pg, rows, leagues)
+        champions, inverse = np.unique(pg["champion_id"][rows], return_inverse=True)
+        games = np.bincount(inverse, minlength=len(champions))
+        wins = _group_sums(inverse, len(champions), pg["result"][rows])[0]
+        # Posição em que cada campeão mais jogou (empate: a de menor chave)
+        n_positions = len(self.names["position"])
+        positions = pg["position_id"][rows]
+        positions = np.where(positions < 0, n_positions - 1, positions)
+        pairs, pair_games = np.unique(
+            pg["champion_id"][rows] * n_positions + positions, return_counts=True
+        )
+        order = np.lexsort((pairs % n_positions, -pair_games, pairs // n_positions))
+        best = order[np.unique(pairs[order] // n_positions, return_index=True)[1]]
+        df = pd.DataFrame(
+            {
+                "champion": self._name("champion", champions),
+                "position": self._name("position", pairs[best] % n_positions),
+                "games": games,
+                "winrate": _round(100.0 * wins / np.maximum(games, 1)),
+            }
+        )
+        return df.iloc[_descending(games)].reset_index(drop=True)
+
+    # Listas para os filtros
+
+    def get_all_dates(self):
+        days = np.unique(self.team_games["day"]).astype("datetime64[D]")
+        return pd.Series(np.datetime_as_string(days).astype(object), name="date")
+
+    def get_all_columns(self):
+        return dict(self.columns)
+
+    def get_all_leagues(self):
+        keys = np.unique(self.team_games["league_id"])
+        return sorted(self._name("league", keys[keys >= 0]))
+
+    def get_all_patches(self):
+        patches = np.unique(self.team_games["patch"])
+        known = patches[~np.isnan(patches)].tolist()
+        return [np.nan, *known] if len(known) < len(patches) else known
+
+    def _names_in_league(self, table, col, name_col, league):
+        if league:
+            key = self._key("league", league)
+            values = table[col][table["league_id"] == (-2 if key is None else key)]
+        else:
+            values = table[col]
+        keys = np.unique(values)
+        return [name.strip() for name in sorted(self._name(name_col, keys[keys >= 0]))]
+
+    def get_all_players(self, league=None):
+        return self._names_in_league(
+            self.player_games, "player_id", "playername", league
+        )
+
+    def get_all_teams(self, league=None):
+        return self._names_in_league(self.team_games, "team_id", "teamname", league)
@@ -0,0 +1,48 @@
+import pandas as pd
+
+SECONDS_PER_DAY = 86_400
+
+# Limites usados quando a query não recebe uma das datas
+_MIN_TS, _MAX_TS = -(2**62), 2**62
+
+# ts volta para o texto que a coluna date tinha ("2024-05-01 14:00:00")
+DATE_SQL = "datetime(ts, 'unixepoch')"
+
+
+def to_epoch(dates):
+    """Epoch seconds of a Series of dates; naive dates are read as UTC."""
+    dates = pd.to_datetime(dates)
+    return ((dates - pd.Timestamp(0)) // pd.Timedelta(seconds=1)).astype("Int64")
+
+
+def add_timestamps(df):
+    """Replace the text ``date`` column by integer ``ts`` and ``day`` columns."""
+    ts = to_epoch(df["date"])
+    df = df.drop(columns="date")
+    df["ts"] = ts
+    df["day"] = ts // SECONDS_PER_DAY
+    return df
+
+
+def _day_start(value):
+    day = pd.Timestamp(value).normalize()
+    return (day - pd.Timestamp(0)) // pd.Timedelta(seconds=1)
+
+
+def date_range(start_date=None, end_date=None):
+    """``(lo, hi)`` bounds for ``ts >= lo AND ts < hi``.
+
+    Both dates are calendar days and both are included: ``hi`` is the
+    midnight after ``end_date``, so games played late on the end date are
+    kept. Accepts ``date``, ``datetime``, ``Timestamp`` or ISO strings;
+    None leaves that side open.
+    """
+    lo = _MIN_TS if start_date is None else _day_start(start_date)
+    hi = _MAX_TS if end_date is None else _day_start(end_date) + SECONDS_PER_DAY
+    return lo, hi
+
+
+def day_range(start_date=None, end_date=None):
+    """``(lo, hi)`` bounds for ``day >= lo AND day < hi``, like ``date_range``."""
+    lo, hi = date_range(start_date, end_date)
+    return lo // SECONDS_PER_DAY, hi // SECONDS_PER_DAY
@@ -0,0 +1,102 @@
+# Colunas de texto que se repetem em toda linha de matches/bans. No banco
+# ficam só as chaves inteiras; os nomes moram numa tabela de lookup.
+# coluna -> (tabela de lookup, coluna da chave)
+DIMENSIONS = {
+    "league": ("leagues", "league_id"),
+    "teamname": ("teams", "team_id"),
+    "playername": ("players", "player_id"),
+    "champion": ("champions", "champion_id"),
+    "position": ("positions", "position_id"),
+    "side": ("sides", "side_id"),
+}
+
+# Chaves fixas, para as queries filtrarem sem passar pela tabela de lookup
+FIXED_KEYS = {
+    "position": {"team": 0, "top": 1, "jng": 2, "mid": 3, "bot": 4, "sup": 5},
+    "side": {"Blue": 0, "Red": 1},
+}
+
+
+def key_column(col):
+    return DIMENSIONS[col][1] if col in DIMENSIONS else col
+
+
+def name_column(stored):
+    """Inverse of ``key_column``: league_id -> league."""
+    for col, (_, key) in DIMENSIONS.items():
+        if key == stored:
+            return col
+    return stored
+
+
+def encoded_schema(schema):
+    """Storage schema with each dimension column replaced by its INTEGER key."""
+    return {
+        key_column(col): "INTEGER" if col in DIMENSIONS else kind
+        for col, kind in schema.items()
+    }
+
+
+def create_dimension_tables(cursor):
+    for col, (table, key) in DIMENSIONS.items():
+        cursor.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                {key} INTEGER PRIMARY KEY,
+                {col} TEXT NOT NULL UNIQUE
+            )
+            """
+        )
+        cursor.executemany(
+            f"INSERT OR IGNORE INTO {table} ({key}, {col}) VALUES (?, ?)",
+            [(k, name) for name, k in FIXED_KEYS.get(col, {}).items()],
+        )
+
+
+def encode_frame(cursor, df):
+    """Replace the dimension columns of ``df`` by their keys.
+
+    Names not seen before get the next free key of their lookup table, so
+    keys are never reassigned. Missing names stay NULL.
+    """
+    df = df.copy()
+    for col, (table, key) in DIMENSIONS.items():
+        if col not in df.columns:
+            continue
+        keys = dict(cursor.execute(f"SELECT {col}, {key} FROM {table}"))
+        names = df[col].astype("string")
+        new_names = [n for n in names.dropna().unique() if n not in keys]
+        next_key = max(keys.values(), default=-1) + 1
+        new_keys = dict(zip(new_names, range(next_key, next_key + len(new_names))))
+        cursor.executemany(
+            f"INSERT INTO {table} ({key}, {col}) VALUES (?, ?)",
+            [(k, name) for name, k in new_keys.items()],
+        )
+        keys.update(new_keys)
+        df[col] = names.map(keys).astype("Int64")
+        df = df.rename(columns={col: key})
+    return df
+
+
+def key_of(col):
+    """Scalar subquery giving the key of the name bound to one ``?``."""
+    table, key = DIMENSIONS[col]
+    return f"(SELECT {key} FROM {table} WHERE {col} = ?)"
+
+
+def keys_in(col, count):
+    """Subquery giving the keys of the ``count`` names bound to its ``?``."""
+    table, key = DIMENSIONS[col]
+    placeholders = ",".join(["?"] * count)
+    return f"(SELECT {key} FROM {table} WHERE {col} IN ({placeholders}))"
+
+
+def pair_of(col):
+    """Filter of a head-to-head pair table (``a_id < b_id``) for two names.
+
+    Binds four ``?``: first name, second name, first name, second name.
+    """
+    return (
+        f"a_id = MIN({key_of(col)}, {key_of(col)}) "
+        f"AND b_id = MAX({key_of(col)}, {key_of(col)})"
+    )
@@ -0,0 +1,510 @@
+import os
+
+import duckdb
+import pandas as pd
+
+from .backends import QueryBackend
+from .champions_sinergys_counters import synergies_and_counters, top_pairs
+from .dates import SECONDS_PER_DAY, date_range
+from .dimensions import FIXED_KEYS, key_column
+from .parquet import SNAPSHOT_TABLES, parquet_dir
+from .schema_plan import ROW_TABLES
+
+
+def _date_sql(ts="ts"):
+    """Same text as datetime(ts, 'unixepoch') in SQLite, for the ``ts`` column
+    (qualified with its alias when the query has a join)."""
+    return f"strftime(epoch_ms({ts} * 1000), '%Y-%m-%d %H:%M:%S')"
+
+
+DATE_SQL = _date_sql()
+
+# Chave da posição no SQLite (position_id), para desempatar como ele
+_POSITION_KEY = (
+    "CASE position "
+    + " ".join(
+        f"WHEN '{name}' THEN {key}" for name, key in FIXED_KEYS["position"].items()
+    )
+    + " END"
+)
+
+
+def _placeholders(values):
+    return ",".join(["?"] * len(values))
+
+
+class DuckDBBackend(QueryBackend):
+    """The dashboard queries run by DuckDB over the Parquet snapshot.
+
+    Each table of the snapshot (``create_db.py --parquet``) is a view over
+    its Parquet files, and DuckDB reads only the columns a query needs. The
+    snapshot stores names, so no lookup tables are involved. Results have
+    the columns and dtypes of the SQLite backend.
+    """
+
+    name = "duckdb"
+
+    def __init__(self, snapshot_dir=None):
+        snapshot_dir = snapshot_dir or parquet_dir("lol_data.db")
+        if not os.path.isdir(snapshot_dir):
+            raise FileNotFoundError(
+                f"{snapshot_dir} not found; run create_db.py --parquet first"
+            )
+        self.conn = duckdb.connect()
+        for table in SNAPSHOT_TABLES:
+            files = os.path.join(snapshot_dir, table, "*", "*.parquet")
+            self.conn.execute(
+                f"""
+                CREATE VIEW {table} AS
+                SELECT * FROM read_parquet('{files}', hive_partitioning = true)
+                """
+            )
+
+    def _query(self, query, params=()):
+        # Um cursor por chamada: a conexão do duckdb não é thread-safe
+        cursor = self.conn.cursor()
+        try:
+            return cursor.execute(query, list(params)).df()
+        finally:
+            cursor.close()
+
+    # Players
+
+    def get_player_stats(self, player_name=None, start_date=None, end_date=None):
+        if not player_name:
+            return self._query("SELECT DISTINCT playername FROM player_games")
+        query = """
+            SELECT playername, AVG(kills) as kills, AVG(deaths) as deaths,
+                   AVG(assists) as assists, AVG(kda) as kda,
+                   AVG(totalgold) as totalgold
+            FROM player_games
+            WHERE playername = ? AND ts >= ? AND ts < ?
+            GROUP BY playername
+        """
+        return self._query(query, (player_name, *date_range(start_date, end_date)))
+
+    def get_player_match_history(self, player_name, start_date=None, end_date=None):
+        query = f"""
+            WITH mine AS (
+                SELECT gameid, ts, position, playername, champion, kills, deaths,
+                       assists, totalgold, result
+                FROM player_games
+                WHERE playername = ? AND ts >= ? AND ts < ?
+            )
+            SELECT m.gameid, {_date_sql("m.ts")} AS date, m.position,
+                   m.playername, m.champion, m.kills, m.deaths, m.assists,
+                   m.totalgold, m.result, o.playername AS opponent,
+                   o.champion AS opponent_champion
+            FROM mine m
+            JOIN player_games o
+              ON o.gameid = m.gameid AND o.position = m.position
+             AND o.playername != m.playername
+            ORDER BY m.ts DESC
+        """
+        return self._query(query, (player_name, *date_range(start_date, end_date)))
+
+    def get_most_picked_champions(self, player_name, start_date=None, end_date=None):
+        query = """
+            SELECT champion,
+                   COUNT(*) as num_games,
+                   ROUND(100 * SUM(result) / COUNT(*), 2) as winrate,
+                   ROUND(SUM(kills) / COUNT(*), 2) as avg_kills,
+                   ROUND(SUM(deaths) / COUNT(*), 2) as avg_deaths,
+                   ROUND(SUM(assists) / COUNT(*), 2) as avg_assists,
+                   ROUND((SUM(kills) + SUM(assists)) / SUM(deaths), 2) as kda
+            FROM player_games
+            WHERE playername = ? AND ts >= ? AND ts < ?
+            GROUP BY champion
+            ORDER BY num_games DESC
+        """
+        return self._query(query, (player_name, *date_range(start_date, end_date)))
+
+    def get_player_stats_in_period(self, player_name, start_date, end_date):
+        query = """
+            SELECT COUNT(*) as games,
+                   ROUND(100.0 * AVG(result), 2) as winrate,
+                   ROUND(AVG(kills), 2) as avg_kills,
+                   ROUND(AVG(deaths), 2) as avg_deaths,
+                   ROUND(AVG(assists), 2) as avg_assists,
+                   ROUND(AVG(kda), 2) as avg_kda,
+                   ROUND(AVG(totalgold), 2) as avg_gold
+            FROM player_games
+            WHERE playername = ? AND ts >= ? AND ts < ?
+        """
+        return self._query(query, (player_name, *date_range(start_date, end_date)))
+
+    def get_head2head_stats(self, player1, player2, start_date, end_date):
+        query = """
+            WITH games_between AS (
+                SELECT gameid
+                FROM player_games
+                WHERE ts >= ? AND ts < ? AND playername IN (?, ?)
+                GROUP BY gameid
+                HAVING COUNT(DISTINCT playername) = 2
+            )
+            SELECT playername,
+                   COUNT(*) as games,
+                   CAST(SUM(result) AS BIGINT) as wins,
+                   ROUND(AVG(kills), 2) as avg_kills,
+                   ROUND(AVG(deaths), 2) as avg_deaths,
+                   ROUND(AVG(assists), 2) as avg_assists,
+                   ROUND(AVG(kda), 2) as avg_kda,
+                   ROUND(AVG(totalgold), 2) as avg_gold
+            FROM player_games
+            WHERE playername IN (?, ?)
+              AND gameid IN (SELECT gameid FROM games_between)
+            GROUP BY playername
+        """
+        params = [*date_range(start_date, end_date), player1, player2]
+        return self._query(query, params + [player1, player2])
+
+    def get_head2head_match_history(self, player1, player2, start_date, end_date):
+        query = f"""
+            WITH games_between AS (
+                SELECT gameid
+                FROM player_games
+                WHERE ts >= ? AND ts < ? AND playername IN (?, ?)
+                GROUP BY gameid
+                HAVING COUNT(DISTINCT playername) = 2
+            )
+            SELECT gameid, {DATE_SQL} AS date, playername, champion,
+                   kills, deaths, assists, kda, result
+            FROM player_games
+            WHERE playername IN (?, ?)
+              AND gameid IN (SELECT gameid FROM games_between)
+            ORDER BY ts DESC
+        """
+        params = [*date_range(start_date, end_date), player1, player2]
+        return self._query(query, params + [player1, player2])
+
+    # Teams
+
+    def get_team_stats(self, team_name=None, start_date=None, end_date=None):
+        query = """
+            SELECT teamname, AVG(kills) as kills, AVG(deaths) as deaths,
+                   AVG(assists) as assists, AVG(totalgold) as totalgold,
+                   AVG(result) as result
+            FROM team_games
+        """
+        if not team_name:
+            return self._query(query + " GROUP BY teamname")
+        query += " WHERE teamname = ? AND ts >= ? AND ts < ? GROUP BY teamname"
+        return self._query(query, (team_name, *date_range(start_date, end_date)))
+
+    def get_team_match_history(self, team_name, start_date=None, end_date=None):
+        query = f"""
+            SELECT t.gameid, {_date_sql("t.ts")} AS date, t.teamname,
+                   t.kills, t.deaths, t.assists, t.totalgold, t.result,
+                   o.teamname AS opponent
+            FROM team_games t
+            LEFT JOIN team_games o
+              ON o.gameid = t.gameid AND o.teamname != t.teamname
+            WHERE t.teamname = ? AND t.ts >= ? AND t.ts < ?
+            ORDER BY t.ts DESC
+        """
+        return self._query(query, (team_name, *date_range(start_date, end_date)))
+
+    def get_team_most_picked_champions(
+        self, team_name=None, start_date=None, end_date=None
+    ):
+        query = """
+            WITH total_games AS (
+                SELECT COUNT(*) as total
+                FROM team_games
+                WHERE teamname = ? AND ts >= ? AND ts < ?
+            )
+            SELECT champion,
+                   100 * COUNT(*) // (SELECT total FROM total_games) as num_ocurrences
+            FROM player_games
+            WHERE teamname = ? AND ts >= ? AND ts < ?
+            GROUP BY champion
+            ORDER BY num_ocurrences DESC, champion
+            LIMIT 20
+        """
+        params = (team_name, *date_range(start_date, end_date))
+        return self._query(query, params * 2)
+
+    def get_team_stats_in_period(self, team_name, start_date, end_date):
+        query = """
+            SELECT COUNT(*) as games,
+                   ROUND(100.0 * AVG(result), 2) as winrate,
+                   ROUND(AVG(kills), 2) as avg_kills,
+                   ROUND(AVG(deaths), 2) as avg_deaths,
+                   ROUND(AVG(assists), 2) as avg_assists,
+                   ROUND(AVG(totalgold), 2) as avg_gold
+            FROM team_games
+            WHERE teamname = ? AND ts >= ? AND ts < ?
+        """
+        return self._query(query, (team_name, *date_range(start_date, end_date)))
+
+    def get_head2head_stats_teams(self, team1, team2, start_date, end_date):
+        query = """
+            WITH games_between AS (
+                SELECT gameid
+                FROM team_games
+                WHERE ts >= ? AND ts < ? AND teamname IN (?, ?)
+                GROUP BY gameid
+                HAVING COUNT(DISTINCT teamname) = 2
+            )
+            SELECT teamname,
+                   COUNT(*) as games,
+                   CAST(SUM(result) AS BIGINT) as wins,
+                   ROUND(AVG(kills), 2) as avg_kills,
+                   ROUND(AVG(assists), 2) as avg_assists,
+                   ROUND(AVG(totalgold), 2) as avg_gold
+            FROM team_games
+            WHERE teamname IN (?, ?)
+              AND gameid IN (SELECT gameid FROM games_between)
+            GROUP BY teamname
+        """
+        params = [*date_range(start_date, end_date), team1, team2]
+        return self._query(query, params + [team1, team2])
+
+    def get_head2head_match_history_teams(self, team1, team2, start_date, end_date):
+        query = f"""
+            WITH games_between AS (
+                SELECT gameid
+                FROM team_games
+                WHERE ts >= ? AND ts < ? AND teamname IN (?, ?)
+                GROUP BY gameid
+                HAVING COUNT(DISTINCT teamname) = 2
+            )
+            SELECT gameid, {DATE_SQL} AS date, teamname, kills, assists,
+                   totalgold, result
+            FROM team_games
+            WHERE teamname IN (?, ?)
+              AND gameid IN (SELECT gameid FROM games_between)
+            ORDER BY ts DESC
+        """
+        params = [*date_range(start_date, end_date), team1, team2]
+        return self._query(query, params + [team1, team2])
+
+    # Champions
+
+    def _league_filter(self, leagues, column="league"):
+        if not leagues:
+            return "", []
+        return f" AND {column} IN ({_placeholders(leagues)})", list(leagues)
+
+    def get_champion_stats(
+        self, champion_name=None, start_date=None, end_date=None, leagues=None
+    ):
+        if champion_name is None:
+            return self._query("SELECT DISTINCT champion FROM player_games")
+        league_filter, league_params = self._league_filter(leagues)
+        query = f"""
+            SELECT champion, kills, deaths, assists, kda, result
+            FROM player_games
+            WHERE champion = ? AND ts >= ? AND ts < ? {league_filter}
+        """
+        params = [champion_name, *date_range(start_date, end_date)]
+        return self._query(query, params + league_params)
+
+    def get_champion_match_history(
+        self, champion_name, start_date=None, end_date=None, leagues=None
+    ):
+        league_filter, league_params = self._league_filter(leagues, "c.league")
+        query = f"""
+            SELECT c.league, c.gameid, c.teamname AS teamname_champ, c.position,
+                   c.result, c.champion AS champion_champ,
+                   {_date_sql("o.ts")} AS date,
+                   o.teamname AS teamname_opp, o.champion AS champion_opp
+            FROM player_games c
+            JOIN player_games o
+              ON o.gameid = c.gameid AND o.position = c.position
+             AND o.champion != c.champion
+            WHERE c.champion = ? AND c.ts >= ? AND c.ts < ? {league_filter}
+            ORDER BY o.ts DESC
+            LIMIT 10
+        """
+        params = [champion_name, *date_range(start_date, end_date)]
+        return self._query(query, params + league_params)
+
+    def get_champion_stats_in_period(
+        self, champion, start_date, end_date, leagues=None
+    ):
+        league_filter, league_params = self._league_filter(leagues)
+        query = f"""
+            SELECT COUNT(*) as games,
+                   ROUND(100.0 * AVG(result), 2) as winrate,
+                   ROUND(AVG(kills), 2) as avg_kills,
+                   ROUND(AVG(deaths), 2) as avg_deaths,
+                   ROUND(AVG(assists), 2) as avg_assists,
+                   ROUND(AVG(kda), 2) as avg_kda,
+                   ROUND(AVG(totalgold), 2) as avg_gold
+            FROM player_games
+            WHERE champion = ? AND ts >= ? AND ts < ? {league_filter}
+        """
+        params = [champion, *date_range(start_date, end_date)]
+        return self._query(query, params + league_params)
+
+    def get_head2head_stats_champions(
+        self, champ1, champ2, start_date, end_date, leagues=None
+    ):
+        league_filter, league_params = self._league_filter(leagues)
+        query = f"""
+            WITH games_between AS (
+                SELECT gameid
+                FROM player_games
+                WHERE ts >= ? AND ts < ? AND champion IN (?, ?) {league_filter}
+                GROUP BY gameid
+                HAVING COUNT(DISTINCT champion) = 2
+            )
+            SELECT MIN(champion) as champion,
+                   COUNT(*) as games,
+                   CAST(SUM(result) AS BIGINT) as wins,
+                   ROUND(AVG(kills), 2) as avg_kills,
+                   ROUND(AVG(deaths), 2) as avg_deaths,
+                   ROUND(AVG(assists), 2) as avg_assists,
+                   ROUND(AVG(kda), 2) as avg_kda,
+                   ROUND(AVG(totalgold), 2) as avg_gold
+            FROM player_games
+            WHERE champion IN (?, ?)
+              AND gameid IN (SELECT gameid FROM games_between)
+        """
+        params = [*date_range(start_date, end_date), champ1, champ2]
+        return self._query(query, params + league_params + [champ1, champ2])
+
+    def get_head2head_match_history_champions(
+        self, champ1, champ2, start_date, end_date, leagues=None
+    ):
+        league_filter, league_params = self._league_filter(leagues)
+        query = f"""
+            WITH games_between AS (
+                SELECT gameid
+                FROM player_games
+                WHERE ts >= ? AND ts < ? AND champion IN (?, ?) {league_filter}
+                GROUP BY gameid
+                HAVING COUNT(DISTINCT champion) = 2
+            )
+            SELECT gameid, {DATE_SQL} AS date, champion, playername,
+                   kills, deaths, assists, kda, result
+            FROM player_games
+            WHERE champion IN (?, ?)
+              AND gameid IN (SELECT gameid FROM games_between)
+            ORDER BY ts DESC
+        """
+        params = [*date_range(start_date, end_date), champ1, champ2]
+        return self._query(query, params + league_params + [champ1, champ2])
+
+    def _pairs(self, champions, start_date, end_date, leagues):
+        league_filter, league_params = self._league_filter(leagues)
+        champs = _placeholders(champions)
+        query = f"""
+            WITH relevant_games AS (
+                SELECT gameid, teamname
+                FROM player_games
+                WHERE champion IN ({champs}) AND ts >= ? AND ts < ? {league_filter}
+                GROUP BY gameid, teamname
+                HAVING COUNT(DISTINCT champion) = {len(champions)}
+            )
+            SELECT m2.champion,
+                   CAST(m1.teamname = m2.teamname AS INTEGER) AS same_team,
+                   COUNT(*) AS games,
+                   ROUND(100.0 * SUM(m1.result) / COUNT(*), 2) AS winrate
+            FROM player_games m1
+            JOIN relevant_games rg
+              ON m1.gameid = rg.gameid AND m1.teamname = rg.teamname
+            JOIN player_games m2 ON m1.gameid = m2.gameid
+            WHERE m1.champion IN ({champs})
+              AND m2.champion NOT IN ({champs})
+              AND m2.teamname IS NOT NULL
+            GROUP BY m2.champion, same_team
+        """
+        champions = list(champions)
+        params = champions + [*date_range(start_date, end_date)] + league_params
+        return self._query(query, params + champions + champions)
+
+    def get_best_allies(self, champion, start_date, end_date, leagues=None):
+        pairs = self._pairs(champion, start_date, end_date, leagues)
+        return top_pairs(pairs, True, False)
+
+    def get_best_against(self, champion, start_date, end_date, leagues=None):
+        pairs = self._pairs(champion, start_date, end_date, leagues)
+        return top_pairs(pairs, False, False)
+
+    def get_worst_against(self, champion, start_date, end_date, leagues=None):
+        pairs = self._pairs(champion, start_date, end_date, leagues)
+        return top_pairs(pairs, False, True)
+
+    def get_synergies_and_counters(
+        self, champions, start_date, end_date, leagues=None, distributions=False
+    ):
+        pairs = self._pairs(champions, start_date, end_date, leagues)
+        return synergies_and_counters(pairs, distributions)
+
+    def get_patch_champion_stats(self, patch, start_date, end_date, leagues=None):
+        league_filter, league_params = self._league_filter(leagues)
+        # Como no SQLite: cada campeão sai com a posição em que mais jogou e,
+        # no empate, com a de menor position_id
+        query = f"""
+            WITH by_position AS (
+                SELECT champion, position,
+                       COUNT(*) AS games, SUM(result) AS wins
+                FROM player_games
+                WHERE patch IN ({_placeholders(patch)}) AND ts >= ? AND ts < ?
+                  {league_filter}
+                GROUP BY champion, position
+            )
+            SELECT champion,
+                   FIRST(
+                       position
+                       ORDER BY games DESC, {_POSITION_KEY} NULLS FIRST
+                   ) as position,
+                   CAST(SUM(games) AS BIGINT) as games,
+                   ROUND(100.0 * SUM(wins) / SUM(games), 2) as winrate
+            FROM by_position
+            GROUP BY champion
+            ORDER BY games DESC
+        """
+        params = [*patch, *date_range(start_date, end_date)]
+        return self._query(query, params + league_params)
+
+    # Listas para os filtros
+
+    def get_all_dates(self):
+        query = f"""
+            SELECT strftime(epoch_ms(day * {SECONDS_PER_DAY * 1000}), '%Y-%m-%d')
+                   AS date
+            FROM (SELECT DISTINCT day FROM team_games)
+            ORDER BY date
+        """
+        return self._query(query)["date"]
+
+    def get_all_columns(self):
+        # Os nomes e tipos do SQLite: a coluna da chave (league_id) no lugar
+        # do nome, e o dtype de um SELECT ... LIMIT 0 do pandas (object)
+        columns = {}
+        for table in ROW_TABLES:
+            df = self._query(f"SELECT * EXCLUDE (month) FROM {table} LIMIT 0")
+            empty = pd.DataFrame(columns=df.columns)
+            columns.update(
+                {key_column(col): str(empty[col].dtype) for col in empty.columns}
+            )
+        return columns
+
+    def get_all_leagues(self):
+        query = "SELECT DISTINCT league FROM team_games ORDER BY league"
+        return self._query(query)["league"].tolist()
+
+    def get_all_patches(self):
+        query = "SELECT DISTINCT patch FROM team_games ORDER BY patch"
+        return self._query(query)["patch"].tolist()
+
+    def get_all_players(self, league=None):
+        query = "SELECT DISTINCT playername FROM player_games"
+        params = []
+        if league:
+            query += " WHERE league = ?"
+            params.append(league)
+        df = self._query(query + " ORDER BY playername", params)
+        return df["playername"].dropna().str.strip().tolist()
+
+    def get_all_teams(self, league=None):
+        query = "SELECT DISTINCT teamname FROM team_games"
+        params = []
+        if league:
+            query += " WHERE league = ?"
+            params.append(league)
+        df = self._query(query + " ORDER BY teamname", params)
+        return df["teamname"].dropna().str.strip().tolist()
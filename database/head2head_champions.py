@@ -1,27 +1,27 @@
 from .base import get_conn
+from .dimensions import key_of, keys_in, pair_of
+from .dates import date_range, day_range
 import pandas as pd
 
 
 def get_champion_stats_in_period(champion_name, start_date, end_date, leagues=None):
     conn = get_conn()
-    query = """
-        SELECT COUNT(*) as games,
-               ROUND(100.0 * AVG(result), 2) as winrate,
-               ROUND(AVG(kills), 2) as avg_kills,
-               ROUND(AVG(deaths), 2) as avg_deaths,
-               ROUND(AVG(assists), 2) as avg_assists,
-               ROUND(AVG(kda), 2) as avg_kda,
-               ROUND(AVG(totalgold), 2) as avg_gold
-        FROM matches
-        WHERE champion = ?
-          AND date BETWEEN ? AND ?
-          AND position != 'team'
+    query = f"""
+        SELECT COALESCE(SUM(games), 0) as games,
+               ROUND(100.0 * SUM(wins) / SUM(result_count), 2) as winrate,
+               ROUND(1.0 * SUM(kills) / SUM(kills_count), 2) as avg_kills,
+               ROUND(1.0 * SUM(deaths) / SUM(deaths_count), 2) as avg_deaths,
+               ROUND(1.0 * SUM(assists) / SUM(assists_count), 2) as avg_assists,
+               ROUND(SUM(kda) / SUM(kda_count), 2) as avg_kda,
+               ROUND(SUM(totalgold) / SUM(totalgold_count), 2) as avg_gold
+        FROM champion_daily
+        WHERE champion_id = {key_of("champion")}
+          AND day >= ? AND day < ?
     """
-    params = [champion_name, start_date, end_date]
+    params = [champion_name, *day_range(start_date, end_date)]
 
     if leagues:
-        placeholders = ",".join(["?"] * len(leagues))
-        query += f" AND league IN ({placeholders})"
+        query += f" AND league_id IN {keys_in('league', len(leagues))}"
         params += leagues
 
     return pd.read_sql_query(query, conn, params=params)
@@ -33,22 +33,17 @@ def get_head2head_stats_champions(champ1, champ2, start_date, end_date, leagues=
     league_params = []
 
     if leagues:
-        placeholders = ",".join(["?"] * len(leagues))
-        league_filter = f" AND league IN ({placeholders})"
+        league_filter = f" AND league_id IN {keys_in('league', len(leagues))}"
         league_params = leagues
 
     query = f"""
         WITH games_between AS (
             SELECT gameid
-            FROM matches
-            WHERE date BETWEEN ? AND ?
-              AND champion IN (?, ?)
-              AND position != 'team'
+            FROM champion_h2h
+            WHERE {pair_of("champion")} AND ts >= ? AND ts < ?
               {league_filter}
-            GROUP BY gameid
-            HAVING COUNT(DISTINCT champion) = 2
         )
-        SELECT champion,
+        SELECT MIN(champion) as champion,
                COUNT(*) as games,
                SUM(result) as wins,
                ROUND(AVG(kills), 2) as avg_kills,
@@ -56,12 +51,16 @@ def get_head2head_stats_champions(champ1, champ2, start_date, end_date, leagues=
                ROUND(AVG(assists), 2) as avg_assists,
                ROUND(AVG(kda), 2) as avg_kda,
                ROUND(AVG(totalgold), 2) as avg_gold
-        FROM matches
-        WHERE champion IN (?, ?)
-          AND position != 'team'
+        FROM player_games
+        LEFT JOIN champions USING (champion_id)
+        WHERE champion_id IN {keys_in("champion", 2)}
           AND gameid IN (SELECT gameid FROM games_between)
     """
-    params = [start_date, end_date, champ1, champ2] + league_params + [champ1, champ2]
+    params = (
+        [champ1, champ2, champ1, champ2, *date_range(start_date, end_date)]
+        + league_params
+        + [champ1, champ2]
+    )
     return pd.read_sql_query(query, conn, params=params)
 
 
@@ -73,28 +72,28 @@ def get_head2head_match_history_champions(
     league_params = []
 
     if leagues:
-        placeholders = ",".join(["?"] * len(leagues))
-        league_filter = f" AND league IN ({placeholders})"
+        league_filter = f" AND league_id IN {keys_in('league', len(leagues))}"
         league_params = leagues
 
     query = f"""
         WITH games_between AS (
-            SELECT gameid, MAX(date) as date
-            FROM matches
-            WHERE date BETWEEN ? AND ?
-              AND champion IN (?, ?)
-              AND position != 'team'
+            SELECT gameid, ts
+            FROM champion_h2h
+            WHERE {pair_of("champion")} AND ts >= ? AND ts < ?
               {league_filter}
-            GROUP BY gameid
-            HAVING COUNT(DISTINCT champion) = 2
         )
-        SELECT m.gameid, g.date, m.champion, m.playername,
+        SELECT m.gameid, datetime(g.ts, 'unixepoch') AS date, c.champion, p.playername,
                m.kills, m.deaths, m.assists, m.kda, m.result
-        FROM matches m
-        JOIN games_between g ON m.gameid = g.gameid
-        WHERE m.champion IN (?, ?)
-          AND m.position != 'team'
-        ORDER BY g.date DESC
+        FROM games_between g
+        JOIN player_games m ON m.gameid = g.gameid
+        LEFT JOIN champions c ON c.champion_id = m.champion_id
+        LEFT JOIN players p ON p.player_id = m.player_id
+        WHERE m.champion_id IN {keys_in("champion", 2)}
+        ORDER BY g.ts DESC
     """
-    params = [start_date, end_date, champ1, champ2] + league_params + [champ1, champ2]
+    params = (
+        [champ1, champ2, champ1, champ2, *date_range(start_date, end_date)]
+        + league_params
+        + [champ1, champ2]
+    )
     return pd.read_sql_query(query, conn, params=params)
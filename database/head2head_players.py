@@ -1,10 +1,12 @@
 from .base import get_conn
+from .dimensions import key_of, keys_in, pair_of
+from .dates import date_range
 import pandas as pd
 
 
 def get_player_stats_in_period(player_name, start_date, end_date):
     conn = get_conn()
-    query = """
+    query = f"""
         SELECT COUNT(*) as games,
                ROUND(100.0 * AVG(result), 2) as winrate,
                ROUND(AVG(kills), 2) as avg_kills,
@@ -12,28 +14,26 @@ def get_player_stats_in_period(player_name, start_date, end_date):
                ROUND(AVG(assists), 2) as avg_assists,
                ROUND(AVG(kda), 2) as avg_kda,
                ROUND(AVG(totalgold), 2) as avg_gold
-        FROM matches
-        WHERE playername = ?
-          AND date BETWEEN ? AND ?
-          AND position != 'team'
+        FROM player_games
+        WHERE player_id = {key_of("playername")}
+          AND ts >= ? AND ts < ?
     """
-    return pd.read_sql_query(query, conn, params=(player_name, start_date, end_date))
+    return pd.read_sql_query(
+        query, conn, params=(player_name, *date_range(start_date, end_date))
+    )
 
 
 def get_head2head_stats(player1, player2, start_date, end_date):
     conn = get_conn()
 
-    query = """
+    query = f"""
         WITH games_between AS (
-            SELECT gameid, MAX(date) AS date
-            FROM matches
-            WHERE date BETWEEN ? AND ?
-              AND playername IN (?, ?)
-            GROUP BY gameid
-            HAVING COUNT(DISTINCT playername) = 2
+            SELECT gameid, ts
+            FROM player_h2h
+            WHERE {pair_of("playername")} AND ts >= ? AND ts < ?
         )
         SELECT
-            m.playername,
+            p.playername,
             COUNT(*) as games,
             SUM(m.result) as wins,
             ROUND(AVG(m.kills), 2) as avg_kills,
@@ -41,35 +41,35 @@ def get_head2head_stats(player1, player2, start_date, end_date):
             ROUND(AVG(m.assists), 2) as avg_assists,
             ROUND(AVG(m.kda), 2) as avg_kda,
             ROUND(AVG(m.totalgold), 2) as avg_gold
-        FROM matches m
-        JOIN games_between gb ON m.gameid = gb.gameid
-        WHERE m.playername IN (?, ?)
-          AND m.position != 'team'
-        GROUP BY m.playername
+        FROM games_between gb
+        JOIN player_games m ON m.gameid = gb.gameid
+        LEFT JOIN players p ON p.player_id = m.player_id
+        WHERE m.player_id IN {keys_in("playername", 2)}
+        GROUP BY m.player_id
     """
 
-    params = [start_date, end_date, player1, player2, player1, player2]
+    params = [player1, player2, player1, player2, *date_range(start_date, end_date)]
+    params += [player1, player2]
     return pd.read_sql_query(query, conn, params=params)
 
 
 def get_head2head_match_history(player1, player2, start_date, end_date):
     conn = get_conn()
-    query = """
+    query = f"""
         WITH both_players_games AS (
-            SELECT gameid, MAX(date) AS date
-            FROM matches
-            WHERE date BETWEEN ? AND ?
-              AND playername IN (?, ?)
-              AND position != 'team'
-            GROUP BY gameid
-            HAVING COUNT(DISTINCT playername) = 2
+            SELECT gameid, ts
+            FROM player_h2h
+            WHERE {pair_of("playername")} AND ts >= ? AND ts < ?
         )
-        SELECT m.gameid, m.date, m.playername, m.champion,
+        SELECT m.gameid, datetime(m.ts, 'unixepoch') AS date, p.playername, c.champion,
                m.kills, m.deaths, m.assists, m.kda, m.result
-        FROM matches m
-        JOIN both_players_games g ON m.gameid = g.gameid
-        WHERE m.playername IN (?, ?)
-        ORDER BY m.date DESC
+        FROM both_players_games g
+        JOIN player_games m ON m.gameid = g.gameid
+        LEFT JOIN players p ON p.player_id = m.player_id
+        LEFT JOIN champions c ON c.champion_id = m.champion_id
+        WHERE m.player_id IN {keys_in("playername", 2)}
+        ORDER BY m.ts DESC
     """
-    params = [start_date, end_date, player1, player2, player1, player2]
+    params = [player1, player2, player1, player2, *date_range(start_date, end_date)]
+    params += [player1, player2]
     return pd.read_sql_query(query, conn, params=params)
@@ -1,72 +1,69 @@
 from .base import get_conn
+from .dimensions import key_of, keys_in, pair_of
+from .dates import date_range
 import pandas as pd
 
 
 def get_team_stats_in_period(team_name, start_date, end_date):
     conn = get_conn()
-    query = """
+    query = f"""
         SELECT COUNT(*) as games,
                ROUND(100.0 * AVG(result), 2) as winrate,
                ROUND(AVG(kills), 2) as avg_kills,
                ROUND(AVG(deaths), 2) as avg_deaths,
                ROUND(AVG(assists), 2) as avg_assists,
                ROUND(AVG(totalgold), 2) as avg_gold
-        FROM matches
-        WHERE teamname = ?
-          AND date BETWEEN ? AND ?
-          AND position = 'team'
+        FROM team_games
+        WHERE team_id = {key_of("teamname")}
+          AND ts >= ? AND ts < ?
     """
-    return pd.read_sql_query(query, conn, params=(team_name, start_date, end_date))
+    return pd.read_sql_query(
+        query, conn, params=(team_name, *date_range(start_date, end_date))
+    )
+
+
+def _games_between(team1, team2, start_date, end_date):
+    """CTE body and params of the games between the two teams."""
+    query = f"""
+        SELECT gameid, ts
+        FROM team_h2h
+        WHERE {pair_of("teamname")} AND ts >= ? AND ts < ?
+    """
+    return query, [team1, team2, team1, team2, *date_range(start_date, end_date)]
 
 
 def get_head2head_stats_teams(team1, team2, start_date, end_date):
     conn = get_conn()
 
-    query = """
-        WITH games_between AS (
-            SELECT gameid
-            FROM matches
-            WHERE date BETWEEN ? AND ?
-              AND teamname IN (?, ?)
-              AND position = 'team'
-            GROUP BY gameid
-            HAVING COUNT(DISTINCT teamname) = 2
-        )
+    games_between, params = _games_between(team1, team2, start_date, end_date)
+    query = f"""
+        WITH games_between AS ({games_between})
         SELECT teamname,
                COUNT(*) as games,
                SUM(result) as wins,
                ROUND(AVG(kills), 2) as avg_kills,
                ROUND(AVG(assists), 2) as avg_assists,
                ROUND(AVG(totalgold), 2) as avg_gold
-        FROM matches
-        WHERE position = 'team'
-          AND teamname IN (?, ?)
-          AND gameid IN (SELECT gameid FROM games_between)
-        GROUP BY teamname
+        FROM games_between g
+        JOIN team_games m ON m.gameid = g.gameid
+        LEFT JOIN teams t ON t.team_id = m.team_id
+        WHERE m.team_id IN {keys_in("teamname", 2)}
+        GROUP BY m.team_id
     """
-    params = [start_date, end_date, team1, team2, team1, team2]
-    return pd.read_sql_query(query, conn, params=params)
+    return pd.read_sql_query(query, conn, params=params + [team1, team2])
 
 
 def get_head2head_match_history_teams(team1, team2, start_date, end_date):
     conn = get_conn()
 
-    query = """
-        WITH games_between AS (
-            SELECT gameid, MAX(date) as date
-            FROM matches
-            WHERE date BETWEEN ? AND ?
-              AND teamname IN (?, ?)
-              AND position = 'team'
-            GROUP BY gameid
-            HAVING COUNT(DISTINCT teamname) = 2
-        )
-        SELECT m.gameid, g.date, m.teamname, m.kills, m.assists, m.totalgold, m.result
-        FROM matches m
-        JOIN games_between g ON m.gameid = g.gameid
-        WHERE m.teamname IN (?, ?)
-          AND m.position = 'team'
-        ORDER BY g.date DESC
+    games_between, params = _games_between(team1, team2, start_date, end_date)
+    query = f"""
+        WITH games_between AS ({games_between})
+        SELECT m.gameid, datetime(g.ts, 'unixepoch') AS date, t.teamname, m.kills, m.assists, m.totalgold, m.result
+        FROM games_between g
+        JOIN team_games m ON m.gameid = g.gameid
+        LEFT JOIN teams t ON t.team_id = m.team_id
+        WHERE m.team_id IN {keys_in("teamname", 2)}
+        ORDER BY g.ts DESC
     """
-    params = [start_date, end_date, team1, team2, team1, team2]
-    return pd.read_sql_query(query, conn, params=params)
+    return pd.read_sql_query(query, conn, params=params + [team1, team2])
@@ -0,0 +1,218 @@
+import hashlib
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+from .dates import add_timestamps
+from .schema_plan import CATEGORY_COLUMNS, scan_columns
+
+# Colunas do CSV do Oracle's Elixir que nunca vão para o banco
+DROPPED_COLUMNS = [
+    "datacompleteness",
+    "url",
+    "pick1",
+    "pick2",
+    "pick3",
+    "pick4",
+    "pick5",
+    "playerid",
+    "ban1",
+    "ban2",
+    "ban3",
+    "ban4",
+    "ban5",
+    "teamid",
+]
+
+
+def list_csv_files(data_dir):
+    return sorted(
+        os.path.join(data_dir, f) for f in os.listdir(data_dir) if f.endswith(".csv")
+    )
+
+
+def file_fingerprint(path, block_size=1 << 20):
+    """Return (size, sha256) of a source file without loading it whole."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return os.path.getsize(path), digest.hexdigest()
+
+
+def _parse_lines(header, lines):
+    return pd.read_csv(io.StringIO(header + "".join(lines)))
+
+
+def iter_game_chunks(path, chunksize=None):
+    """Yield ``(DataFrame, {gameid: hash})`` pieces of a source CSV.
+
+    A piece holds at least ``chunksize`` rows (the whole file when ``None``)
+    and the rows of a game are never split between two pieces, since the
+    Oracle's Elixir files keep each game's rows together. The hash of a game
+    is taken over its raw CSV lines, so it does not depend on how pandas
+    infers the dtypes of a given piece.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        header = f.readline()
+        gameid_pos = header.rstrip("\r\n").split(",").index("gameid")
+        lines, digests = [], {}
+        current = digest = None
+        for line in f:
+            gameid = line.split(",", gameid_pos + 1)[gameid_pos].strip('"')
+            if gameid != current:
+                if chunksize and len(lines) >= chunksize:
+                    yield _parse_lines(header, lines), _hexdigests(digests)
+                    lines, digests = [], {}
+                current = gameid
+                digest = digests.setdefault(gameid, hashlib.blake2b(digest_size=8))
+            digest.update(line.encode())
+            lines.append(line)
+        if lines:
+            yield _parse_lines(header, lines), _hexdigests(digests)
+
+
+def _hexdigests(digests):
+    return {gameid: digest.hexdigest() for gameid, digest in digests.items()}
+
+
+def is_snapshot_column(col):
+    """Columns with the @10/@15/@20/@25 minute snapshots are not used."""
+    return col.endswith(("25", "20", "15", "10"))
+
+
+def add_kda(df):
+    df["kda"] = (df["kills"] + df["assists"]) / df["deaths"].replace(0, 1)
+    return df
+
+
+def extract_bans(df):
+    ban_df = df.groupby("gameid").last().reset_index()
+    ban_df = ban_df[
+        [
+            "gameid",
+            "date",
+            "league",
+            "teamname",
+            "ban1",
+            "ban2",
+            "ban3",
+            "ban4",
+            "ban5",
+        ]
+    ].melt(
+        id_vars=["date", "gameid", "league", "teamname"],
+        var_name="ban_position",
+        value_name="champion",
+    )
+    return add_timestamps(ban_df.dropna())
+
+
+def clean_matches(df):
+    """Row filter, column drops and derived columns shared by every build."""
+    df = df.query("datacompleteness=='complete'").drop(
+        columns=[col for col in DROPPED_COLUMNS if col in df.columns]
+    )
+    df = df.drop(columns=[col for col in df.columns if is_snapshot_column(col)])
+    return add_kda(add_timestamps(df))
+
+
+def split_rows(df):
+    """Row table -> rows of ``df`` that belong to it."""
+    team = (df["position"] == "team").to_numpy()
+    return {"player_games": df[~team], "team_games": df[team]}
+
+
+def source_columns(path):
+    """Columns a source CSV will have after ``clean_matches``, from its header."""
+    with open(path, encoding="utf-8", newline="") as f:
+        header = pd.read_csv(f, nrows=0).columns
+    columns = [
+        col
+        for col in header
+        if col not in DROPPED_COLUMNS and not is_snapshot_column(col)
+    ]
+    columns.remove("date")
+    return columns + ["ts", "day", "kda"]
+
+
+def prepare_file(path, chunksize=None, scan=True):
+    """Parse and pre-clean one source CSV.
+
+    Returns ``(frames, bans, hashes, scans)``, where ``frames`` maps each row
+    table to its rows and ``scans`` maps it to its column scans (empty when
+    ``scan`` is False). Module level so it can run in a worker process of
+    the parallel build.
+    """
+    dfs, ban_dfs, hashes = [], [], {}
+    for raw, chunk_hashes in iter_game_chunks(path, chunksize):
+        dfs.append(clean_matches(raw))
+        ban_dfs.append(extract_bans(raw))
+        hashes.update(chunk_hashes)
+    df = pd.concat(dfs, ignore_index=True)
+    for col in CATEGORY_COLUMNS:
+        df[col] = df[col].astype("category")
+    frames = split_rows(df)
+    scans = {t: [scan_columns(f)] for t, f in frames.items()} if scan else {}
+    return frames, pd.concat(ban_dfs, ignore_index=True), hashes, scans
+
+
+def scan_file(path, chunksize=None, columns=None):
+    """Column scans of each row table of one source CSV, read piece by piece."""
+    scans = {}
+    for raw, _ in iter_game_chunks(path, chunksize):
+        for table, df in split_rows(clean_matches(raw)).items():
+            scans.setdefault(table, []).append(
+                scan_columns(
+                    df, [c for c in df.columns if c in columns] if columns else None
+                )
+            )
+    return scans
+
+
+def coerce_frame(df, schema):
+    """Cast a cleaned frame to the columns and storage types of ``schema``."""
+    df = df.reindex(columns=list(schema))
+    for col, kind in schema.items():
+        if kind == "INTEGER" and not pd.api.types.is_integer_dtype(df[col].dtype):
+            numeric = pd.to_numeric(df[col], errors="coerce")
+            values = numeric.to_numpy(dtype="float64", na_value=np.nan)
+            values = values[~np.isnan(values)]
+            if (np.floor(values) == values).all():
+                df[col] = numeric.astype("Int64")  # Int64 aceita valores nulos também
+            else:
+                df[col] = numeric
+        elif kind == "REAL":
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float32")
+    return df
+
+
+def create_table(cursor, table, schema, references=None):
+    references = references or {}
+    columns = ", ".join(
+        f'"{col}" {kind}'
+        + (f" REFERENCES {references[col]}" if col in references else "")
+        for col, kind in schema.items()
+    )
+    cursor.execute(f'DROP TABLE IF EXISTS "{table}"')
+    cursor.execute(f'CREATE TABLE "{table}" ({columns})')
+
+
+def insert_frame(cursor, table, df, batch_size=50_000):
+    """executemany INSERT that stays inside the caller's transaction.
+
+    ``DataFrame.to_sql`` commits on its own, which would break the single
+    transaction of an incremental load. Rows are converted in batches so the
+    object copy never covers the whole frame.
+    """
+    if df.empty:
+        return
+    columns = ", ".join(f'"{col}"' for col in df.columns)
+    placeholders = ", ".join(["?"] * len(df.columns))
+    query = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+    for start in range(0, len(df), batch_size):
+        batch = df.iloc[start : start + batch_size].astype(object)
+        batch = batch.where(batch.notna(), None)
+        cursor.executemany(query, batch.itertuples(index=False, name=None))
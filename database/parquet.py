@@ -0,0 +1,113 @@
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .dates import date_range
+from .dimensions import DIMENSIONS, name_column
+from .schema_plan import ROW_TABLES
+
+SNAPSHOT_TABLES = (*ROW_TABLES, "bans")
+
+# Tipo no Parquet de cada tipo do SQLite; texto vira dicionário
+_ARROW_TYPES = {
+    "INTEGER": pa.int64(),
+    "REAL": pa.float64(),
+    "TEXT": pa.dictionary(pa.int32(), pa.string()),
+}
+
+
+def parquet_dir(db_name):
+    """The snapshot lives next to the database: lol_data.db -> lol_data.parquet/"""
+    return os.path.splitext(db_name)[0] + ".parquet"
+
+
+def _columns(conn, table):
+    """Snapshot column -> (SQL expression, SQLite type) of one game table.
+
+    Dimension keys are read back as their names, so the snapshot does not
+    need the lookup tables.
+    """
+    columns = {}
+    for _, col, kind, *_ in conn.execute(f"PRAGMA table_info({table})"):
+        name = name_column(col)
+        if name != col:
+            dim_table = DIMENSIONS[name][0]
+            columns[name] = (
+                f"(SELECT {name} FROM {dim_table} d WHERE d.{col} = t.{col})",
+                "TEXT",
+            )
+        else:
+            columns[col] = (f't."{col}"', kind)
+    return columns
+
+
+def _months(conn, table):
+    """(label, lo, hi) of every month with games, as half-open ts bounds."""
+    days = [row[0] for row in conn.execute(f"SELECT DISTINCT day FROM {table}")]
+    months = pd.to_datetime(pd.Series(days), unit="D").dt.to_period("M").unique()
+    for month in sorted(months):
+        lo = month.start_time.normalize()
+        hi = (month + 1).start_time.normalize()
+        yield (
+            month.strftime("%Y-%m"),
+            (lo - pd.Timestamp(0)) // pd.Timedelta(seconds=1),
+            (hi - pd.Timestamp(0)) // pd.Timedelta(seconds=1),
+        )
+
+
+def export_parquet(conn, out_dir, compression="zstd"):
+    """Write the game tables as a Parquet snapshot, one file per table and month.
+
+    Layout is ``<out_dir>/<table>/month=YYYY-MM/part-0.parquet`` (hive style,
+    so pandas/pyarrow/duckdb read each table as one dataset). Text columns
+    are dictionary-encoded and every month of a table shares one schema.
+    The snapshot is written to a temporary directory and swapped in at the
+    end, so readers never see half of it.
+    """
+    tmp_dir = out_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    for table in SNAPSHOT_TABLES:
+        columns = _columns(conn, table)
+        schema = pa.schema(
+            [(col, _ARROW_TYPES[kind]) for col, (_, kind) in columns.items()]
+        )
+        select = ", ".join(f'{expr} AS "{col}"' for col, (expr, _) in columns.items())
+        for month, lo, hi in _months(conn, table):
+            df = pd.read_sql_query(
+                f"SELECT {select} FROM {table} t WHERE t.ts >= ? AND t.ts < ?",
+                conn,
+                params=(lo, hi),
+            )
+            path = os.path.join(tmp_dir, table, f"month={month}")
+            os.makedirs(path)
+            pq.write_table(
+                pa.Table.from_pandas(df, schema=schema, preserve_index=False),
+                os.path.join(path, "part-0.parquet"),
+                compression=compression,
+            )
+
+    old_dir = out_dir + ".old"
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(out_dir):
+        os.rename(out_dir, old_dir)
+    os.rename(tmp_dir, out_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def read_parquet(out_dir, table, columns=None, start_date=None, end_date=None):
+    """Read one table of the snapshot, skipping the months outside the range.
+
+    Dates follow the query layer: calendar days, both ends included.
+    """
+    lo, hi = date_range(start_date, end_date)
+    filters = [("ts", ">=", lo), ("ts", "<", hi)]
+    if start_date is not None:
+        filters.append(("month", ">=", pd.Timestamp(start_date).strftime("%Y-%m")))
+    if end_date is not None:
+        filters.append(("month", "<=", pd.Timestamp(end_date).strftime("%Y-%m")))
+    return pd.read_parquet(
+        os.path.join(out_dir, table), columns=columns, filters=filters
+    )
@@ -1,34 +1,54 @@
 # database/patch.py
 
 from .base import get_conn
+from .dimensions import keys_in
+from .dates import day_range
 import pandas as pd
 
 
 def get_patch_champion_stats(patches, start_date, end_date, leagues=None):
     conn = get_conn()
 
+    # Soma os resumos diários por campeão e posição; cada campeão sai com a
+    # posição em que mais jogou (MAX faz o SQLite pegar position_id da linha
+    # com mais jogos)
     query = """
+        WITH by_position AS (
+            SELECT champion_id, position_id,
+                   SUM(games) AS games, SUM(wins) AS wins
+            FROM champion_daily
+            WHERE patch IN ({patches_placeholder})
+              AND day >= ? AND day < ?
+              {league_filter}
+            GROUP BY champion_id, position_id
+        )
         SELECT champion,
-              position,
-               COUNT(*) as games,
-               ROUND(100.0 * SUM(result) / COUNT(*), 2) as winrate
-        FROM matches
-        WHERE patch IN ({patches_placeholder})
-          AND date BETWEEN ? AND ?
+               position,
+               games,
+               ROUND(100.0 * wins / games, 2) as winrate
+        FROM (
+            SELECT champion_id, position_id, MAX(games) AS most,
+                   SUM(games) AS games, SUM(wins) AS wins
+            FROM by_position
+            GROUP BY champion_id
+        )
+        LEFT JOIN champions USING (champion_id)
+        LEFT JOIN positions USING (position_id)
+        ORDER BY games DESC
     """
 
     params = []
     patches_placeholder = ",".join(["?"] * len(patches))
     params.extend(patches)
-    params += [start_date, end_date]
+    params += day_range(start_date, end_date)
 
+    league_filter = ""
     if leagues:
-        league_placeholder = ",".join(["?"] * len(leagues))
-        query += f" AND league IN ({league_placeholder})"
+        league_filter = f" AND league_id IN {keys_in('league', len(leagues))}"
         params.extend(leagues)
 
-    query += " GROUP BY champion ORDER BY games DESC"
-
-    full_query = query.format(patches_placeholder=patches_placeholder)
+    full_query = query.format(
+        patches_placeholder=patches_placeholder, league_filter=league_filter
+    )
 
     return pd.read_sql_query(full_query, conn, params=params)
@@ -1,65 +1,58 @@
 import pandas as pd
 from .base import get_conn
+from .dimensions import key_of
+from .dates import DATE_SQL, date_range
 
 
 def get_player_stats(player_name=None, start_date=None, end_date=None):
     conn = get_conn()
     if player_name:
-        query = """
+        query = f"""
             SELECT playername, AVG(kills) as kills, AVG(deaths) as deaths,
                 AVG(assists) as assists, AVG(kda) as kda, AVG(totalgold) as totalgold
-        FROM matches
-        WHERE playername = ? AND date BETWEEN ? AND ?
-        GROUP BY playername
+        FROM player_games
+        LEFT JOIN players USING (player_id)
+        WHERE player_id = {key_of("playername")} AND ts >= ? AND ts < ?
+        GROUP BY player_id
     """
         return pd.read_sql_query(
-            query, conn, params=(player_name, start_date, end_date)
+            query, conn, params=(player_name, *date_range(start_date, end_date))
         )
     else:
         query = """
-            SELECT distinct(playername)
-            FROM matches
+            SELECT playername
+            FROM (SELECT DISTINCT player_id FROM player_games)
+            LEFT JOIN players USING (player_id)
         """
         return pd.read_sql_query(query, conn)
 
 
 def get_player_match_history(player_name=None, start_date=None, end_date=None):
+    """Games of ``player_name``, newest first, with their lane opponent."""
     conn = get_conn()
-    query = """
-        SELECT gameid, date, position, playername, champion, kills, deaths,
-               assists, totalgold, result
-        FROM matches
-        WHERE playername = ? AND date BETWEEN ? AND ?
-        ORDER BY date DESC
-    """
-    df = pd.read_sql_query(query, conn, params=(player_name, start_date, end_date))
-    if df.empty:
-        return df
-
-    placeholders = ",".join(["?"] * len(df))
-    query_opponent = f"""
-        SELECT gameid, date, position, playername, champion
-        FROM matches
-        WHERE playername != ?
-          AND date BETWEEN ? AND ?
-          AND gameid IN ({placeholders})
+    query = f"""
+        SELECT gameid, {DATE_SQL} AS date, position, p.playername, c.champion,
+               kills, deaths, assists, totalgold, result,
+               o.playername AS opponent, oc.champion AS opponent_champion
+        FROM lane_matchups m
+        LEFT JOIN positions USING (position_id)
+        LEFT JOIN players p ON p.player_id = m.player_id
+        LEFT JOIN champions c ON c.champion_id = m.champion_id
+        LEFT JOIN players o ON o.player_id = m.opponent_id
+        LEFT JOIN champions oc ON oc.champion_id = m.opponent_champion_id
+        WHERE m.player_id = {key_of("playername")}
+          AND m.opponent_id != m.player_id
+          AND ts >= ? AND ts < ?
+        ORDER BY ts DESC
     """
-    params = [player_name, start_date, end_date, *df["gameid"].tolist()]
-    df_opponent = pd.read_sql_query(query_opponent, conn, params=params)
-
-    df_merged = pd.merge(
-        df,
-        df_opponent.rename(
-            columns={"playername": "opponent", "champion": "opponent_champion"}
-        ),
-        on=["date", "gameid", "position"],
+    return pd.read_sql_query(
+        query, conn, params=(player_name, *date_range(start_date, end_date))
     )
-    return df_merged
 
 
 def get_most_picked_champions(player_name=None, start_date=None, end_date=None):
     conn = get_conn()
-    query = """
+    query = f"""
     SELECT 
         champion,
         COUNT(*) as num_games,
@@ -68,11 +61,13 @@ def get_most_picked_champions(player_name=None, start_date=None, end_date=None):
         ROUND(CAST(SUM(deaths) AS FLOAT) / COUNT(*), 2) as avg_deaths,
         ROUND(CAST(SUM(assists) AS FLOAT) / COUNT(*), 2) as avg_assists,
         ROUND(CAST((sum(kills)+sum(assists)) AS FLOAT) / sum(deaths), 2) as kda
-    FROM matches
-    WHERE playername = ?
-        AND position != 'team'
-        AND date BETWEEN ? AND ?
-    GROUP BY champion 
+    FROM player_games
+    LEFT JOIN champions USING (champion_id)
+    WHERE player_id = {key_of("playername")}
+        AND ts >= ? AND ts < ?
+    GROUP BY champion_id 
     ORDER BY num_games DESC
     """
-    return pd.read_sql_query(query, conn, params=(player_name, start_date, end_date))
+    return pd.read_sql_query(
+        query, conn, params=(player_name, *date_range(start_date, end_date))
+    )
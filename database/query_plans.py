@@ -0,0 +1,228 @@
+import json
+import re
+
+from .backends import QUERY_METHODS, SQLiteBackend
+from .base import get_conn, get_writer
+from .dimensions import DIMENSIONS
+from .workload import workload
+
+# Tabelas de lookup são pequenas: ler a tabela inteira não é problema
+SMALL_TABLES = {table for table, _ in DIMENSIONS.values()}
+
+_ALIAS = re.compile(
+    r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(?!(?:ON|USING|WHERE|LEFT|INNER|CROSS|JOIN|GROUP|ORDER|LIMIT|UNION)\b)(\w+))?",
+    re.I,
+)
+# Coluna da tabela: com o alias dela ou sem nenhum (m.col ou col, não x.col)
+_COLUMN = r"(?:\b{alias}\.|(?<![\w.])){col}\b"
+_PREDICATE = _COLUMN + r"\s*(=|IN\b|IS\b|>=|<=|>|<|BETWEEN\b)"
+_LITERAL = _COLUMN + r"\s*(=|!=|<>)\s*(-?\d+(?:\.\d+)?)\b"
+
+
+def capture_queries(call):
+    """Run ``call()`` and return the SELECTs it sent to the SQLite connection,
+    with the parameters already bound."""
+    conn = get_conn()
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        call()
+    finally:
+        conn.set_trace_callback(None)
+    return [
+        sql for sql in statements if sql.lstrip().upper().startswith(("SELECT", "WITH"))
+    ]
+
+
+def explain(cursor, sql):
+    """Detail lines of ``EXPLAIN QUERY PLAN`` for ``sql``."""
+    return [row[3] for row in cursor.execute(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def _aliases(cursor, sql):
+    """Name (or alias) used in the plan -> real table, for the tables of ``sql``."""
+    tables = {
+        name
+        for (name,) in cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type='table'"
+        )
+    }
+    aliases = {}
+    for table, alias in _ALIAS.findall(sql):
+        if table in tables:
+            aliases[alias or table] = table
+            aliases.setdefault(table, table)
+    return aliases
+
+
+def scanned_tables(cursor, sql, plan=None):
+    """Real tables ``sql`` reads whole (``SCAN``), lookup tables left out."""
+    aliases = _aliases(cursor, sql)
+    scans = set()
+    for detail in plan if plan is not None else explain(cursor, sql):
+        match = re.match(r"SCAN (\w+)", detail)
+        if match and match.group(1) in aliases:
+            table = aliases[match.group(1)]
+            if table not in SMALL_TABLES:
+                scans.add(table)
+    return scans
+
+
+def _candidate_indexes(cursor, sql, table):
+    """Indexes worth trying on ``table`` for ``sql``, most useful first.
+
+    The first has every filtered column, equality columns before range
+    columns, so it also serves the range and its ORDER BY. Then come the
+    covering variant (every other column of ``table`` the query mentions
+    appended), a partial index when a column is compared with a literal,
+    and the shorter prefixes.
+    """
+    aliases = [a for a, t in _aliases(cursor, sql).items() if t == table]
+    alias = "(?:" + "|".join(map(re.escape, aliases)) + ")"
+    columns = [row[1] for row in cursor.execute(f"PRAGMA table_info({table})")]
+    equal, ranged, partial = [], [], []
+    for col in columns:
+        ops = re.findall(_PREDICATE.format(alias=alias, col=col), sql, re.I)
+        if any(op.upper() in ("=", "IN", "IS") for op in ops):
+            equal.append(col)
+        elif ops:
+            ranged.append(col)
+        for op, value in re.findall(_LITERAL.format(alias=alias, col=col), sql, re.I):
+            partial.append(f"{col} {op} {value}")
+    used = [
+        c
+        for c in columns
+        if re.search(_COLUMN.format(alias=alias, col=c), sql)
+        and c not in equal + ranged
+    ]
+
+    keys = equal + ranged
+    if not keys:
+        return []
+    candidates = [(keys, None)]
+    if used:
+        candidates.append((keys + used, None))
+    if partial:
+        candidates.append((keys, " AND ".join(partial)))
+    candidates += [(keys[:n], None) for n in range(len(keys) - 1, 0, -1)]
+    return candidates
+
+
+def propose_index(cursor, sql, table):
+    """Best candidate index that stops ``sql`` from scanning ``table``.
+
+    Each candidate is created inside a savepoint, checked with EXPLAIN QUERY
+    PLAN and rolled back, so the database is left as it was. Returns the
+    CREATE INDEX statement, or None when no candidate helps.
+    """
+    for n, (columns, where) in enumerate(_candidate_indexes(cursor, sql, table)):
+        name = f"idx_{table}_{'_'.join(columns)}"
+        create = f"CREATE INDEX {name} ON {table} ({', '.join(columns)})"
+        if where:
+            create += f" WHERE {where}"
+        cursor.execute("SAVEPOINT advisor")
+        try:
+            cursor.execute(create.replace(name, f"_advisor_{n}", 1))
+            helps = table not in scanned_tables(cursor, sql)
+        finally:
+            cursor.execute("ROLLBACK TO advisor")
+            cursor.execute("RELEASE advisor")
+        if helps:
+            return create
+    return None
+
+
+def plan_report(start=None, end=None, advise=True):
+    """EXPLAIN QUERY PLAN of every query the workload runs on SQLite.
+
+    Returns one dict per statement with the workload ``label``, the
+    ``sql``, its ``plan``, the tables it ``scans``, whether it builds a
+    ``temp_btree`` (ORDER BY/GROUP BY/DISTINCT without an index) and, with
+    ``advise``, the ``proposals`` (CREATE INDEX) that remove the scans.
+    """
+    backend = SQLiteBackend()
+    cursor = get_conn().cursor()
+    # Os índices candidatos precisam de uma conexão que escreva
+    writer = get_writer() if advise else None
+    report = []
+    for label, method, args in workload(backend, start, end):
+        call = lambda: getattr(backend, method)(*args)  # noqa: E731
+        for sql in capture_queries(call):
+            plan = explain(cursor, sql)
+            scans = scanned_tables(cursor, sql, plan)
+            report.append(
+                {
+                    "label": label,
+                    "sql": sql,
+                    "plan": plan,
+                    "scans": sorted(scans),
+                    "temp_btree": any("TEMP B-TREE" in d for d in plan),
+                    "proposals": (
+                        [
+                            p
+                            for p in (
+                                propose_index(writer.cursor, sql, t) for t in scans
+                            )
+                            if p
+                        ]
+                        if advise
+                        else []
+                    ),
+                }
+            )
+    if writer:
+        writer.close()
+    return report
+
+
+def missing_methods(start=None, end=None):
+    """QUERY_METHODS the workload does not exercise."""
+    covered = {method for _, method, _ in workload(SQLiteBackend(), start, end)}
+    return [method for method in QUERY_METHODS if method not in covered]
+
+
+def plan_scans(report):
+    """Label -> tables scanned by any of its statements."""
+    scans = {}
+    for entry in report:
+        scans.setdefault(entry["label"], set()).update(entry["scans"])
+    return {label: sorted(tables) for label, tables in scans.items()}
+
+
+def save_baseline(report, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(plan_scans(report), f, indent=2, sort_keys=True)
+
+
+def plan_regressions(report, baseline_path=None):
+    """(label, table) scans that are not in the baseline.
+
+    Without a baseline every scan of a non-lookup table counts: the
+    dashboard queries are expected to be index reads only.
+    """
+    baseline = {}
+    if baseline_path:
+        with open(baseline_path, encoding="utf-8") as f:
+            baseline = json.load(f)
+    return [
+        (label, table)
+        for label, tables in plan_scans(report).items()
+        for table in tables
+        if table not in baseline.get(label, [])
+    ]
+
+
+def print_plan_report(report, verbose=False):
+    """Print the scans, temp B-trees and index proposals of ``report``."""
+    print("🔎 Query plans\n")
+    for entry in report:
+        flags = [f"SCAN {t}" for t in entry["scans"]]
+        if entry["temp_btree"]:
+            flags.append("TEMP B-TREE")
+        print(f"- {entry['label']}: {', '.join(flags) or 'ok'}")
+        if verbose or entry["scans"]:
+            for detail in entry["plan"]:
+                print(f"    {detail}")
+        for proposal in entry["proposals"]:
+            print(f"    💡 {proposal}")
+    print()
@@ -0,0 +1,227 @@
+# Tabelas resumidas por dia, derivadas de player_games. São refeitas dia a
+# dia: uma carga incremental só recalcula os dias dos jogos que mudaram.
+# Toda tabela aqui precisa da coluna day.
+
+
+def _pair_rollup(table, key):
+    """Columns and SELECT of the head-to-head pair table of ``key``.
+
+    Every unordered pair (a_id < b_id) of values of ``key`` in the same
+    game, with the game and the side of each.
+    """
+    columns = """
+        a_id INTEGER NOT NULL,
+        b_id INTEGER NOT NULL,
+        gameid INTEGER NOT NULL,
+        day INTEGER NOT NULL,
+        ts INTEGER,
+        league_id INTEGER,
+        a_side_id INTEGER,
+        b_side_id INTEGER
+    """
+    select = f"""
+        SELECT a.{key}, b.{key}, a.gameid, a.day, a.ts, a.league_id,
+               a.side_id, b.side_id
+        FROM {table} a
+        JOIN {table} b ON b.gameid = a.gameid AND b.{key} > a.{key}
+        WHERE a.day IN (SELECT day FROM _rollup_days)
+        GROUP BY a.gameid, a.{key}, b.{key}
+    """
+    return columns, select
+
+
+# tabela -> (colunas, SELECT que gera as linhas dos dias em _rollup_days)
+# As colunas *_count de champion_daily contam os valores não nulos, para as
+# médias ignorarem NULL como o AVG
+ROLLUPS = {
+    "champion_daily": (
+        """
+        day INTEGER NOT NULL,
+        league_id INTEGER,
+        patch REAL,
+        champion_id INTEGER,
+        position_id INTEGER,
+        side_id INTEGER,
+        games INTEGER NOT NULL,
+        wins INTEGER,
+        kills INTEGER,
+        deaths INTEGER,
+        assists INTEGER,
+        totalgold REAL,
+        kda REAL,
+        result_count INTEGER,
+        kills_count INTEGER,
+        deaths_count INTEGER,
+        assists_count INTEGER,
+        totalgold_count INTEGER,
+        kda_count INTEGER
+        """,
+        """
+        SELECT day, league_id, patch, champion_id, position_id, side_id,
+               COUNT(*), SUM(result), SUM(kills), SUM(deaths), SUM(assists),
+               SUM(totalgold), SUM(kda), COUNT(result), COUNT(kills),
+               COUNT(deaths), COUNT(assists), COUNT(totalgold), COUNT(kda)
+        FROM player_games
+        WHERE day IN (SELECT day FROM _rollup_days)
+        GROUP BY day, league_id, patch, champion_id, position_id, side_id
+        """,
+    ),
+    # Pares (campeão, outro campeão do mesmo jogo), do mesmo time ou não;
+    # wins conta as vitórias do primeiro
+    "champion_pairs_daily": (
+        """
+        day INTEGER NOT NULL,
+        league_id INTEGER,
+        champion_id INTEGER NOT NULL,
+        other_id INTEGER NOT NULL,
+        same_team INTEGER NOT NULL,
+        games INTEGER NOT NULL,
+        wins INTEGER
+        """,
+        """
+        SELECT a.day, a.league_id, a.champion_id, b.champion_id,
+               a.team_id = b.team_id, COUNT(*), SUM(a.result)
+        FROM player_games a
+        JOIN player_games b
+          ON b.gameid = a.gameid AND b.champion_id != a.champion_id
+        WHERE a.day IN (SELECT day FROM _rollup_days)
+          AND a.team_id IS NOT NULL AND b.team_id IS NOT NULL
+        GROUP BY a.day, a.league_id, a.champion_id, b.champion_id,
+                 a.team_id = b.team_id
+        """,
+    ),
+    # Confrontos de rota: cada linha de jogador com cada outra linha da mesma
+    # posição no mesmo jogo (o adversário direto), nos dois sentidos
+    "lane_matchups": (
+        """
+        day INTEGER NOT NULL,
+        ts INTEGER,
+        gameid INTEGER NOT NULL,
+        league_id INTEGER,
+        position_id INTEGER,
+        player_id INTEGER,
+        champion_id INTEGER,
+        team_id INTEGER,
+        result INTEGER,
+        kills INTEGER,
+        deaths INTEGER,
+        assists INTEGER,
+        totalgold INTEGER,
+        opponent_id INTEGER,
+        opponent_champion_id INTEGER,
+        opponent_team_id INTEGER
+        """,
+        """
+        SELECT a.day, a.ts, a.gameid, a.league_id, a.position_id, a.player_id,
+               a.champion_id, a.team_id, a.result, a.kills, a.deaths,
+               a.assists, a.totalgold, b.player_id, b.champion_id, b.team_id
+        FROM player_games a
+        JOIN player_games b
+          ON b.gameid = a.gameid AND b.position_id IS a.position_id
+         AND b.rowid != a.rowid
+        WHERE a.day IN (SELECT day FROM _rollup_days)
+        """,
+    ),
+    # Uma linha por jogo, com os dois times lado a lado
+    "game_summary": (
+        """
+        gameid INTEGER PRIMARY KEY,
+        day INTEGER NOT NULL,
+        ts INTEGER,
+        league_id INTEGER,
+        patch REAL,
+        split TEXT,
+        playoffs INTEGER,
+        gamelength INTEGER,
+        blue_team_id INTEGER,
+        red_team_id INTEGER,
+        winner_id INTEGER
+        """,
+        """
+        SELECT gameid, day, MAX(ts), league_id, patch, {split}, {playoffs},
+               gamelength,
+               MAX(CASE WHEN side_id = 0 THEN team_id END),
+               MAX(CASE WHEN side_id = 1 THEN team_id END),
+               MAX(CASE WHEN result = 1 THEN team_id END)
+        FROM team_games
+        WHERE day IN (SELECT day FROM _rollup_days)
+        GROUP BY gameid
+        """,
+    ),
+    # Índices de confronto direto: os jogos de cada par de jogadores, times
+    # ou campeões, para o head-to-head não agrupar a janela inteira
+    "player_h2h": _pair_rollup("player_games", "player_id"),
+    "team_h2h": _pair_rollup("team_games", "team_id"),
+    "champion_h2h": _pair_rollup("player_games", "champion_id"),
+}
+
+ROLLUP_INDEXES = {
+    "champion_daily": [("champion_id", "day"), ("day",)],
+    "champion_pairs_daily": [("champion_id", "same_team", "day"), ("day",)],
+    "lane_matchups": [("player_id", "ts"), ("champion_id", "ts"), ("day",)],
+    "game_summary": [("blue_team_id", "ts"), ("red_team_id", "ts"), ("day",)],
+    "player_h2h": [("a_id", "b_id", "ts"), ("day",)],
+    "team_h2h": [("a_id", "b_id", "ts"), ("day",)],
+    "champion_h2h": [("a_id", "b_id", "ts"), ("day",)],
+}
+
+ROLLUP_TABLES = tuple(ROLLUPS)
+
+# Colunas que o plano pode descartar (constantes nos CSVs): viram NULL nos
+# SELECTs acima quando não existem em team_games
+OPTIONAL_COLUMNS = ("split", "playoffs")
+
+
+def _table_exists(cursor, table):
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,)
+    )
+    return cursor.fetchone() is not None
+
+
+def _same_columns(cursor, table, columns):
+    """Whether ``table`` was created with ``columns`` (names and types)."""
+    declared = [tuple(line.split()[:2]) for line in columns.split(",") if line.strip()]
+    stored = [(row[1], row[2]) for row in cursor.execute(f"PRAGMA table_info({table})")]
+    return declared == stored
+
+
+def _optional_columns(cursor):
+    stored = {row[1] for row in cursor.execute("PRAGMA table_info(team_games)")}
+    return {col: col if col in stored else "NULL" for col in OPTIONAL_COLUMNS}
+
+
+def refresh_rollups(cursor, days=None):
+    """Recompute the rollup rows of ``days`` from ``player_games``.
+
+    ``days=None`` rebuilds every day. A rollup table that does not exist
+    yet, or whose columns changed since it was created, is (re)created and
+    filled for every day, whatever ``days`` is, so ``days=()`` only builds
+    the missing or outdated tables.
+    """
+    cursor.execute("CREATE TEMP TABLE IF NOT EXISTS _rollup_days (day INTEGER)")
+    optional = _optional_columns(cursor)
+    for table, (columns, select) in ROLLUPS.items():
+        if _table_exists(cursor, table) and not _same_columns(cursor, table, columns):
+            cursor.execute(f"DROP TABLE {table}")
+        all_days = days is None or not _table_exists(cursor, table)
+        cursor.execute("DELETE FROM _rollup_days")
+        if all_days:
+            cursor.execute(
+                "INSERT INTO _rollup_days SELECT DISTINCT day FROM player_games"
+            )
+        else:
+            cursor.executemany(
+                "INSERT INTO _rollup_days VALUES (?)", [(int(d),) for d in set(days)]
+            )
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns})")
+        for index in ROLLUP_INDEXES[table]:
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{table}_{'_'.join(index)} "
+                f"ON {table} ({', '.join(index)})"
+            )
+        cursor.execute(
+            f"DELETE FROM {table} WHERE day IN (SELECT day FROM _rollup_days)"
+        )
+        cursor.execute(f"INSERT INTO {table} {select.format(**optional)}")
+    cursor.execute("DROP TABLE _rollup_days")
@@ -0,0 +1,187 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .dimensions import name_column
+
+# Colunas de texto com poucos valores distintos
+CATEGORY_COLUMNS = [
+    "league",
+    "split",
+    "side",
+    "position",
+    "playername",
+    "teamname",
+    "champion",
+]
+
+
+# Linhas de jogador e linhas de time (position == "team") ficam em tabelas
+# separadas, cada uma só com as colunas que têm valor nas suas linhas
+ROW_TABLES = ("player_games", "team_games")
+
+# Colunas que as queries usam: nunca são descartadas, mesmo se constantes
+REQUIRED_COLUMNS = {
+    "player_games": [
+        "league",
+        "teamname",
+        "playername",
+        "champion",
+        "position",
+        "side",
+        "patch",
+        "result",
+    ],
+    "team_games": ["league", "teamname", "side", "patch", "result"],
+}
+
+# Colunas criadas pelo próprio build, com tipo fixo e nunca descartadas
+FIXED_STORAGE = {"gameid": "INTEGER", "ts": "INTEGER", "day": "INTEGER", "kda": "REAL"}
+
+_KIND_RANK = {None: 0, "INTEGER": 1, "REAL": 2, "TEXT": 3}
+
+
+def plan_path(db_name):
+    """The plan lives next to the database: lol_data.db -> lol_data.schema.json"""
+    return os.path.splitext(db_name)[0] + ".schema.json"
+
+
+def load_plan(path):
+    """Table -> column plan, or None when missing or from an older layout."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return data["tables"] if data.get("version") == 2 else None
+
+
+def save_plan(plan, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"version": 2, "tables": plan}, f, indent=2)
+
+
+def storage_schema(plan):
+    """Column -> SQLite type of the columns that are actually stored."""
+    return {col: spec["storage"] for col, spec in plan.items() if not spec["dropped"]}
+
+
+def storage_schemas(plan):
+    return {table: storage_schema(columns) for table, columns in plan.items()}
+
+
+def new_columns(plan, columns):
+    known = set().union(*plan.values()) if plan else set()
+    return [col for col in columns if col not in known]
+
+
+def scan_columns(df, columns=None):
+    """Per-column facts about one frame, to be combined by ``plan_from_scans``.
+
+    Returns ``(rows, {column: (kind, sample_values, has_null)})``. kind is
+    None for a column with no values to judge from, and ``sample_values``
+    holds up to two distinct values, enough to tell constant columns apart.
+    Every check is a vectorized pass over the column.
+    """
+    stats = {}
+    for col in df.columns if columns is None else columns:
+        s = df[col]
+        nulls = s.isna().to_numpy()
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            codes = s.cat.codes.to_numpy()[~nulls]
+            kind = "TEXT" if codes.size else None
+            sample = (
+                {s.cat.categories[codes.min()], s.cat.categories[codes.max()]}
+                if codes.size
+                else set()
+            )
+        elif pd.api.types.is_numeric_dtype(s.dtype):
+            values = s.to_numpy(dtype="float64", na_value=np.nan)[~nulls]
+            # VE SE TODOS OS VALORES CONSEGUEM SER COLOCADO PRA INTEGER
+            whole = np.isfinite(values) & (np.floor(values) == values)
+            kind = "INTEGER" if whole.all() else "REAL"
+            sample = {values.min(), values.max()} if values.size else set()
+        else:
+            values = s.to_numpy(dtype=object)[~nulls]
+            kind = "TEXT" if values.size else None
+            sample = set()
+            if values.size:
+                differing = values[values != values[0]]
+                sample = {values[0], *differing[:1]}
+        stats[col] = (kind, sample, bool(nulls.any()))
+    return len(df), stats
+
+
+def plan_from_scans(scans, rows_before=0, keep=()):
+    """Schema plan (storage, nullable, categorical, dropped) of every column.
+
+    Floats that only hold whole numbers are stored as INTEGER, the other
+    floats as REAL and anything non numeric as TEXT. Columns holding a single
+    value (nulls included) are dropped, like ``nunique(dropna=False) == 1``
+    did on the concatenated data. ``rows_before`` counts rows already stored
+    without these columns, which will be null for them. Columns in ``keep``
+    are never dropped.
+    """
+    kinds, values, has_null = {}, {}, {}
+    rows_seen = rows_before
+    for rows, stats in scans:
+        if not rows:
+            continue
+        for col in kinds.keys() - stats.keys():
+            has_null[col] = True
+        for col, (kind, sample, nulls) in stats.items():
+            if col not in kinds:
+                kinds[col], values[col] = None, set()
+                has_null[col] = rows_seen > 0
+            kinds[col] = max(kinds[col], kind, key=_KIND_RANK.get)
+            if len(values[col]) < 2:
+                values[col] |= sample
+            has_null[col] = has_null[col] or nulls
+        rows_seen += rows
+
+    plan = {}
+    for col, kind in kinds.items():
+        constant = len(values[col]) < 2 and not (values[col] and has_null[col])
+        constant = constant and col not in keep
+        if constant and col not in FIXED_STORAGE:
+            print(col)
+        plan[col] = {
+            "storage": FIXED_STORAGE.get(col, kind or "TEXT"),
+            "nullable": has_null[col],
+            "categorical": col in CATEGORY_COLUMNS,
+            "dropped": constant and col not in FIXED_STORAGE,
+        }
+    return plan
+
+
+def plan_tables(scans, rows_before=None):
+    """Plan of every row table from ``{table: [scan, ...]}`` pieces."""
+    by_table = {table: [] for table in ROW_TABLES}
+    for piece in scans:
+        for table, table_scans in piece.items():
+            by_table[table].extend(table_scans)
+    rows_before = rows_before or {}
+    return {
+        table: plan_from_scans(
+            table_scans, rows_before.get(table, 0), REQUIRED_COLUMNS[table]
+        )
+        for table, table_scans in by_table.items()
+    }
+
+
+def plan_from_table(cursor, table, columns):
+    """Rebuild a plan for a database created before plans were saved."""
+    stored = {
+        name_column(row[1]): "TEXT" if name_column(row[1]) != row[1] else row[2]
+        for row in cursor.execute(f"PRAGMA table_info({table})")
+    }
+    plan = {}
+    for col in dict.fromkeys([*stored, *columns]):
+        plan[col] = {
+            "storage": stored.get(col, "TEXT"),
+            "nullable": True,
+            "categorical": col in CATEGORY_COLUMNS,
+            "dropped": col not in stored,
+        }
+    return plan
@@ -1,44 +1,62 @@
 import pandas as pd
 from .base import get_conn
+from .dimensions import key_of
+from .dates import SECONDS_PER_DAY
+from .schema_plan import ROW_TABLES
 
 
 def get_all_dates():
-    query = "SELECT DISTINCT date FROM matches ORDER BY date"
+    query = f"""
+        SELECT date(day * {SECONDS_PER_DAY}, 'unixepoch') AS date
+        FROM (SELECT DISTINCT day FROM team_games)
+        ORDER BY date
+    """
     return pd.read_sql_query(query, get_conn())["date"]
 
 
 def get_all_columns():
-    query = "SELECT * FROM matches LIMIT 0"
-    df = pd.read_sql_query(query, get_conn())
-    return {col: str(df[col].dtype) for col in df.columns}
+    columns = {}
+    for table in ROW_TABLES:
+        df = pd.read_sql_query(f"SELECT * FROM {table} LIMIT 0", get_conn())
+        columns.update({col: str(df[col].dtype) for col in df.columns})
+    return columns
 
 
 def get_all_leagues():
     conn = get_conn()
-    query = "SELECT DISTINCT league FROM matches ORDER BY league"
+    query = """
+        SELECT league
+        FROM leagues
+        WHERE league_id IN (SELECT league_id FROM team_games)
+        ORDER BY league
+    """
     return pd.read_sql_query(query, conn)["league"].tolist()
 
 
 def get_all_patches():
     conn = get_conn()
-    query = "SELECT DISTINCT patch FROM matches ORDER BY patch"
+    query = "SELECT DISTINCT patch FROM team_games ORDER BY patch"
     return pd.read_sql_query(query, conn)["patch"].tolist()
 
 
 def get_all_players(league=None):
     conn = get_conn()
     base_query = """
-        SELECT DISTINCT playername
-        FROM matches
-        WHERE position != 'team'
+        SELECT player_id
+        FROM player_games
     """
 
     params = []
     if league:
-        base_query += " AND league = ?"
+        base_query += f" WHERE league_id = {key_of('league')}"
         params.append(league)
 
-    base_query += " ORDER BY playername"
+    base_query = f"""
+        SELECT playername
+        FROM players
+        WHERE player_id IN ({base_query})
+        ORDER BY playername
+    """
 
     return (
         pd.read_sql_query(base_query, conn, params=params)["playername"]
@@ -51,17 +69,21 @@ def get_all_players(league=None):
 def get_all_teams(league=None):
     conn = get_conn()
     base_query = """
-        SELECT DISTINCT teamname
-        FROM matches
-        WHERE position != 'team'
+        SELECT team_id
+        FROM team_games
     """
 
     params = []
     if league:
-        base_query += " AND league = ?"
+        base_query += f" WHERE league_id = {key_of('league')}"
         params.append(league)
 
-    base_query += " ORDER BY teamname"
+    base_query = f"""
+        SELECT teamname
+        FROM teams
+        WHERE team_id IN ({base_query})
+        ORDER BY teamname
+    """
 
     return (
         pd.read_sql_query(base_query, conn, params=params)["teamname"]
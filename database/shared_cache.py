@@ -0,0 +1,270 @@
+# Camada de cache compartilhada entre processos (workers do gunicorn) e que
+# sobrevive a restarts. Guarda bytes (resultados já serializados) por chave.
+# LOL_SHARED_CACHE escolhe onde: "disk" (padrão), uma URL redis://host:porta/db
+# de qualquer servidor que fale o protocolo do Redis, ou "off".
+#
+# Quem escreve no diretório ou no Redis não pode executar código nos
+# workers: os valores são só dados (JSON e Arrow IPC), nunca pickle.
+import glob
+import hashlib
+import json
+import os
+import socket
+import struct
+import tempfile
+import threading
+import time
+from urllib.parse import urlparse
+
+import pandas as pd
+
+SHARED_CACHE_ENV = "LOL_SHARED_CACHE"
+SHARED_CACHE_DIR_ENV = "LOL_SHARED_CACHE_DIR"
+SHARED_CACHE_BYTES_ENV = "LOL_SHARED_CACHE_BYTES"
+DEFAULT_SHARED_CACHE_BYTES = 512 * 1024**2
+
+# Depois de uma falha de rede, o Redis fica de fora por este tempo (s)
+REDIS_RETRY_SECONDS = 5.0
+
+
+def _digest(key):
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def _frame_bytes(df):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _bytes_frame(data):
+    import pyarrow as pa
+
+    return pa.ipc.open_stream(data).read_all().to_pandas()
+
+
+def _encode(value, blobs):
+    if isinstance(value, pd.DataFrame):
+        blobs.append(_frame_bytes(value))
+        return {"frame": len(blobs) - 1}
+    if isinstance(value, pd.Series):
+        blobs.append(_frame_bytes(value.to_frame("values")))
+        return {"series": len(blobs) - 1, "name": value.name}
+    if isinstance(value, dict):
+        if not all(isinstance(k, str) for k in value):
+            raise TypeError("only dicts with str keys can be shared")
+        return {"dict": {k: _encode(v, blobs) for k, v in value.items()}}
+    if isinstance(value, (list, tuple)):
+        return {type(value).__name__: [_encode(v, blobs) for v in value]}
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return {"value": value}
+    raise TypeError(f"{type(value).__name__} cannot be shared")
+
+
+def _decode(tree, blobs):
+    if "frame" in tree:
+        return _bytes_frame(blobs[tree["frame"]])
+    if "series" in tree:
+        return _bytes_frame(blobs[tree["series"]])["values"].rename(tree["name"])
+    if "dict" in tree:
+        return {k: _decode(v, blobs) for k, v in tree["dict"].items()}
+    if "list" in tree:
+        return [_decode(v, blobs) for v in tree["list"]]
+    if "tuple" in tree:
+        return tuple(_decode(v, blobs) for v in tree["tuple"])
+    return tree["value"]
+
+
+def encode_value(value):
+    """Bytes of a query result or rendered output: DataFrames and Series as
+    Arrow IPC streams, everything around them (dicts with str keys, lists,
+    tuples, scalars) as JSON. Raises TypeError for anything else."""
+    blobs = []
+    header = json.dumps(
+        {"tree": _encode(value, blobs), "sizes": [len(b) for b in blobs]}
+    ).encode()
+    return struct.pack(">I", len(header)) + header + b"".join(blobs)
+
+
+def decode_value(data):
+    """Inverse of ``encode_value``. Malformed data raises ValueError."""
+    try:
+        (size,) = struct.unpack_from(">I", data)
+        header = json.loads(data[4 : 4 + size])
+        blobs, offset = [], 4 + size
+        for length in header["sizes"]:
+            blobs.append(data[offset : offset + length])
+            offset += length
+        return _decode(header["tree"], blobs)
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(f"not a shared cache value: {e}") from e
+
+
+class DiskCache:
+    """Values as files in ``directory``, trimmed to about ``max_bytes``.
+
+    Writes go to a temporary file renamed into place, so a reader in
+    another process never sees half a value. Reads touch the file and the
+    trim removes the least recently used ones.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_SHARED_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._written = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, _digest(key) + ".bin")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            return None
+        return data
+
+    def set(self, key, data):
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            return
+        self._written += len(data)
+        # Só varre o diretório depois de escrever uma fração do limite
+        if self._written > self.max_bytes // 10:
+            self._written = 0
+            self.trim()
+
+    def trim(self):
+        files = []
+        for path in glob.glob(os.path.join(self.directory, "*.bin")):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+
+class RedisCache:
+    """Values in a server speaking the Redis protocol (RESP).
+
+    Only GET and SET are used, so Redis, Valkey, KeyDB or a local stand-in
+    all work. A connection per thread; any network error is a miss and the
+    server is left alone for ``REDIS_RETRY_SECONDS``, so the dashboard keeps
+    working (uncached) while it is down. ``ttl`` (seconds) expires the keys.
+    """
+
+    def __init__(self, url, ttl=None, timeout=1.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.strip("/") or 0)
+        self.password = parsed.password
+        self.ttl = ttl
+        self.timeout = timeout
+        self._local = threading.local()
+        self._down_until = 0.0
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), self.timeout)
+        self._local.sock, self._local.file = sock, sock.makefile("rb")
+        if self.password:
+            self._command("AUTH", self.password)
+        if self.db:
+            self._command("SELECT", str(self.db))
+
+    def _read(self):
+        line = self._local.file.readline()
+        if not line:
+            raise ConnectionError("connection closed")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest
+        if kind == b"-":
+            raise ConnectionError(rest.decode(errors="replace"))
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            size = int(rest)
+            if size < 0:
+                return None
+            data = self._local.file.read(size + 2)
+            return data[:-2]
+        if kind == b"*":
+            return [self._read() for _ in range(int(rest))]
+        raise ConnectionError(f"unexpected reply {line!r}")
+
+    def _command(self, *parts):
+        out = [b"*%d\r\n" % len(parts)]
+        for part in parts:
+            part = part if isinstance(part, bytes) else str(part).encode()
+            out += [b"$%d\r\n" % len(part), part, b"\r\n"]
+        self._local.sock.sendall(b"".join(out))
+        return self._read()
+
+    def _call(self, *parts):
+        if time.monotonic() < self._down_until:
+            return None
+        try:
+            if getattr(self._local, "sock", None) is None:
+                self._connect()
+            return self._command(*parts)
+        except (OSError, ConnectionError, ValueError):
+            sock = getattr(self._local, "sock", None)
+            if sock is not None:
+                sock.close()
+            self._local.sock = None
+            self._down_until = time.monotonic() + REDIS_RETRY_SECONDS
+            return None
+
+    def get(self, key):
+        return self._call("GET", key)
+
+    def set(self, key, data):
+        if self.ttl:
+            self._call("SET", key, data, "EX", str(int(self.ttl)))
+        else:
+            self._call("SET", key, data)
+
+
+def shared_cache_from_env(db_name):
+    """The shared tier picked by $LOL_SHARED_CACHE, or None when off.
+
+    The disk tier lives next to the database (``lol_data.cache``) unless
+    $LOL_SHARED_CACHE_DIR says otherwise.
+    """
+    kind = os.environ.get(SHARED_CACHE_ENV, "disk")
+    if kind in ("", "off", "none"):
+        return None
+    if kind.startswith("redis://"):
+        return RedisCache(kind)
+    if kind != "disk":
+        raise ValueError(
+            f"Unknown {SHARED_CACHE_ENV} {kind!r}, expected disk, off or redis://..."
+        )
+    directory = os.environ.get(SHARED_CACHE_DIR_ENV) or (
+        os.path.splitext(os.path.abspath(db_name))[0] + ".cache"
+    )
+    max_bytes = int(os.environ.get(SHARED_CACHE_BYTES_ENV, DEFAULT_SHARED_CACHE_BYTES))
+    return DiskCache(directory, max_bytes)
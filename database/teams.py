@@ -1,78 +1,78 @@
 import pandas as pd
 from .base import get_conn
+from .dimensions import key_of
+from .dates import date_range
 
 
 def get_team_stats(team_name=None, start_date=None, end_date=None):
     conn = get_conn()
     if team_name:
-        query = """
+        query = f"""
             SELECT teamname, AVG(kills) as kills, AVG(deaths) as deaths,
                    AVG(assists) as assists, AVG(totalgold) as totalgold, AVG(result) as result
-            FROM matches
-            WHERE teamname = ? AND date BETWEEN ? AND ?
-            GROUP BY teamname
+            FROM team_games
+            LEFT JOIN teams USING (team_id)
+            WHERE team_id = {key_of("teamname")} AND ts >= ? AND ts < ?
+            GROUP BY team_id
         """
-        return pd.read_sql_query(query, conn, params=(team_name, start_date, end_date))
+        return pd.read_sql_query(
+            query, conn, params=(team_name, *date_range(start_date, end_date))
+        )
     else:
         query = """
             SELECT teamname, AVG(kills) as kills, AVG(deaths) as deaths,
                    AVG(assists) as assists, AVG(totalgold) as totalgold, AVG(result) as result
-            FROM matches GROUP BY teamname
+            FROM team_games
+            LEFT JOIN teams USING (team_id)
+            GROUP BY team_id
         """
         return pd.read_sql_query(query, conn)
 
 
 def get_team_match_history(team_name, start_date=None, end_date=None):
+    """Games of ``team_name``, newest first, with the other team of each."""
     conn = get_conn()
-    query = """
-        SELECT gameid, date, teamname, kills, deaths, assists, totalgold, result
-        FROM matches
-        WHERE teamname = ? AND position = 'team' AND date BETWEEN ? AND ?
-        ORDER BY date DESC
-    """
-    df = pd.read_sql_query(query, conn, params=(team_name, start_date, end_date))
-    if df.empty:
-        return df
-
-    placeholders = ",".join(["?"] * len(df))
-    query_opponent = f"""
-        SELECT gameid, teamname
-        FROM matches
-        WHERE teamname != ?
-          AND position = 'team'
-          AND gameid IN ({placeholders})
+    query = f"""
+        SELECT tg.gameid, datetime(tg.ts, 'unixepoch') AS date, t.teamname,
+               kills, deaths, assists, totalgold, result, o.teamname AS opponent
+        FROM team_games tg
+        LEFT JOIN game_summary g ON g.gameid = tg.gameid
+        LEFT JOIN teams t ON t.team_id = tg.team_id
+        LEFT JOIN teams o ON o.team_id = CASE
+            WHEN g.blue_team_id = tg.team_id THEN g.red_team_id
+            ELSE g.blue_team_id
+        END
+        WHERE tg.team_id = {key_of("teamname")}
+          AND tg.ts >= ? AND tg.ts < ?
+        ORDER BY tg.ts DESC
     """
-    params = [team_name, *df["gameid"].tolist()]
-    df_opponent = pd.read_sql_query(query_opponent, conn, params=params)
-
-    return pd.merge(
-        df,
-        df_opponent.rename(columns={"teamname": "opponent"}),
-        on="gameid",
-        how="left",
+    return pd.read_sql_query(
+        query, conn, params=(team_name, *date_range(start_date, end_date))
     )
 
 
 def get_team_most_picked_champions(team_name=None, start_date=None, end_date=None):
     conn = get_conn()
-    query = """
+    query = f"""
         WITH total_games AS (
-            SELECT COUNT(DISTINCT gameid) as total
-            FROM matches
-            WHERE teamname = ? AND position != 'team' AND date BETWEEN ? AND ?
+            SELECT COUNT(*) as total
+            FROM team_games
+            WHERE team_id = {key_of("teamname")}
+              AND ts >= ? AND ts < ?
         )
         SELECT champion,
         100*COUNT(*)/(SELECT total FROM total_games) as num_ocurrences
-        FROM matches
-        WHERE teamname = ? AND
-        position != 'team' and 
-        date BETWEEN ? AND ?
-        GROUP BY champion
-        ORDER BY num_ocurrences DESC
+        FROM player_games
+        LEFT JOIN champions USING (champion_id)
+        WHERE team_id = {key_of("teamname")} AND
+        ts >= ? AND ts < ?
+        GROUP BY champion_id
+        ORDER BY num_ocurrences DESC, champion
     """
     print()
+    lo, hi = date_range(start_date, end_date)
     return pd.read_sql_query(
         query,
         conn,
-        params=(team_name, start_date, end_date, team_name, start_date, end_date),
+        params=(team_name, lo, hi, team_name, lo, hi),
     ).head(20)
@@ -0,0 +1,88 @@
+def top_champions(backend, start=None, end=None, n=2):
+    """The ``n`` champions with most games in the period, over every patch
+    and league (ties by name, so every backend picks the same)."""
+    df = backend.get_patch_champion_stats(backend.get_all_patches(), start, end)
+    if df.empty:
+        return []
+    games = df.groupby("champion")["games"].sum().reset_index()
+    games = games.sort_values(["games", "champion"], ascending=[False, True])
+    return games["champion"].head(n).tolist()
+
+
+def workload(backend, start=None, end=None):
+    """(label, method, args) of the queries the pages run, for real names.
+
+    The names (first league, its first players and teams, the most played
+    champions, the last patches) come from ``backend`` itself, so every
+    backend answers the same calls. The head-to-head queries are left out
+    when there are not two players, teams or champions to pair.
+    """
+    league = backend.get_all_leagues()[0]
+    players = backend.get_all_players(league)[:2]
+    teams = backend.get_all_teams(league)[:2]
+    champs = top_champions(backend, start, end)
+    patches = backend.get_all_patches()[-3:]
+    calls = [
+        ("dates", "get_all_dates", ()),
+        ("leagues", "get_all_leagues", ()),
+        ("patches", "get_all_patches", ()),
+        ("columns", "get_all_columns", ()),
+        ("players", "get_all_players", (league,)),
+        ("teams", "get_all_teams", (league,)),
+        ("patch", "get_patch_champion_stats", (patches, start, end)),
+    ]
+    if players:
+        player = players[0]
+        calls += [
+            ("player_stats", "get_player_stats", (player, start, end)),
+            ("player_history", "get_player_match_history", (player, start, end)),
+            ("player_champions", "get_most_picked_champions", (player, start, end)),
+            ("player_period", "get_player_stats_in_period", (player, start, end)),
+        ]
+    if teams:
+        team = teams[0]
+        calls += [
+            ("team_stats", "get_team_stats", (team, start, end)),
+            ("team_history", "get_team_match_history", (team, start, end)),
+            ("team_champions", "get_team_most_picked_champions", (team, start, end)),
+            ("team_period", "get_team_stats_in_period", (team, start, end)),
+        ]
+    if champs:
+        champ = champs[0]
+        calls += [
+            ("champion_stats", "get_champion_stats", (champ, start, end, [league])),
+            ("champion_history", "get_champion_match_history", (champ, start, end)),
+            ("allies", "get_best_allies", ([champ], start, end)),
+            ("best_against", "get_best_against", ([champ], start, end)),
+            ("worst_against", "get_worst_against", ([champ], start, end)),
+            ("synergies", "get_synergies_and_counters", (champs, start, end)),
+            ("champion_period", "get_champion_stats_in_period", (champ, start, end)),
+        ]
+    if len(players) == 2:
+        calls += [
+            ("h2h_players", "get_head2head_stats", (*players, start, end)),
+            (
+                "h2h_players_history",
+                "get_head2head_match_history",
+                (*players, start, end),
+            ),
+        ]
+    if len(teams) == 2:
+        calls += [
+            ("h2h_teams", "get_head2head_stats_teams", (*teams, start, end)),
+            (
+                "h2h_teams_history",
+                "get_head2head_match_history_teams",
+                (*teams, start, end),
+            ),
+        ]
+    if len(champs) == 2:
+        calls += [
+            ("h2h_champions", "get_head2head_stats_champions", (*champs, start, end)),
+            (
+                "h2h_champions_history",
+                "get_head2head_match_history_champions",
+                (*champs, start, end),
+            ),
+        ]
+    return calls
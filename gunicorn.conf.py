@@ -0,0 +1,30 @@
+# Lido pelo gunicorn ao rodar "gunicorn app:app" na raiz do projeto
+import gc
+
+# Importa o app (e as páginas, que criam o DataProcessor) no master antes do
+# fork. Com LOL_QUERY_BACKEND=numpy os arrays são carregados uma vez e os
+# workers compartilham essas páginas de memória (copy-on-write).
+preload_app = True
+
+
+def pre_fork(server, worker):
+    # Tira os objetos já carregados do gc, senão a coleta nos workers
+    # escreve nos cabeçalhos e copia as páginas compartilhadas
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # As conexões SQLite abertas no master não podem ser usadas no worker;
+    # cada thread do worker abre a sua no primeiro uso
+    from database.base import reconnect
+
+    reconnect()
+
+
+def post_worker_init(worker):
+    # Aquece o cache antes do worker aceitar requests (/ready só responde OK
+    # depois); com o cache compartilhado, os outros workers leem o trabalho
+    # do primeiro. notify evita que o master mate o worker por timeout.
+    from warmup import warm_up
+
+    warm_up(notify=worker.notify)
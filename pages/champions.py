@@ -2,20 +2,19 @@ from dash import html, dcc, Input, Output, callback
 import dash_bootstrap_components as dbc
 import plotly.express as px
 from data_processor import DataProcessor
+from render_cache import render_cached
 import pandas as pd
 
 data_processor = DataProcessor()
 
 # Dropdown options
-champions = data_processor.get_champion_stats()["champion"].unique()
-champions = [champ for champ in champions if pd.notna(champ) and champ.strip()]
+catalog = data_processor.catalog
+champions = catalog.champions
 # print(champions[0:3])
-leagues = data_processor.get_all_leagues()
-leagues = [l for l in leagues if pd.notna(l) and l.strip()]
+leagues = catalog.leagues
 
 # Date slider options
-all_dates = data_processor.get_all_dates()
-all_dates = sorted(pd.to_datetime(all_dates).dt.date.unique())
+all_dates = catalog.dates
 date_marks = {i: str(date) for i, date in enumerate(all_dates)}
 # print("All Dates: ", date_marks)
 
@@ -130,15 +129,20 @@ layout = html.Div(
     ],
 )
 def update_champion_stats(selected_champion, date_index_range, selected_leagues):
-    if not selected_champion:
-        return {}, {}, html.Div(), html.Div(), {"display": "none"}
-
     print("Selected Champion: ", selected_champion)
     print("Date Index Range: ", date_index_range)
     print("Selected Leagues: ", selected_leagues)
 
-    start_date = str(all_dates[int(date_index_range[0])])
-    end_date = str(all_dates[int(date_index_range[1])])
+    start_date, end_date = data_processor.catalog.period(date_index_range)
+    return render_champion_stats(
+        selected_champion, selected_leagues, start_date, end_date
+    )
+
+
+@render_cached
+def render_champion_stats(selected_champion, selected_leagues, start_date, end_date):
+    if not selected_champion:
+        return {}, {}, html.Div(), html.Div(), {"display": "none"}
 
     champion_data = data_processor.get_champion_stats(
         selected_champion, start_date, end_date, selected_leagues
@@ -2,18 +2,17 @@ from dash import html, dcc, Input, Output, callback
 import dash_bootstrap_components as dbc
 import pandas as pd
 from data_processor import DataProcessor
+from render_cache import render_cached
 
 data_processor = DataProcessor()
 
 # Carrega opções
-champions = data_processor.get_champion_stats()["champion"].unique()
-champions = [str(c).strip() for c in champions if pd.notna(c) and str(c).strip()]
+catalog = data_processor.catalog
+champions = catalog.champions
 
-leagues = data_processor.get_all_leagues()
-leagues = [str(l).strip() for l in leagues if pd.notna(l) and str(l).strip()]
+leagues = catalog.leagues
 
-all_dates = data_processor.get_all_dates()
-all_dates = sorted(pd.to_datetime(all_dates).dt.date.unique())
+all_dates = catalog.dates
 date_marks = {i: str(date) for i, date in enumerate(all_dates)}
 
 
@@ -129,22 +128,26 @@ layout = html.Div(
 )
 def update_synergies_and_counters(
     selected_champions, selected_leagues, date_index_range
+):
+    start_date, end_date = data_processor.catalog.period(date_index_range)
+    return render_synergies_and_counters(
+        selected_champions, selected_leagues, start_date, end_date
+    )
+
+
+@render_cached
+def render_synergies_and_counters(
+    selected_champions, selected_leagues, start_date, end_date
 ):
     if not selected_champions:
         return html.Div("Select at least one champion."), html.Div(), html.Div()
 
-    start_date = str(all_dates[int(date_index_range[0])])
-    end_date = str(all_dates[int(date_index_range[1])])
-
-    df_allies = data_processor.get_best_allies(
-        selected_champions, start_date, end_date, selected_leagues
-    )
-    df_best = data_processor.get_best_against(
-        selected_champions, start_date, end_date, selected_leagues
-    )
-    df_worst = data_processor.get_worst_against(
+    pairs = data_processor.get_synergies_and_counters(
         selected_champions, start_date, end_date, selected_leagues
     )
+    df_allies = pairs["allies"]
+    df_best = pairs["best_against"]
+    df_worst = pairs["worst_against"]
 
     def build_table(df):
         if df.empty:
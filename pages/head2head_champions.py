@@ -2,17 +2,16 @@ from dash import html, dcc, Input, Output, callback
 import dash_bootstrap_components as dbc
 import pandas as pd
 from data_processor import DataProcessor
+from render_cache import render_cached
 
 data_processor = DataProcessor()
 
-champions = data_processor.get_champion_stats()["champion"].unique()
-champions = [c for c in champions if pd.notna(c) and c.strip()]
+catalog = data_processor.catalog
+champions = catalog.champions
 
-leagues = data_processor.get_all_leagues()
-leagues = [str(l).strip() for l in leagues if pd.notna(l) and str(l).strip()]
+leagues = catalog.leagues
 
-all_dates = data_processor.get_all_dates()
-all_dates = sorted(pd.to_datetime(all_dates).dt.date.unique())
+all_dates = catalog.dates
 date_marks = {i: str(date) for i, date in enumerate(all_dates)}
 
 layout = html.Div(
@@ -154,24 +153,24 @@ layout = html.Div(
     ],
 )
 def update_head2head_champions(champ1, champ2, selected_leagues, date_index_range):
+    start_date, end_date = data_processor.catalog.period(date_index_range)
+    return render_head2head_champions(
+        champ1, champ2, selected_leagues, start_date, end_date
+    )
+
+
+@render_cached
+def render_head2head_champions(champ1, champ2, selected_leagues, start_date, end_date):
     if not champ1 or not champ2 or champ1 == champ2:
         msg = html.Div("Select two different champions.")
         return msg, msg, html.Div(), html.Div()
 
-    start_date = str(all_dates[int(date_index_range[0])])
-    end_date = str(all_dates[int(date_index_range[1])])
-
-    stats1 = data_processor.get_champion_stats_in_period(
-        champ1, start_date, end_date, selected_leagues
-    )
-    stats2 = data_processor.get_champion_stats_in_period(
-        champ2, start_date, end_date, selected_leagues
-    )
-    h2h_stats = data_processor.get_head2head_stats_champions(
-        champ1, champ2, start_date, end_date, selected_leagues
-    )
-    h2h_history = data_processor.get_head2head_match_history_champions(
-        champ1, champ2, start_date, end_date, selected_leagues
+    period = (start_date, end_date, selected_leagues)
+    stats1, stats2, h2h_stats, h2h_history = data_processor.gather(
+        ("get_champion_stats_in_period", champ1, *period),
+        ("get_champion_stats_in_period", champ2, *period),
+        ("get_head2head_stats_champions", champ1, champ2, *period),
+        ("get_head2head_match_history_champions", champ1, champ2, *period),
     )
 
     def build_stat_table(df, label):
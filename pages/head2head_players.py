@@ -2,14 +2,14 @@ from dash import html, dcc, Input, Output, callback
 import dash_bootstrap_components as dbc
 import pandas as pd
 from data_processor import DataProcessor
+from render_cache import render_cached
 
 data_processor = DataProcessor()
 
-players = data_processor.get_player_stats()["playername"].unique()
-players = [p for p in players if pd.notna(p) and p.strip()]
+catalog = data_processor.catalog
+players = catalog.players_in()
 
-all_dates = data_processor.get_all_dates()
-all_dates = sorted(pd.to_datetime(all_dates).dt.date.unique())
+all_dates = catalog.dates
 date_marks = {i: str(date) for i, date in enumerate(all_dates)}
 
 layout = html.Div(
@@ -136,18 +136,21 @@ layout = html.Div(
     ],
 )
 def update_head2head(player1, player2, date_index_range):
+    start_date, end_date = data_processor.catalog.period(date_index_range)
+    return render_head2head(player1, player2, start_date, end_date)
+
+
+@render_cached
+def render_head2head(player1, player2, start_date, end_date):
     if not player1 or not player2 or player1 == player2:
         msg = html.Div("Select two different players.")
         return msg, msg, html.Div(), html.Div()
 
-    start_date = str(all_dates[int(date_index_range[0])])
-    end_date = str(all_dates[int(date_index_range[1])])
-
-    stats1 = data_processor.get_player_stats_in_period(player1, start_date, end_date)
-    stats2 = data_processor.get_player_stats_in_period(player2, start_date, end_date)
-    h2h_df = data_processor.get_head2head_stats(player1, player2, start_date, end_date)
-    h2h_history = data_processor.get_head2head_match_history(
-        player1, player2, start_date, end_date
+    stats1, stats2, h2h_df, h2h_history = data_processor.gather(
+        ("get_player_stats_in_period", player1, start_date, end_date),
+        ("get_player_stats_in_period", player2, start_date, end_date),
+        ("get_head2head_stats", player1, player2, start_date, end_date),
+        ("get_head2head_match_history", player1, player2, start_date, end_date),
     )
 
     def build_stats_card(df, name):
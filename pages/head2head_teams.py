@@ -2,14 +2,14 @@ from dash import html, dcc, Input, Output, callback
 import dash_bootstrap_components as dbc
 import pandas as pd
 from data_processor import DataProcessor
+from render_cache import render_cached
 
 data_processor = DataProcessor()
 
-teams = data_processor.get_team_stats()["teamname"].unique()
-teams = [t for t in teams if pd.notna(t) and t.strip()]
+catalog = data_processor.catalog
+teams = catalog.teams_in()
 
-all_dates = data_processor.get_all_dates()
-all_dates = sorted(pd.to_datetime(all_dates).dt.date.unique())
+all_dates = catalog.dates
 date_marks = {i: str(date) for i, date in enumerate(all_dates)}
 
 layout = html.Div(
@@ -134,20 +134,21 @@ layout = html.Div(
     ],
 )
 def update_head2head_teams(team1, team2, date_index_range):
+    start_date, end_date = data_processor.catalog.period(date_index_range)
+    return render_head2head_teams(team1, team2, start_date, end_date)
+
+
+@render_cached
+def render_head2head_teams(team1, team2, start_date, end_date):
     if not team1 or not team2 or team1 == team2:
         msg = html.Div("Select two different teams.")
         return msg, msg, html.Div(), html.Div()
 
-    start_date = str(all_dates[int(date_index_range[0])])
-    end_date = str(all_dates[int(date_index_range[1])])
-
-    stats1 = data_processor.get_team_stats_in_period(team1, start_date, end_date)
-    stats2 = data_processor.get_team_stats_in_period(team2, start_date, end_date)
-    h2h_stats = data_processor.get_head2head_stats_teams(
-        team1, team2, start_date, end_date
-    )
-    h2h_history = data_processor.get_head2head_match_history_teams(
-        team1, team2, start_date, end_date
+    stats1, stats2, h2h_stats, h2h_history = data_processor.gather(
+        ("get_team_stats_in_period", team1, start_date, end_date),
+        ("get_team_stats_in_period", team2, start_date, end_date),
+        ("get_head2head_stats_teams", team1, team2, start_date, end_date),
+        ("get_head2head_match_history_teams", team1, team2, start_date, end_date),
     )
 
     def build_team_stats(df, name):
@@ -3,17 +3,16 @@ import dash_bootstrap_components as dbc
 import pandas as pd
 import plotly.express as px
 from data_processor import DataProcessor
+from render_cache import render_cached
 
 data_processor = DataProcessor()
 
 # Carrega filtros
-patches = data_processor.get_all_patches()
-patches = [str(p).strip() for p in patches if pd.notna(p)]
-leagues = data_processor.get_all_leagues()
-leagues = [l for l in leagues if pd.notna(l) and l.strip()]
+catalog = data_processor.catalog
+patches = [str(p).strip() for p in catalog.patches]
+leagues = catalog.leagues
 
-all_dates = data_processor.get_all_dates()
-all_dates = sorted(pd.to_datetime(all_dates).dt.date.unique())
+all_dates = catalog.dates
 date_marks = {i: str(date) for i, date in enumerate(all_dates)}
 
 layout = html.Div(
@@ -112,10 +111,15 @@ layout = html.Div(
     ],
 )
 def update_patch_analysis(selected_patch, selected_leagues, date_index_range):
-    selected_patches = selected_patch if selected_patch else patches
+    start_date, end_date = data_processor.catalog.period(date_index_range)
+    return render_patch_analysis(selected_patch, selected_leagues, start_date, end_date)
 
-    start_date = str(all_dates[int(date_index_range[0])])
-    end_date = str(all_dates[int(date_index_range[1])])
+
+@render_cached
+def render_patch_analysis(selected_patch, selected_leagues, start_date, end_date):
+    selected_patches = selected_patch or [
+        str(p).strip() for p in data_processor.catalog.patches
+    ]
 
     df = data_processor.get_patch_champion_stats(
         selected_patches, start_date, end_date, selected_leagues
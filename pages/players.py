@@ -3,17 +3,18 @@ import dash_bootstrap_components as dbc
 import plotly.express as px
 import pandas as pd
 from data_processor import DataProcessor
+from render_cache import render_cached
 
 data_processor = DataProcessor()
 
 # Carrega ligas e datas
-leagues = data_processor.get_all_leagues()
+catalog = data_processor.catalog
+leagues = catalog.leagues
 
-list_players = data_processor.get_all_players()
+list_players = catalog.players_in()
 
 
-all_dates = data_processor.get_all_dates()
-all_dates = sorted(pd.to_datetime(all_dates).dt.date.unique())
+all_dates = catalog.dates
 
 date_marks = {i: str(date) for i, date in enumerate(all_dates)}
 
@@ -139,7 +140,7 @@ def update_player_dropdown(selected_league):
     # if not selected_league:
     #     return []
     # print(selected_league)
-    list_players = data_processor.get_all_players(selected_league)
+    list_players = data_processor.catalog.players_in(selected_league)
     # print(list_players)
     return [{"label": p, "value": p} for p in list_players]
 
@@ -159,15 +160,19 @@ def update_player_dropdown(selected_league):
     ],
 )
 def update_player_stats(selected_player, date_index_range):
+    start_date, end_date = data_processor.catalog.period(date_index_range)
+    return render_player_stats(selected_player, start_date, end_date)
+
+
+@render_cached
+def render_player_stats(selected_player, start_date, end_date):
     if not selected_player:
         return {}, {}, html.Div(), html.Div(), html.Div(), {"display": "none"}
 
-    start_date = str(all_dates[int(date_index_range[0])])
-    end_date = str(all_dates[int(date_index_range[1])])
-
-    player_data = data_processor.get_player_stats(selected_player, start_date, end_date)
-    match_history = data_processor.get_player_match_history(
-        selected_player, start_date, end_date
+    player_data, match_history, champ_data = data_processor.gather(
+        ("get_player_stats", selected_player, start_date, end_date),
+        ("get_player_match_history", selected_player, start_date, end_date),
+        ("get_most_picked_champions", selected_player, start_date, end_date),
     )
 
     if match_history.empty:
@@ -294,10 +299,6 @@ def update_player_stats(selected_player, date_index_range):
         size="sm",
     )
 
-    champ_data = data_processor.get_most_picked_champions(
-        selected_player, start_date, end_date
-    )
-
     champions_table = dbc.Table(
         [
             html.Thead(
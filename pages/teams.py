@@ -2,19 +2,20 @@ from dash import html, dcc, Input, Output, callback
 import dash_bootstrap_components as dbc
 import plotly.express as px
 from data_processor import DataProcessor
+from render_cache import render_cached
 import pandas as pd
 
 data_processor = DataProcessor()
 
 # Dropdown options
-leagues = data_processor.get_all_leagues()
-teams = data_processor.get_all_teams()
+catalog = data_processor.catalog
+leagues = catalog.leagues
+teams = catalog.teams_in()
 
 # print(teams[0:3])
 # Date slider options
 
-all_dates = data_processor.get_all_dates()
-all_dates = sorted(pd.to_datetime(all_dates).dt.date.unique())
+all_dates = catalog.dates
 date_marks = {i: str(date) for i, date in enumerate(all_dates)}
 
 layout = html.Div(
@@ -131,7 +132,7 @@ def update_team_dropdown(selected_league):
     # if not selected_league:
     #     return []
     # print(selected_league)
-    list_teams = data_processor.get_all_teams(selected_league)
+    list_teams = data_processor.catalog.teams_in(selected_league)
     # print(list_players)
     return [{"label": team, "value": team} for team in list_teams]
 
@@ -148,13 +149,16 @@ def update_team_dropdown(selected_league):
     [Input("team-dropdown", "value"), Input("date-slider", "value")],
 )
 def update_team_stats(selected_team, date_index_range):
+    start_date, end_date = data_processor.catalog.period(date_index_range)
+    return render_team_stats(selected_team, start_date, end_date)
+
+
+@render_cached
+def render_team_stats(selected_team, start_date, end_date):
     if not selected_team:
         hidden = {"display": "none"}
         return {}, {}, html.Div(), html.Div(), html.Div(), hidden
 
-    start_date = str(all_dates[int(date_index_range[0])])
-    end_date = str(all_dates[int(date_index_range[1])])
-
     team_data = data_processor.get_team_stats(selected_team, start_date, end_date)
     match_history = data_processor.get_team_match_history(
         selected_team, start_date, end_date
@@ -0,0 +1,96 @@
+# Cache do que os callbacks das páginas montam (figuras do Plotly e tabelas
+# do dbc), guardado já serializado em JSON. A chave é a função de render, as
+# suas entradas (com as datas já resolvidas, nunca as posições do slider, que
+# dependem do catálogo de cada worker) e a versão dos dados, então uma seleção
+# repetida não refaz nem a query nem a figura.
+import functools
+import json
+import os
+import threading
+
+from dash import no_update
+from plotly.io.json import to_json_plotly
+
+from database.base import DB_NAME
+from database.cache import ResultCache
+from database.catalog import get_catalog
+from database.shared_cache import shared_cache_from_env
+
+RENDER_CACHE_BYTES_ENV = "LOL_RENDER_CACHE_BYTES"
+DEFAULT_RENDER_CACHE_BYTES = 32 * 1024**2
+
+
+def _hashable(value):
+    """Callback input as part of a key (lists and dicts are not hashable)."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _hashable(v)) for k, v in value.items()))
+    return value
+
+
+_render_cache = None
+_render_cache_lock = threading.Lock()
+
+
+def get_render_cache():
+    """The render cache of this process (0 bytes in $LOL_RENDER_CACHE_BYTES
+    turns it off), backed by the shared tier like the result cache."""
+    global _render_cache
+    with _render_cache_lock:
+        if _render_cache is None:
+            max_bytes = int(
+                os.environ.get(RENDER_CACHE_BYTES_ENV, DEFAULT_RENDER_CACHE_BYTES)
+            )
+            _render_cache = ResultCache(
+                max_bytes=max_bytes,
+                shared=shared_cache_from_env(DB_NAME) if max_bytes > 0 else None,
+                namespace="renders",
+            )
+        return _render_cache
+
+
+def _skips_update(output):
+    """Whether ``output`` (or one output of a multi-output callback) is
+    ``no_update``, which depends on the current page and is not cached."""
+    if isinstance(output, (list, tuple)):
+        return any(isinstance(o, type(no_update)) for o in output)
+    return isinstance(output, type(no_update))
+
+
+def render_cached(callback):
+    """Decorator for a render function whose output depends only on its
+    arguments and the data: the output is stored as the JSON Dash would
+    send, keyed by the arguments and the data version, and a repeated call
+    returns it without running ``callback``.
+
+    The arguments must not depend on the process: the page callback
+    resolves the date slider positions with the current catalog and passes
+    the dates.
+
+    ``callback`` may return what ``to_json_plotly`` serializes: figures,
+    Dash components, DataFrames/arrays, dicts, lists and scalars. Hit or
+    miss, the wrapper returns that JSON decoded (figures and components as
+    dicts), so Dash always gets the same form. Outputs with ``no_update``
+    are passed through without caching.
+    """
+    name = f"{callback.__module__}.{callback.__qualname__}"
+
+    @functools.wraps(callback)
+    def wrapper(*args, **kwargs):
+        cache = get_render_cache()
+        if cache.max_bytes <= 0:
+            return callback(*args, **kwargs)
+        version = get_catalog().version
+        key = (name, version, _hashable(args), _hashable(kwargs))
+        found, rendered = cache.get(key)
+        if found:
+            return json.loads(rendered)
+        output = callback(*args, **kwargs)
+        if _skips_update(output):
+            return output
+        rendered = to_json_plotly(output)
+        cache.put(key, rendered, version)
+        return json.loads(rendered)
+
+    return wrapper
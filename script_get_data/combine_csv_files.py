@@ -2,14 +2,29 @@ import os
 import pandas as pd
 from datetime import datetime
 import glob
+from concurrent.futures import ProcessPoolExecutor
 
-def combine_csv_files(start_year=2014, end_year=2025):
+
+def read_year_file(file, year):
+    """
+    Read one yearly CSV file, adding the year column if it doesn't exist.
+    Module level so it can run in a worker process.
+    """
+    df = pd.read_csv(file)
+    if 'year' not in df.columns:
+        df['year'] = year
+    return df
+
+
+def combine_csv_files(start_year=2014, end_year=2025, workers=None):
     """
     Combine CSV files from a specified date range into a single DataFrame.
     
     Args:
         start_year (int): Starting year for data (inclusive)
         end_year (int): Ending year for data (inclusive)
+        workers (int): Number of processes parsing files at the same time
+            (default: one file after another in this process)
     
     Returns:
         pd.DataFrame: Combined DataFrame with data from the specified range
@@ -23,10 +38,9 @@ def combine_csv_files(start_year=2014, end_year=2025):
     if not csv_files:
         raise FileNotFoundError(f"No CSV files found in {csv_dir}")
     
-    # Initialize an empty list to store DataFrames
-    dfs = []
+    # Files to read, with their year
+    selected = []
     
-    # Read and combine files
     for file in csv_files:
         # Extract year from filename
         try:
@@ -37,15 +51,25 @@ def combine_csv_files(start_year=2014, end_year=2025):
             
         # Check if year is within the specified range
         if start_year <= year <= end_year:
+            selected.append((file, year))
+    
+    # Read files, in parallel when workers > 1
+    dfs = []
+    pool = ProcessPoolExecutor(max_workers=workers) if workers and workers > 1 else None
+    try:
+        futures = [
+            pool.submit(read_year_file, file, year) if pool else None
+            for file, year in selected
+        ]
+        for (file, year), future in zip(selected, futures):
             print(f"Processing data for year {year}...")
             try:
-                df = pd.read_csv(file)
-                # Add year column if it doesn't exist
-                if 'year' not in df.columns:
-                    df['year'] = year
-                dfs.append(df)
+                dfs.append(future.result() if future else read_year_file(file, year))
             except Exception as e:
                 print(f"Error processing {file}: {str(e)}")
+    finally:
+        if pool:
+            pool.shutdown()
     
     if not dfs:
         raise ValueError(f"No data found for the specified range {start_year}-{end_year}")
@@ -0,0 +1,150 @@
+# Aquecimento do cache de resultados: antes de atender, o worker calcula as
+# seleções mais comuns das páginas (período inteiro, campeões mais jogados,
+# times das ligas principais). O endpoint /ready do app só responde OK
+# depois que o aquecimento termina.
+import os
+import threading
+import time
+from itertools import combinations
+
+from data_processor import DataProcessor
+
+WARMUP_SECONDS_ENV = "LOL_WARMUP_SECONDS"
+WARMUP_CHAMPIONS_ENV = "LOL_WARMUP_CHAMPIONS"
+WARMUP_LEAGUES_ENV = "LOL_WARMUP_LEAGUES"
+DEFAULT_WARMUP_SECONDS = 30.0
+DEFAULT_WARMUP_CHAMPIONS = 20
+DEFAULT_WARMUP_LEAGUES = "LCK,LPL,LEC,LCS"
+
+# Confrontos de campeões aquecidos: pares entre os primeiros do top-N
+H2H_CHAMPIONS = 5
+
+_ready = threading.Event()
+_report = {}
+
+
+def top_champions(data_processor, start_date, end_date, n):
+    """The ``n`` champions with most games in the period (all patches and
+    leagues, as the patch page shows by default)."""
+    df = data_processor.get_patch_champion_stats(
+        data_processor.catalog.patches, start_date, end_date
+    )
+    if df.empty:
+        return []
+    games = df.groupby("champion")["games"].sum()
+    return games.sort_values(ascending=False, kind="stable").head(n).index.tolist()
+
+
+def major_leagues(catalog, names=None):
+    """Leagues of ``names`` (default: $LOL_WARMUP_LEAGUES) in the data; if
+    none is, the two with most teams."""
+    if names is None:
+        names = os.environ.get(WARMUP_LEAGUES_ENV, DEFAULT_WARMUP_LEAGUES)
+        names = [name.strip() for name in names.split(",") if name.strip()]
+    leagues = [league for league in catalog.leagues if league in names]
+    if leagues:
+        return leagues
+    return sorted(catalog.teams, key=lambda l: len(catalog.teams[l]), reverse=True)[:2]
+
+
+def warm_up_calls(data_processor, champions, leagues):
+    """(method, args) the pages run for their default full date range,
+    most requested first."""
+    catalog = data_processor.catalog
+    start_date, end_date = str(catalog.dates[0]), str(catalog.dates[-1])
+    period = (start_date, end_date)
+    calls = [("get_patch_champion_stats", (catalog.patches, *period, None))]
+    for champion in champions:
+        calls += [
+            ("get_synergies_and_counters", ([champion], *period, None)),
+            ("get_champion_stats", (champion, *period, None)),
+            ("get_champion_match_history", (champion, *period, None)),
+            ("get_champion_stats_in_period", (champion, *period, None)),
+        ]
+    for champ1, champ2 in combinations(champions[:H2H_CHAMPIONS], 2):
+        calls += [
+            ("get_head2head_stats_champions", (champ1, champ2, *period, None)),
+            ("get_head2head_match_history_champions", (champ1, champ2, *period, None)),
+        ]
+    for league in leagues:
+        for team in catalog.teams_in(league):
+            calls += [
+                ("get_team_stats", (team, *period)),
+                ("get_team_match_history", (team, *period)),
+                ("get_team_most_picked_champions", (team, *period)),
+                ("get_team_stats_in_period", (team, *period)),
+            ]
+    return calls
+
+
+def warm_up(data_processor=None, budget=None, notify=None):
+    """Fill the result cache with the common selections, for at most
+    ``budget`` seconds (default: $LOL_WARMUP_SECONDS; 0 skips it).
+
+    ``notify`` is called after every query (gunicorn's ``worker.notify``
+    keeps the worker from being taken as hung). Marks the process as ready
+    and returns the report served by /ready.
+    """
+    if budget is None:
+        budget = float(os.environ.get(WARMUP_SECONDS_ENV, DEFAULT_WARMUP_SECONDS))
+    started = time.monotonic()
+    done = failed = total = 0
+    try:
+        data_processor = data_processor or DataProcessor()
+        catalog = data_processor.catalog
+        if budget > 0 and catalog.dates:
+            n = int(os.environ.get(WARMUP_CHAMPIONS_ENV, DEFAULT_WARMUP_CHAMPIONS))
+            champions = top_champions(
+                data_processor, str(catalog.dates[0]), str(catalog.dates[-1]), n
+            )
+            calls = warm_up_calls(data_processor, champions, major_leagues(catalog))
+            total = len(calls)
+            for method, args in calls:
+                if time.monotonic() - started > budget:
+                    break
+                try:
+                    getattr(data_processor, method)(*args)
+                    done += 1
+                except Exception as e:
+                    failed += 1
+                    print(f"⚠️ Warm-up {method}{args} failed: {e}")
+                if notify:
+                    notify()
+    except Exception as e:
+        # Sem aquecimento o app continua funcionando, só mais lento no início
+        print(f"⚠️ Warm-up stopped: {e}")
+    finally:
+        _report.update(
+            {
+                "queries": done,
+                "failed": failed,
+                "planned": total,
+                "seconds": round(time.monotonic() - started, 3),
+                "complete": done + failed == total,
+            }
+        )
+        _ready.set()
+    print(
+        f"Warm-up finished: {done}/{total} queries in {_report['seconds']:.1f}s"
+        + ("" if _report["complete"] else " (time budget reached)")
+    )
+    return dict(_report)
+
+
+def start_warm_up(data_processor=None, budget=None):
+    """Run ``warm_up`` in a background thread (the development server does
+    not have a hook that runs before it accepts requests)."""
+    thread = threading.Thread(
+        target=warm_up, args=(data_processor, budget), name="warm-up", daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def is_ready():
+    return _ready.is_set()
+
+
+def warm_up_report():
+    """Counts of the last warm-up (empty before it finishes)."""
+    return dict(_report)